@@ -0,0 +1,114 @@
+"""
+Module Aleatoire
+----------------
+Générateurs pseudo-aléatoires par instance (joueur, simulation, processus),
+pour rendre les parties reproductibles et indépendantes de l'état global
+du module random.
+
+Deux générateurs au choix (GENERATEURS) :
+- "mt" : random.Random (Mersenne Twister de la bibliothèque standard)
+- "splitmix" : SplitMix64, générateur à compteur : l'état est un simple
+  compteur 64 bits, d'où une initialisation quasi gratuite (une graine
+  par partie) et des flux indépendants par processus (paramètre 'flux').
+
+Les joueurs et l'IA n'utilisent que randrange(n) et choice(seq), fournis
+par les deux générateurs.
+"""
+import os
+import random
+
+MASQUE64 = (1 << 64) - 1
+# Incrément de SplitMix64 (partie fractionnaire du nombre d'or * 2**64)
+GAMMA = 0x9E3779B97F4A7C15
+
+
+def _melanger(z):
+    """
+    Fonction de mélange de SplitMix64 : bijection sur les entiers 64 bits.
+    """
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASQUE64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASQUE64
+    return z ^ (z >> 31)
+
+
+class SplitMix64:
+    """
+    Classe SplitMix64
+    ----------------
+    Générateur à compteur : le n-ième tirage vaut _melanger(graine + n*GAMMA).
+    Sous-ensemble de l'interface de random.Random utilisé par le jeu.
+
+    Attributs principaux :
+    - etat (int) : compteur 64 bits courant
+
+    Méthodes principales :
+    - seed(graine, flux) : réinitialise le générateur
+    - suivant() : entier de 64 bits
+    - random() : flottant dans [0, 1)
+    - randrange(n) : entier dans [0, n) (biais < n / 2**64, négligeable)
+    - choice(seq), shuffle(liste) : comme random
+    - sauter(n) : avance de n tirages en O(1)
+    """
+    __slots__ = ("etat",)
+
+    def __init__(self, graine=None, flux=0):
+        self.seed(graine, flux)
+
+    def seed(self, graine=None, flux=0):
+        """
+        Réinitialise le générateur. Sans graine, elle est tirée par l'OS.
+        Deux valeurs de 'flux' donnent deux suites indépendantes pour une
+        même graine (ex : un flux par processus).
+        """
+        if graine is None:
+            graine = int.from_bytes(os.urandom(8), "little")
+        self.etat = (graine ^ _melanger((flux + 1) * GAMMA & MASQUE64)) & MASQUE64
+
+    def suivant(self):
+        """Retourne le prochain entier de 64 bits."""
+        self.etat = (self.etat + GAMMA) & MASQUE64
+        return _melanger(self.etat)
+
+    def random(self):
+        """Retourne un flottant uniforme dans [0, 1)."""
+        return (self.suivant() >> 11) * (1.0 / (1 << 53))
+
+    def randrange(self, n):
+        """Retourne un entier uniforme dans [0, n) (n > 0)."""
+        # Mélange recopié ici : c'est l'appel le plus fréquent
+        z = self.etat = (self.etat + GAMMA) & MASQUE64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASQUE64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASQUE64
+        return ((z ^ (z >> 31)) * n) >> 64
+
+    def choice(self, seq):
+        """Retourne un élément uniforme de la séquence (non vide) 'seq'."""
+        return seq[self.randrange(len(seq))]
+
+    def shuffle(self, liste):
+        """Mélange 'liste' sur place (Fisher-Yates)."""
+        for i in range(len(liste) - 1, 0, -1):
+            j = self.randrange(i + 1)
+            liste[i], liste[j] = liste[j], liste[i]
+
+    def sauter(self, n):
+        """Avance le générateur de n tirages, en temps constant."""
+        self.etat = (self.etat + n * GAMMA) & MASQUE64
+
+
+GENERATEURS = {"mt": random.Random, "splitmix": SplitMix64}
+
+
+def nouveau_generateur(graine=None, generateur="mt", flux=0):
+    """
+    Crée un générateur de type 'generateur' (clé de GENERATEURS) initialisé
+    avec 'graine' (None => graine tirée par l'OS). 'flux' sépare plusieurs
+    suites issues d'une même graine.
+    """
+    if generateur not in GENERATEURS:
+        raise ValueError(f"Générateur inconnu : {generateur}")
+    if generateur == "splitmix":
+        return SplitMix64(graine, flux)
+    if graine is not None and flux:
+        graine = _melanger((graine ^ _melanger(flux * GAMMA & MASQUE64)) & MASQUE64)
+    return random.Random(graine)
@@ -0,0 +1,348 @@
+"""
+Module CacheTirs
+----------------
+Cache des meilleures cases calculées par l'IA (IADensite, IAMonteCarlo),
+placé devant leur calcul dans choisir_tir.
+
+Le choix de l'IA ne dépend que de sa connaissance de la grille adverse :
+tirs manqués, touches, cases coulées, autres cases visées et tailles des
+navires restants. Cet état est ramené à une forme canonique par les
+symétries de la grille (8 rotations / réflexions pour une grille carrée,
+4 sinon) : deux états symétriques partagent une entrée. Les cases
+retenues sont stockées dans le repère canonique et ramenées dans le
+repère de la partie à la lecture.
+
+Deux niveaux :
+- un livre d'ouvertures (fichier JSON précalculé, voir generer_livre),
+  chargé au premier accès s'il existe, jamais évincé ;
+- un cache LRU borné (CAPACITE entrées) rempli pendant les parties.
+
+Pour IADensite le calcul est déterministe : avec ou sans cache, les
+mêmes cases sont retenues (dans le même ordre) et une partie à graine
+fixe est identique. Pour IAMonteCarlo, le cache fige l'estimation
+obtenue lors du premier calcul d'un état.
+
+Un cache partagé (cache_partage) peut servir plusieurs threads à la fois
+(salles du serveur, tour de l'IA en arrière-plan) : lecture, ajout et
+éviction se font sous un verrou, le calcul des cases hors verrou.
+
+    python CacheTirs.py --niveau expert --profondeur 6      génère le livre
+"""
+import os
+import threading
+from collections import OrderedDict
+from Navire import *
+from IA import *
+
+# Nombre maximal de colonnes pour les tables de symétrie (2**cols entrées)
+LIMITE_COLONNES = 12
+# Caches partagés : (classe d'IA, rows, cols) -> CacheTirs
+CACHES = {}
+VERROU_CACHES = threading.Lock()
+# (rows, cols) -> Symetries
+SYMETRIES = {}
+
+
+class Symetries:
+    """
+    Classe Symetries
+    ---------------
+    Symétries d'une grille rows x cols appliquées aux masques de cases
+    (bit row*cols+col), par tables précalculées : une ligne de la grille
+    est retournée ou transposée en une seule lecture de table.
+
+    Ordre des symétries : identité, miroir gauche-droite, miroir haut-bas,
+    demi-tour, puis (grille carrée) les mêmes suivies d'une transposition.
+
+    Attributs principaux :
+    - nb (int) : nombre de symétries utilisées (8, 4, ou 1 si la grille
+      est trop large pour les tables)
+    - permutations (list[list[int]]) : case => image par chaque symétrie
+    - inverses (list[list[int]]) : permutations réciproques
+    """
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.masque_ligne = (1 << cols) - 1
+        self.decalages = [i * cols for i in range(rows)]
+        if cols > LIMITE_COLONNES:
+            self.nb = 1
+        else:
+            self.nb = 8 if rows == cols else 4
+            # Ligne retournée : bit c => bit cols-1-c
+            self.retournee = [int(format(b, f"0{cols}b")[::-1], 2) for b in range(1 << cols)]
+            if self.nb == 8:
+                # Ligne i transposée : bit c => case (c, i)
+                self.transposee = [
+                    [sum(1 << (c * cols + i) for c in range(cols) if (b >> c) & 1) for b in range(1 << cols)]
+                    for i in range(rows)
+                ]
+        nb_cases = rows * cols
+        self.permutations = []
+        self.inverses = []
+        for k in range(self.nb):
+            permutation = [self.images(1 << i)[k].bit_length() - 1 for i in range(nb_cases)]
+            inverse = [0] * nb_cases
+            for i, j in enumerate(permutation):
+                inverse[j] = i
+            self.permutations.append(permutation)
+            self.inverses.append(inverse)
+
+    def images(self, masque):
+        """
+        Retourne la liste des images de 'masque' par chaque symétrie.
+        """
+        if self.nb == 1 or not masque:
+            return [masque] * self.nb
+        ml = self.masque_ligne
+        decalages = self.decalages
+        lignes = [(masque >> d) & ml for d in decalages]
+        retournee = self.retournee
+        inversees = [retournee[l] for l in lignes]
+        bas = decalages[::-1]
+        miroir = haut_bas = demi_tour = 0
+        for (l, inv, d, d_bas) in zip(lignes, inversees, decalages, bas):
+            miroir |= inv << d
+            haut_bas |= l << d_bas
+            demi_tour |= inv << d_bas
+        if self.nb == 4:
+            return [masque, miroir, haut_bas, demi_tour]
+        t = self.transposee
+        t_bas = t[::-1]
+        tr = tr_miroir = tr_haut_bas = tr_demi_tour = 0
+        for (l, inv, ti, ti_bas) in zip(lignes, inversees, t, t_bas):
+            tr |= ti[l]
+            tr_miroir |= ti[inv]
+            tr_haut_bas |= ti_bas[l]
+            tr_demi_tour |= ti_bas[inv]
+        return [masque, miroir, haut_bas, demi_tour, tr, tr_miroir, tr_haut_bas, tr_demi_tour]
+
+
+def symetries(rows, cols):
+    """
+    Retourne les Symetries d'une grille rows x cols (construites une fois).
+    """
+    if (rows, cols) not in SYMETRIES:
+        SYMETRIES[(rows, cols)] = Symetries(rows, cols)
+    return SYMETRIES[(rows, cols)]
+
+
+class CacheTirs:
+    """
+    Classe CacheTirs
+    ---------------
+    Mémorise, par état canonique de la connaissance de l'IA, la liste
+    des meilleures cases (IADensite.meilleures_cases).
+
+    Attributs principaux :
+    - symetries (Symetries) : symétries de la grille
+    - capacite (int) : nombre maximal d'entrées du cache LRU
+    - entrees (OrderedDict) : clé canonique => cases canoniques, de la
+      moins récemment utilisée à la plus récente
+    - chemin_livre (str|None) : fichier du livre d'ouvertures
+    - livre (dict|None) : entrées du livre (None tant qu'il n'est pas lu)
+    - profondeur (int) : seuls les états d'au plus 'profondeur' cases
+      visées passent par le cache (les suivants ne se répètent presque
+      jamais d'une partie à l'autre)
+    - succes, succes_livre, echecs (int) : statistiques d'accès
+    - verrou (threading.Lock) : protège livre, entrees et statistiques
+
+    Méthodes principales :
+    - meilleures_cases(ia) : cases de l'IA, depuis le cache si possible
+    - cle(ia) : (clé canonique, numéro de la symétrie qui y mène)
+    """
+    CAPACITE = 20000
+    PROFONDEUR = 8
+
+    def __init__(self, rows=10, cols=10, capacite=None, chemin_livre=None, profondeur=None):
+        self.symetries = symetries(rows, cols)
+        self.capacite = self.CAPACITE if capacite is None else capacite
+        self.profondeur = self.PROFONDEUR if profondeur is None else profondeur
+        self.entrees = OrderedDict()
+        self.chemin_livre = chemin_livre
+        self.livre = None
+        self.succes = 0
+        self.succes_livre = 0
+        self.echecs = 0
+        self.verrou = threading.Lock()
+
+    def cle(self, ia):
+        """
+        Retourne (clé, k) : clé canonique de l'état de 'ia' et numéro de la
+        symétrie qui envoie l'état de la partie sur cette clé.
+        La clé est le plus petit des tuples (tirés, manqués, touches, coulés)
+        images de l'état, suivi des tailles restantes triées.
+        """
+        images = self.symetries.images
+        tires = images(ia.deja_tires)
+        meilleur = min(tires)
+        symetries_min = [k for k, m in enumerate(tires) if m == meilleur]
+        k = symetries_min[0]
+        if len(symetries_min) > 1:
+            # État des tirs symétrique : départager avec les résultats
+            etats = list(zip(images(ia.rates), images(ia.touches), images(ia.coules)))
+            k = min(symetries_min, key=etats.__getitem__)
+            reste = etats[k]
+        else:
+            reste = (images(ia.rates)[k], images(ia.touches)[k], images(ia.coules)[k])
+        return ((meilleur,) + reste + tuple(sorted(ia.tailles_restantes)), k)
+
+    def charger_livre(self):
+        """
+        Lit le livre d'ouvertures (une seule fois) ; un fichier absent ou
+        illisible donne un livre vide.
+        """
+        self.livre = {}
+        if self.chemin_livre is None or not os.path.exists(self.chemin_livre):
+            return
+        import json
+        try:
+            with open(self.chemin_livre, encoding="utf-8") as fichier:
+                donnees = json.load(fichier)
+            if (donnees["rows"], donnees["cols"]) != (self.symetries.rows, self.symetries.cols):
+                print(f"[INFO] Livre {self.chemin_livre} ignoré : autre taille de grille")
+                return
+            for (tires, rates, touches, coules, tailles, cases) in donnees["entrees"]:
+                self.livre[(tires, rates, touches, coules) + tuple(tailles)] = tuple(cases)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[INFO] Livre {self.chemin_livre} illisible : {e}")
+
+    def meilleures_cases(self, ia):
+        """
+        Retourne la liste triée des meilleures cases (index row*cols+col)
+        de 'ia' : depuis le livre ou le cache, sinon calculée par
+        ia.meilleures_cases() puis mémorisée.
+        """
+        if bin(ia.deja_tires).count("1") > self.profondeur:
+            return ia.meilleures_cases()
+        (cle, k) = self.cle(ia)
+        with self.verrou:
+            if self.livre is None:
+                self.charger_livre()
+            cases = self.livre.get(cle)
+            if cases is not None:
+                self.succes_livre += 1
+            else:
+                cases = self.entrees.get(cle)
+                if cases is not None:
+                    self.succes += 1
+                    self.entrees.move_to_end(cle)
+                else:
+                    self.echecs += 1
+        if cases is not None:
+            inverse = self.symetries.inverses[k]
+            return sorted([inverse[i] for i in cases])
+
+        # Calcul hors verrou : les autres threads continuent de lire le cache
+        resultat = ia.meilleures_cases()
+        if ia.interrompu:
+            return resultat
+        permutation = self.symetries.permutations[k]
+        canoniques = tuple(sorted([permutation[i] for i in resultat]))
+        with self.verrou:
+            self.entrees[cle] = canoniques
+            self.entrees.move_to_end(cle)
+            if len(self.entrees) > self.capacite:
+                self.entrees.popitem(last=False)
+        return resultat
+
+    def taux_succes(self):
+        """
+        Retourne la proportion d'accès servis par le livre ou le cache.
+        """
+        total = self.succes + self.succes_livre + self.echecs
+        return (self.succes + self.succes_livre) / total if total else 0.0
+
+
+def chemin_livre(classe, rows, cols):
+    """
+    Retourne le nom du fichier du livre d'ouvertures par défaut.
+    """
+    return f"livre_{classe.__name__}_{rows}x{cols}.json"
+
+
+def cache_partage(classe, rows=10, cols=10):
+    """
+    Retourne le CacheTirs partagé par toutes les IA de type 'classe' sur
+    une grille rows x cols (créé au premier appel, avec le livre par défaut),
+    ou None sur une grille non indexable (Placements.indexable) : les états
+    ne s'y répètent pas et chaque entrée garderait des centaines de
+    milliers de cases ex æquo.
+    """
+    if not indexable(rows, cols):
+        return None
+    cle = (classe, rows, cols)
+    with VERROU_CACHES:
+        if cle not in CACHES:
+            CACHES[cle] = CacheTirs(rows, cols, chemin_livre=chemin_livre(classe, rows, cols))
+        return CACHES[cle]
+
+
+def generer_livre(classe, profondeur, rows=10, cols=10, flotte=None, **options):
+    """
+    Explore tous les états atteignables par l'IA 'classe' pendant ses
+    'profondeur' premiers tirs (chaque meilleure case, résultat "manque"
+    ou "touche" ; les états à symétrie près ne sont explorés qu'une fois)
+    et retourne le dictionnaire clé canonique => cases canoniques.
+    'options' est transmis au constructeur de l'IA (ex : nb_echantillons).
+    """
+    cache = CacheTirs(rows, cols, capacite=float("inf"), profondeur=profondeur)
+    cache.livre = {}
+    niveau = [[]]
+    for _ in range(profondeur):
+        suivant = []
+        vus = set()
+        for historique in niveau:
+            ia = classe(flotte, rows, cols, **options)
+            for (case, resultat) in historique:
+                ia.enregistrer(*divmod(case, cols), resultat)
+            (cle, _) = cache.cle(ia)
+            if cle in vus:
+                continue
+            vus.add(cle)
+            for case in cache.meilleures_cases(ia):
+                for resultat in ("manque", "touche"):
+                    suivant.append(historique + [(case, resultat)])
+        niveau = suivant
+    return dict(cache.entrees)
+
+
+def main():
+    """
+    Génère un livre d'ouvertures pour une IA (voir generer_livre).
+    """
+    import argparse
+    import json
+    import time
+    from Simulation import lire_flotte
+    parser = argparse.ArgumentParser(description="Génération du livre d'ouvertures de l'IA")
+    parser.add_argument("--niveau", choices=["expert", "monte-carlo"], default="expert")
+    parser.add_argument("--profondeur", type=int, default=6, help="nombre de premiers tirs couverts")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--flotte", type=lire_flotte, default=None,
+                        help="tailles des navires séparées par des virgules (ex : 5,4,3,3,2,2)")
+    parser.add_argument("--echantillons", type=int, default=20000,
+                        help="flottes par état (monte-carlo) : le livre se calcule une seule fois")
+    parser.add_argument("--sortie", default=None, help="fichier produit (par défaut celui lu par les parties)")
+    args = parser.parse_args()
+
+    classe = IADensite if args.niveau == "expert" else IAMonteCarlo
+    options = {"nb_echantillons": args.echantillons} if classe is IAMonteCarlo else {}
+    flotte = args.flotte or Navire.NAVIRES_DISPONIBLES
+    debut = time.perf_counter()
+    entrees = generer_livre(classe, args.profondeur, args.rows, args.cols, flotte, **options)
+    sortie = args.sortie or chemin_livre(classe, args.rows, args.cols)
+    with open(sortie, "w", encoding="utf-8") as fichier:
+        json.dump({
+            "rows": args.rows,
+            "cols": args.cols,
+            "ia": classe.__name__,
+            "flotte": flotte,
+            "entrees": [list(cle[:4]) + [list(cle[4:]), list(cases)] for cle, cases in entrees.items()],
+        }, fichier)
+    print(f"[INFO] {len(entrees)} états en {time.perf_counter() - debut:.1f} s -> {sortie}")
+
+
+if __name__ == "__main__":
+    main()
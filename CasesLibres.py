@@ -0,0 +1,87 @@
+from array import array
+
+
+class CasesLibres:
+    """
+    Classe CasesLibres
+    -----------------
+    Ensemble des cases non encore visées d'une grille, numérotées
+    row*cols+col, avec tirage uniforme et retrait en O(1).
+
+    C'est un tableau "échange-et-retire" (mélange de Fisher-Yates) : les
+    nb cases libres occupent les positions 0..nb-1 ; retirer une case la
+    remplace par la dernière.
+
+    Deux représentations :
+    - grille d'au plus LIMITE_DENSE cases : deux tableaux compacts de
+      1 octet par case jusqu'à 256 cases, 2 au-delà (copiés d'un modèle,
+      ~200 octets pour 10x10)
+    - au-delà : tableau creux, seules les positions modifiées sont stockées
+      (au départ la case i est en position i), la mémoire est donc
+      proportionnelle au nombre de tirs et non à la taille de la grille
+
+    Attributs principaux :
+    - nb (int) : nombre de cases libres
+    - case_en : position => case (array, ou dict si creux : positions
+      modifiées seulement)
+    - position_de : case => position (array, ou dict si creux)
+
+    Méthodes principales :
+    - tirer(rng) : une case libre uniforme (sans la retirer), None si vide
+    - retirer(case) : retire une case libre
+    """
+    __slots__ = ("nb", "case_en", "position_de", "dense")
+
+    # Taille maximale (en cases) de la représentation dense (index sur 2 octets)
+    LIMITE_DENSE = 1 << 16
+    # nb_cases -> array("B" ou "H", range(nb_cases)), recopié à chaque création
+    MODELES = {}
+
+    def __init__(self, nb_cases):
+        self.nb = nb_cases
+        self.dense = nb_cases <= self.LIMITE_DENSE
+        if self.dense:
+            if nb_cases not in self.MODELES:
+                self.MODELES[nb_cases] = array("B" if nb_cases <= 0x100 else "H", range(nb_cases))
+            modele = self.MODELES[nb_cases]
+            self.case_en = modele[:]
+            self.position_de = modele[:]
+        else:
+            self.case_en = {}
+            self.position_de = {}
+
+    def __len__(self):
+        return self.nb
+
+    def tirer(self, rng):
+        """
+        Retourne une case libre tirée uniformément (sans la retirer),
+        ou None s'il n'en reste aucune.
+        'rng' possède randrange() (ex : random).
+        """
+        if not self.nb:
+            return None
+        position = rng.randrange(self.nb)
+        if self.dense:
+            return self.case_en[position]
+        return self.case_en.get(position, position)
+
+    def retirer(self, case):
+        """
+        Retire 'case' (supposée libre) : la dernière case libre prend sa place.
+        """
+        case_en = self.case_en
+        position_de = self.position_de
+        dernier = self.nb - 1
+        self.nb = dernier
+        if self.dense:
+            position = position_de[case]
+            case_derniere = case_en[dernier]
+            case_en[position] = case_derniere
+            position_de[case_derniere] = position
+            return
+        position = position_de.pop(case, case)
+        case_derniere = case_en.pop(dernier, dernier)
+        if position != dernier:
+            case_en[position] = case_derniere
+            position_de[case_derniere] = position
@@ -0,0 +1,247 @@
+from tkinter import *
+import json
+import queue
+import socket
+import threading
+from Joueur import *
+from Plateau import *
+from Salle import *
+
+
+class ClientReseau:
+    """
+    Classe ClientReseau
+    ------------------
+    Connexion de l'interface Tk au serveur (Serveur.py) : un thread lit
+    les messages du serveur et les dépose dans une file, que la boucle Tk
+    consulte toutes les INTERVALLE_MS (root.after), comme TourIA ; les
+    messages reçus sont passés à 'rappel' dans le thread Tk.
+
+    Attributs principaux :
+    - root (Tk) : fenêtre dont la boucle reçoit les messages
+    - socket (socket) : connexion au serveur
+    - rappel (callable) : fonction appelée avec chaque message reçu
+      (None quand la connexion est fermée)
+
+    Méthodes principales :
+    - envoyer(message) : envoie une commande (dict) au serveur
+    - fermer() : ferme la connexion
+    """
+    INTERVALLE_MS = 16  # ~60 images/s
+
+    def __init__(self, root, hote, port, rappel):
+        self.root = root
+        self.rappel = rappel
+        self.messages = queue.Queue()
+        self.socket = socket.create_connection((hote, port))
+        self.ferme = False
+        threading.Thread(target=self._lire, daemon=True).start()
+        self.sondage = self.root.after(self.INTERVALLE_MS, self._sonder)
+
+    def envoyer(self, message):
+        """Envoie une commande au serveur."""
+        try:
+            self.socket.sendall(encoder(message))
+        except OSError:
+            self.messages.put(None)
+
+    def _lire(self):
+        """Corps du thread : une ligne JSON par message, None à la fermeture."""
+        try:
+            with self.socket.makefile("rb") as flux:
+                for ligne in flux:
+                    self.messages.put(json.loads(ligne))
+        except (OSError, ValueError):
+            pass
+        self.messages.put(None)
+
+    def _sonder(self):
+        """Appelé par la boucle Tk : transmet les messages reçus."""
+        self.sondage = None
+        while not self.ferme:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                self.sondage = self.root.after(self.INTERVALLE_MS, self._sonder)
+                return
+            if message is None:
+                self.ferme = True
+            self.rappel(message)
+
+    def fermer(self):
+        """Ferme la connexion (le thread de lecture s'arrête)."""
+        self.ferme = True
+        if self.sondage is not None:
+            self.root.after_cancel(self.sondage)
+            self.sondage = None
+        try:
+            self.envoyer({"c": "quitter"})
+            self.socket.close()
+        except OSError:
+            pass
+
+
+def fenetre_reseau(hote="127.0.0.1", port=PORT, ia=None):
+    """
+    Interface Tk d'une partie en réseau : même disposition que main.py
+    (plateau adverse à gauche, le sien à droite). La flotte est placée
+    localement (clic, orientation, placement aléatoire) puis envoyée au
+    serveur par "Valider" ; les tirs sont validés et résolus par le
+    serveur. 'ia' : niveau de l'IA du serveur, None pour affronter un
+    autre joueur humain. Les plateaux sont construits à l'ouverture de la
+    partie, à la taille de grille annoncée par le serveur.
+    """
+    root = Tk()
+    root.title(f"Bataille Navale - {hote}:{port}")
+    cell_size = 30
+    etat = {"moi": None, "tour": None, "phase": "connexion", "partie": None, "joueur": None}
+    orientation = StringVar(value="H")
+    statut = StringVar(value="Connexion...")
+
+    # Plateaux (adversaire, vous), construits par construire_plateaux
+    zone_plateaux = Frame(root)
+    zone_plateaux.pack(side=LEFT)
+    plateaux = []
+
+    def construire_plateaux(rows, cols):
+        """
+        Crée les deux plateaux rows x cols (ou les remet à blanc s'ils ont
+        déjà cette taille), avec leurs clics.
+        """
+        if plateaux and (plateaux[0].rows, plateaux[0].cols) == (rows, cols):
+            for plateau in plateaux:
+                plateau.reinitialiser()
+            return
+        for widget in zone_plateaux.winfo_children():
+            widget.destroy()
+        for plateau in plateaux:
+            plateau.canvas.destroy()
+        plateaux.clear()
+        for (titre, couleur) in (("Adversaire", "lightgreen"), ("Vous", "lightblue")):
+            frame = Frame(zone_plateaux)
+            frame.pack(side=LEFT, padx=10, pady=10)
+            Label(frame, text=titre, font=("Arial", 14, "bold")).pack()
+            canvas = Canvas(frame, width=cols * cell_size + 50, height=rows * cell_size + 100, bg=couleur)
+            canvas.pack()
+            plateau = Plateau(canvas, rows, cols, cell_size)
+            canvas.create_window(30, 50, window=plateau.canvas, anchor="nw")
+            plateaux.append(plateau)
+        plateaux[0].canvas.bind("<Button-1>", clic_adverse)
+        plateaux[1].canvas.bind("<Button-1>", clic_moi)
+
+    frame_boutons = Frame(root, bg="lightgray")
+    frame_boutons.pack(side=LEFT, fill=Y, padx=10, pady=10)
+    Label(frame_boutons, textvariable=statut, wraplength=180, font=("Arial", 12, "bold")).pack(pady=5)
+
+    def recevoir(message):
+        """Applique un message du serveur à l'affichage."""
+        if message is None:
+            statut.set("Connexion au serveur perdue.")
+            etat["phase"] = "fin"
+            return
+        e = message["e"]
+        if e == "attente":
+            statut.set("En attente d'un adversaire...")
+        elif e == "partie":
+            etat["moi"] = message["joueur"]
+            etat["phase"] = "placement"
+            etat["partie"] = message
+            construire_plateaux(message["rows"], message["cols"])
+            nouvelle_flotte()
+            adversaire = f"IA {message['ia']}" if message["ia"] else "un autre joueur"
+            statut.set(f"Partie {message['salle']} contre {adversaire} : placez votre flotte.")
+        elif e == "placement":
+            etat["phase"] = "attente"
+            statut.set("Flotte validée, en attente de l'adversaire...")
+        elif e == "debut":
+            etat["phase"] = "battle"
+            etat["tour"] = message["tour"]
+            statut.set("À vous de tirer !" if etat["tour"] == etat["moi"] else "Tour de l'adversaire...")
+        elif e == "tir":
+            plateau = plateaux[0] if message["j"] == etat["moi"] else plateaux[1]
+            couleur = {"manque": "blue", "touche": "red", "coule": "black"}[message["res"]]
+            for (r, c) in message.get("cases", [(message["row"], message["col"])]):
+                plateau.color_cell(r, c, couleur)
+            etat["tour"] = 1 - message["j"]
+            statut.set("À vous de tirer !" if etat["tour"] == etat["moi"] else "Tour de l'adversaire...")
+        elif e == "fin":
+            etat["phase"] = "fin"
+            if message["gagnant"] is None:
+                statut.set("Match nul.")
+            elif message["gagnant"] == etat["moi"]:
+                statut.set("Victoire !" + (" (abandon de l'adversaire)" if message.get("abandon") else ""))
+            else:
+                statut.set("Défaite.")
+        elif e == "erreur":
+            print(f"[INFO] Serveur : {message['msg']}")
+            if etat["phase"] == "battle" and etat["tour"] is None:
+                etat["tour"] = etat["moi"]
+
+    def nouvelle_flotte():
+        """Repart d'une flotte locale vide (navires non placés)."""
+        partie = etat["partie"]
+        joueur = Joueur("Vous", partie["rows"], partie["cols"], partie["flotte"])
+        joueur.initialiser_navires()
+        etat["joueur"] = joueur
+        plateaux[1].reinitialiser()
+        return joueur
+
+    def placer(row, col):
+        """Place le prochain navire non placé en (row, col), si possible."""
+        joueur = etat["joueur"]
+        restants = joueur.navires_non_places()
+        if restants and joueur.peut_placer_navire(restants[0], row, col, orientation.get()):
+            joueur.placer_navire(restants[0], row, col, orientation.get())
+            for (r, c) in restants[0].positions:
+                plateaux[1].color_cell(r, c, "gray")
+        else:
+            print("[INFO] Placement invalide.")
+
+    def placement_aleatoire():
+        if etat["phase"] != "placement":
+            return
+        joueur = nouvelle_flotte()
+        joueur.placement_aleatoire()
+        for navire in joueur.navires:
+            for (r, c) in navire.positions:
+                plateaux[1].color_cell(r, c, "gray")
+
+    def valider():
+        if etat["phase"] != "placement":
+            return
+        joueur = etat["joueur"]
+        if joueur.navires_non_places():
+            print("[INFO] Il reste des navires à placer !")
+            return
+        placements = []
+        for navire in joueur.navires:
+            (row, col) = navire.positions[0]
+            vertical = len(navire.positions) > 1 and navire.positions[1][1] == col
+            placements.append([row, col, "V" if vertical else "H"])
+        client.envoyer({"c": "placer", "placements": placements})
+
+    def clic_moi(event):
+        if etat["phase"] == "placement":
+            placer(event.y // cell_size, event.x // cell_size)
+
+    def clic_adverse(event):
+        if etat["phase"] != "battle" or etat["tour"] != etat["moi"]:
+            return
+        # Un seul tir en vol : le tour revient avec le résultat (ou l'erreur)
+        etat["tour"] = None
+        client.envoyer({"c": "tir", "row": event.y // cell_size, "col": event.x // cell_size})
+
+    def quitter():
+        client.fermer()
+        root.quit()
+
+    for (texte, commande) in (("Orientation H/V", lambda: orientation.set("V" if orientation.get() == "H" else "H")),
+                              ("Placement aléatoire", placement_aleatoire),
+                              ("Valider", valider),
+                              ("Quitter", quitter)):
+        Button(frame_boutons, text=texte, command=commande).pack(pady=5)
+
+    client = ClientReseau(root, hote, port, recevoir)
+    client.envoyer({"c": "rejoindre", "ia": ia})
+    root.mainloop()
+    client.fermer()
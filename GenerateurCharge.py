@@ -0,0 +1,208 @@
+"""
+Module GenerateurCharge
+-----------------------
+Générateur de charge pour le serveur de parties (Serveur.py) : ouvre de
+nombreuses salles simultanées, y joue des tirs aléatoires et mesure la
+latence de chaque coup (envoi du tir -> réception de son résultat).
+
+    python GenerateurCharge.py --lancer-serveur --salles 1000
+    python GenerateurCharge.py --port 5454 --salles 500 --mode humain --reflexion 0.5
+
+Mode "ia" : une connexion par salle, contre l'IA du serveur ; mode
+"humain" : deux connexions par salle, jouant l'une contre l'autre.
+'--reflexion' ajoute un temps de réflexion entre deux coups d'un client
+(rythme d'un humain), pour mesurer combien de salles un cœur soutient.
+
+Rapport : centiles de latence par coup, coups et parties par seconde,
+temps CPU du serveur (commande "stats") et salles par cœur : nombre
+moyen de salles ouvertes (intégré dans le temps par le serveur, voir
+Serveur.salles_secondes) divisé par la fraction de cœur utilisée par
+le serveur.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from Serveur import *
+from Instrumentation import centile
+
+
+async def envoyer(writer, message):
+    """Envoie un message du protocole."""
+    writer.write(encoder(message))
+    await writer.drain()
+
+
+async def recevoir(reader):
+    """Lit le prochain message du serveur (None si la connexion est fermée)."""
+    ligne = await reader.readline()
+    return json.loads(ligne) if ligne else None
+
+
+async def jouer_client(hote, port, ia, reflexion, rng, latences, demarrage):
+    """
+    Un client : rejoint une salle, place sa flotte au hasard puis tire
+    sur des cases aléatoires à son tour jusqu'à la fin de la partie.
+    La latence de chaque tir (secondes) est ajoutée à 'latences'.
+    'demarrage' (Event) : les clients tirent une fois toutes les salles
+    ouvertes. Retourne True si la partie est allée à son terme.
+    """
+    (reader, writer) = await asyncio.open_connection(hote, port)
+    try:
+        await envoyer(writer, {"c": "rejoindre", "ia": ia})
+        message = await recevoir(reader)
+        while message is not None and message["e"] == "attente":
+            message = await recevoir(reader)
+        if message is None or message["e"] != "partie":
+            return False
+        moi = message["joueur"]
+        cases = [(r, c) for r in range(message["rows"]) for c in range(message["cols"])]
+        rng.shuffle(cases)
+        await envoyer(writer, {"c": "placer"})
+        await demarrage.wait()
+
+        tour = None
+        envoi = None  # instant d'envoi du tir en attente de son résultat
+        while True:
+            message = await recevoir(reader)
+            if message is None:
+                return False
+            e = message["e"]
+            if e == "debut":
+                tour = message["tour"]
+            elif e == "tir":
+                if message["j"] == moi:
+                    latences.append(time.perf_counter() - envoi)
+                    envoi = None
+                tour = 1 - message["j"]
+            elif e == "fin":
+                await envoyer(writer, {"c": "quitter"})
+                return True
+            elif e == "erreur":
+                raise RuntimeError(message["msg"])
+            if tour != moi or envoi is not None:
+                continue
+            if reflexion:
+                await asyncio.sleep(reflexion * (0.5 + rng.random()))
+            (r, c) = cases.pop()
+            envoi = time.perf_counter()
+            await envoyer(writer, {"c": "tir", "row": r, "col": c})
+    finally:
+        writer.close()
+
+
+async def demander_stats(hote, port):
+    """Retourne le message "stats" du serveur."""
+    (reader, writer) = await asyncio.open_connection(hote, port)
+    await envoyer(writer, {"c": "stats"})
+    stats = await recevoir(reader)
+    await envoyer(writer, {"c": "quitter"})
+    writer.close()
+    return stats
+
+
+async def generer(hote, port, nb_salles, mode, ia, reflexion, graine):
+    """
+    Joue nb_salles parties simultanées et retourne (latences triées,
+    durée, parties terminées, stats serveur avant, stats serveur après,
+    salles ouvertes en moyenne).
+    """
+    rng = random.Random(graine)
+    latences = []
+    demarrage = asyncio.Event()
+    nb_clients = nb_salles * (2 if mode == "humain" else 1)
+    niveau = ia if mode == "ia" else None
+    taches = []
+    # Connexions par lots, pour ne pas saturer la file d'attente d'accept()
+    for i in range(nb_clients):
+        taches.append(asyncio.create_task(jouer_client(hote, port, niveau, reflexion,
+                                                       random.Random(rng.random()), latences, demarrage)))
+        if i % 100 == 99:
+            await asyncio.sleep(0)
+    while (await demander_stats(hote, port))["connexions"] < nb_clients + 1:
+        await asyncio.sleep(0.05)
+
+    avant = await demander_stats(hote, port)
+    debut = time.perf_counter()
+    demarrage.set()
+    await asyncio.wait(taches)
+    duree = time.perf_counter() - debut
+    apres = await demander_stats(hote, port)
+    terminees = sum(1 for t in taches if t.result())
+    if mode == "humain":
+        terminees //= 2
+    latences.sort()
+    # Moyenne exacte : le serveur intègre le nombre de salles ouvertes dans le temps
+    duree_serveur = apres["duree"] - avant["duree"]
+    salles_moyennes = 0.0
+    if duree_serveur > 0:
+        salles_moyennes = (apres["salles_secondes"] - avant["salles_secondes"]) / duree_serveur
+    return (latences, duree, terminees, avant, apres, salles_moyennes)
+
+
+def lancer_serveur(port, backend):
+    """
+    Lance Serveur.py dans un autre processus et attend qu'il écoute.
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Serveur.py")
+    processus = subprocess.Popen([sys.executable, script, "--port", str(port), "--backend", backend],
+                                 stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            asyncio.run(demander_stats("127.0.0.1", port))
+            return processus
+        except OSError:
+            time.sleep(0.1)
+    processus.kill()
+    raise RuntimeError("Le serveur ne répond pas")
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande (voir la documentation du module).
+    """
+    parser = argparse.ArgumentParser(description="Générateur de charge pour Serveur.py")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--salles", type=int, default=1000, help="parties simultanées")
+    parser.add_argument("--mode", choices=["ia", "humain"], default="ia")
+    parser.add_argument("--ia", choices=Joueur.NIVEAUX, default="facile", help="niveau de l'IA (mode ia)")
+    parser.add_argument("--reflexion", type=float, default=0.0,
+                        help="temps de réflexion moyen d'un client entre deux tirs (s)")
+    parser.add_argument("--graine", type=int, default=0)
+    parser.add_argument("--lancer-serveur", action="store_true",
+                        help="lance Serveur.py en local sur --port pendant la mesure")
+    parser.add_argument("--backend", choices=sorted(Simulation.BACKENDS), default="objets",
+                        help="backend du serveur lancé (--lancer-serveur)")
+    args = parser.parse_args()
+
+    augmenter_limite_fichiers()
+    processus = lancer_serveur(args.port, args.backend) if args.lancer_serveur else None
+    try:
+        (latences, duree, terminees, avant, apres, salles) = asyncio.run(
+            generer(args.hote, args.port, args.salles, args.mode, args.ia, args.reflexion, args.graine))
+    finally:
+        if processus is not None:
+            processus.terminate()
+            processus.wait()
+
+    cpu = apres["cpu"] - avant["cpu"]
+    coups = apres["coups"] - avant["coups"]
+    print(f"[BENCH] {args.salles} salles ({args.mode}), {terminees} parties terminées en {duree:.1f} s")
+    if latences:
+        print(f"[BENCH] latence par coup : p50 {1000 * centile(latences, 50):.2f} ms, "
+              f"p95 {1000 * centile(latences, 95):.2f} ms, p99 {1000 * centile(latences, 99):.2f} ms, "
+              f"max {1000 * latences[-1]:.2f} ms")
+    print(f"[BENCH] {coups / duree:.0f} coups/s, {terminees / duree:.1f} parties/s, "
+          f"CPU serveur {cpu:.2f} s ({100 * cpu / duree:.0f} % d'un cœur)")
+    if cpu > 0:
+        print(f"[BENCH] {salles:.0f} salles ouvertes en moyenne -> {salles * duree / cpu:.0f} salles par cœur "
+              f"(à ce rythme de jeu), {coups / cpu:.0f} coups par seconde CPU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+import random
+import time
+from Navire import *
+from Placements import *
+
+# Nombre de cases à partir duquel densites compte par fenêtres glissantes
+# (NumPy) plutôt qu'en parcourant l'index ; mesuré par tour : 120 µs contre
+# 190 µs en 10x10, ~180 µs pour les deux en 12x12, 565 contre 210 µs en 20x20
+SEUIL_FENETRES = 144
+# NumPy installé ? (None tant que ce n'est pas vérifié, voir _numpy_disponible)
+NUMPY = None
+
+
+def _numpy_disponible():
+    """Retourne True si NumPy est installé (vérifié une fois, sans l'importer)."""
+    global NUMPY
+    if NUMPY is None:
+        import importlib.util
+        NUMPY = importlib.util.find_spec("numpy") is not None
+    return NUMPY
+
+
+def tableau_masque(masque, rows, cols):
+    """
+    Retourne le masque 'masque' (bit row*cols+col) sous forme de tableau
+    NumPy de booléens rows x cols.
+    """
+    import numpy as np
+    nb = rows * cols
+    octets = np.frombuffer(masque.to_bytes((nb + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(octets, count=nb, bitorder="little").view(bool).reshape(rows, cols)
+
+
+def _sommes_glissantes(cumul, taille):
+    """
+    Retourne, pour chaque ligne, la somme de chaque fenêtre de 'taille'
+    cases consécutives, à partir des sommes cumulées 'cumul' des lignes
+    (précédées d'une colonne de zéros).
+    """
+    return cumul[:, taille:] - cumul[:, :-taille]
+
+
+def _cumul(valeurs, marge=0):
+    """
+    Retourne les sommes cumulées de chaque ligne de 'valeurs', précédées
+    d'une colonne de zéros (pour _sommes_glissantes). Avec une 'marge',
+    tout se passe comme si chaque ligne était bordée de 'marge' zéros de
+    chaque côté.
+    """
+    import numpy as np
+    (nb_lignes, longueur) = valeurs.shape
+    cumul = np.zeros((nb_lignes, longueur + 2 * marge + 1), dtype=np.int32)
+    fin = marge + 1 + longueur
+    valeurs.cumsum(axis=1, out=cumul[:, marge + 1:fin])
+    if marge:
+        cumul[:, fin:] = cumul[:, fin - 1:fin]
+    return cumul
+
+
+class IADensite:
+    """
+    Classe IADensite
+    ---------------
+    IA "expert" par densité de probabilité : à chaque tour, elle compte
+    tous les placements encore possibles de chaque navire non coulé
+    (compatibles avec les tirs manqués, les touches et les navires coulés)
+    et tire sur la case libre couverte par le plus de placements.
+
+    Dès qu'une case est touchée sans que son navire soit coulé, seuls les
+    placements qui recouvrent ces touches sont comptés (pondérés par le
+    nombre de touches recouvertes), ce qui remplace la réserve de cases
+    adjacentes du mode difficile.
+
+    Jusqu'à SEUIL_FENETRES cases (dont la grille 10x10), le comptage
+    parcourt l'index précalculé de Placements : un placement est valide
+    si son masque n'a aucun bit commun avec les cases interdites. À cette
+    taille, la trentaine d'appels NumPy d'un tour coûte plus cher que le
+    parcours (~120 µs contre ~60 µs par tour en moyenne sur des parties
+    10x10).
+
+    Au-delà, il se fait par fenêtres glissantes (NumPy, densites_fenetres)
+    sans aucun index : le coût d'un tour est proportionnel au nombre de
+    cases (environ 0,2 ms en 20x20, 7 ms en 300x300, 90 ms en 1000x1000).
+    Sans NumPy, les grilles indexables gardent le parcours de l'index.
+
+    Attributs principaux :
+    - rows, cols (int) : dimensions de la grille adverse
+    - rates (int) : masque des tirs manqués
+    - touches (int) : masque des touches dont le navire n'est pas coulé
+    - coules (int) : masque des cases des navires coulés
+    - deja_tires (int) : masque de toutes les cases déjà visées
+    - tailles_restantes (list[int]) : tailles des navires non coulés
+    - rng : générateur aléatoire (départage des ex æquo), random par défaut
+    - cache (CacheTirs|None) : cache des meilleures cases consulté par
+      choisir_tir (voir CacheTirs), aucun par défaut
+    - echeance (float|None) : instant (time.perf_counter) où le calcul du
+      tour doit s'arrêter, None sans limite ; seule IAMonteCarlo, dont le
+      tour est long, en tient compte (voir TourIA)
+    - interrompu (bool) : True si le dernier calcul a été arrêté par
+      l'échéance (résultat approché, non mémorisé par le cache)
+    """
+    def __init__(self, flotte=None, rows=10, cols=10, rng=None, cache=None):
+        if flotte is None:
+            flotte = Navire.NAVIRES_DISPONIBLES
+        self.rng = random if rng is None else rng
+        self.cache = cache
+        self.echeance = None
+        self.interrompu = False
+        self.rows = rows
+        self.cols = cols
+        self.rates = 0
+        self.touches = 0
+        self.coules = 0
+        self.deja_tires = 0
+        self.tailles_restantes = [taille for (_, taille) in flotte]
+
+    def densites(self):
+        """
+        Retourne la liste (longueur rows*cols) du nombre pondéré de
+        placements possibles couvrant chaque case (un tableau NumPy au-delà
+        de SEUIL_FENETRES cases, voir densites_fenetres).
+        """
+        if not indexable(self.rows, self.cols) or (self.rows * self.cols > SEUIL_FENETRES and _numpy_disponible()):
+            return self.densites_fenetres()
+        compte = [0] * (self.rows * self.cols)
+        bloque = self.rates | self.coules
+        touches = self.touches
+
+        # Les navires de même taille ont les mêmes placements : on compte une fois
+        multiplicites = {}
+        for taille in self.tailles_restantes:
+            multiplicites[taille] = multiplicites.get(taille, 0) + 1
+
+        for taille, nb in multiplicites.items():
+            for (masque, _, _, _, cases) in placements(taille, self.rows, self.cols):
+                if masque & bloque:
+                    continue
+                if touches:
+                    recouvre = masque & touches
+                    if not recouvre:
+                        continue
+                    poids = nb * bin(recouvre).count("1")
+                else:
+                    poids = nb
+                for i in cases:
+                    compte[i] += poids
+        return compte
+
+    def densites_fenetres(self):
+        """
+        Même comptage que densites, par fenêtres glissantes : ligne par
+        ligne puis colonne par colonne, les sommes cumulées des cases
+        interdites indiquent pour chaque position de départ si le navire
+        y tient (somme nulle sur ses 'taille' cases), celles des touches
+        combien il en recouvre ; les sommes glissantes de ces poids
+        reportent ensuite chaque placement sur ses cases.
+        Retourne un tableau NumPy de longueur rows*cols.
+        """
+        import numpy as np
+        (rows, cols) = (self.rows, self.cols)
+        compte = np.zeros((rows, cols), dtype=np.int32)
+        bloque = tableau_masque(self.rates | self.coules, rows, cols)
+        touches = tableau_masque(self.touches, rows, cols) if self.touches else None
+
+        # Les navires de même taille ont les mêmes placements : on compte une fois
+        multiplicites = {}
+        for taille in self.tailles_restantes:
+            multiplicites[taille] = multiplicites.get(taille, 0) + 1
+
+        # Placements horizontaux sur les lignes, puis verticaux sur les lignes
+        # de la grille transposée (un navire de taille 1 n'est compté qu'une fois)
+        for (vertical, sens) in enumerate((compte, compte.T)):
+            interdites = _cumul(bloque.T if vertical else bloque)
+            if touches is not None:
+                recouvertes = _cumul(touches.T if vertical else touches)
+            for taille, nb in multiplicites.items():
+                if sens.shape[1] < taille or (vertical and taille == 1):
+                    continue
+                poids = _sommes_glissantes(interdites, taille) == 0
+                if touches is not None:
+                    poids = poids * _sommes_glissantes(recouvertes, taille)
+                # Poids de chaque placement reporté sur ses 'taille' cases
+                sens += nb * _sommes_glissantes(_cumul(poids, taille - 1), taille)
+        return compte.reshape(-1)
+
+    def meilleures_cases(self):
+        """
+        Retourne la liste croissante des cases libres (index row*cols+col)
+        de plus forte densité.
+        """
+        tires = self.deja_tires
+        compte = self.densites()
+        if not isinstance(compte, list):
+            import numpy as np
+            # Cases déjà visées exclues (-1), puis cases de densité maximale
+            valeurs = np.where(tableau_masque(tires, self.rows, self.cols).reshape(-1), -1, compte)
+            meilleur = valeurs.max()
+            return np.flatnonzero(valeurs == meilleur).tolist() if meilleur >= 0 else []
+        meilleur = 0
+        candidats = []
+        for i, valeur in enumerate(compte):
+            if (tires >> i) & 1 or valeur < meilleur:
+                continue
+            if valeur > meilleur:
+                meilleur = valeur
+                candidats = [i]
+            else:
+                candidats.append(i)
+        return candidats
+
+    def choisir_tir(self):
+        """
+        Retourne la case libre (row, col) de plus forte densité
+        (au hasard parmi les ex æquo), ou None si tout a été tiré.
+        """
+        if self.cache is None:
+            candidats = self.meilleures_cases()
+        else:
+            candidats = self.cache.meilleures_cases(self)
+        if not candidats:
+            return None
+        return divmod(self.rng.choice(candidats), self.cols)
+
+    def enregistrer(self, row, col, resultat, cases_coule=None):
+        """
+        Met à jour la connaissance de l'IA après un tir en (row, col).
+        Pour un tir "coule", 'cases_coule' est la liste des (row, col)
+        du navire coulé (révélé à l'écran dans main.py).
+        """
+        bit = 1 << (row * self.cols + col)
+        self.deja_tires |= bit
+        if resultat == "manque":
+            self.rates |= bit
+        elif resultat == "touche":
+            self.touches |= bit
+        elif resultat == "coule":
+            masque = 0
+            for (r, c) in cases_coule:
+                masque |= 1 << (r * self.cols + c)
+            self.touches &= ~masque
+            self.coules |= masque
+            if len(cases_coule) in self.tailles_restantes:
+                self.tailles_restantes.remove(len(cases_coule))
+
+    def marquer_tire(self, row, col):
+        """
+        Signale une case déjà visée dont le résultat n'est pas connu
+        (IA activée en cours de partie) : elle ne sera plus choisie.
+        """
+        self.deja_tires |= 1 << (row * self.cols + col)
+
+
+class IAMonteCarlo(IADensite):
+    """
+    Classe IAMonteCarlo
+    ------------------
+    IA "monte-carlo" : à chaque tour, elle tire au hasard de nombreuses
+    flottes adverses complètes compatibles avec ce qu'elle sait (tirs
+    manqués, touches, navires coulés) et vise la case libre occupée dans
+    le plus grand nombre de ces flottes.
+
+    Contrairement à IADensite, qui compte chaque navire indépendamment,
+    les navires d'une même flotte ne se chevauchent pas et doivent
+    ensemble recouvrir toutes les touches : c'est une approximation de la
+    loi a posteriori de la position de la flotte.
+
+    Génération d'une flotte (mêmes règles que peut_placer_navire /
+    placer_navire) :
+    - les touches non encore recouvertes sont d'abord couvertes, chacune
+      par un placement tiré parmi ceux qui la recouvrent ;
+    - les navires restants sont tirés parmi leurs placements valides ;
+    - un navire qui chevauche la flotte en cours est retiré au plus
+      ESSAIS fois, puis la flotte est abandonnée.
+    Couvrir les touches en premier favorise certaines flottes : chaque
+    flotte est donc pondérée par l'inverse (approché) de sa probabilité
+    de tirage, le produit du nombre de choix possibles à chaque étape.
+
+    Les placements valides de chaque taille (sans case manquée ni coulée)
+    sont élagués au fil de la partie, seulement avec les nouvelles cases
+    interdites. Les poids d'un tour sont cumulés par placement tiré avant
+    d'être reportés sur les cases.
+
+    Environ 3 µs par flotte sur une grille 10x10 : ECHANTILLONS flottes
+    prennent quelques millisecondes par tour, 20000 moins de 100 ms.
+    L'échantillonnage s'arrête plus tôt si l'échéance est dépassée.
+    Les placements valides étant des listes de masques, l'IA est réservée
+    aux grilles indexables (Placements.indexable) : ValueError au-delà.
+
+    Attributs principaux (en plus de ceux de IADensite) :
+    - nb_echantillons (int) : flottes générées par tour
+    - valides (dict[int, list[tuple[int, tuple[int]]]]) : (masque, cases)
+      des placements encore possibles par taille de navire
+    - bloque_valides (int) : cases interdites déjà appliquées à valides
+    - acceptes (int) : flottes compatibles obtenues au dernier tour
+    """
+    ECHANTILLONS = 2000
+    ESSAIS = 8
+
+    def __init__(self, flotte=None, rows=10, cols=10, rng=None, cache=None, nb_echantillons=None):
+        if not indexable(rows, cols):
+            raise ValueError(f"Grille trop grande pour l'IA monte-carlo : {rows}x{cols}")
+        super().__init__(flotte, rows, cols, rng, cache)
+        self.nb_echantillons = self.ECHANTILLONS if nb_echantillons is None else nb_echantillons
+        self.valides = {
+            taille: [(masque, cases) for (masque, _, _, _, cases) in placements(taille, rows, cols)]
+            for taille in set(self.tailles_restantes)
+        }
+        self.bloque_valides = 0
+        self.acceptes = 0
+
+    def elaguer(self):
+        """
+        Retire de self.valides les placements qui recouvrent une case
+        manquée ou coulée apparue depuis le dernier élagage.
+        """
+        bloque = self.rates | self.coules
+        nouveau = bloque & ~self.bloque_valides
+        if nouveau:
+            for taille, liste in self.valides.items():
+                self.valides[taille] = [p for p in liste if not p[0] & nouveau]
+            self.bloque_valides = bloque
+
+    def densites(self):
+        """
+        Retourne la liste (longueur rows*cols) du poids cumulé des flottes
+        échantillonnées occupant chaque case. Si aucune flotte compatible
+        n'a été trouvée, se replie sur le comptage de IADensite.
+        """
+        self.elaguer()
+        tailles = sorted(self.tailles_restantes, reverse=True)
+        valides = self.valides
+        touches = self.touches
+        randrange = self.rng.randrange
+        essais = self.ESSAIS
+
+        # Placements recouvrant chaque touche (bit => liste de (taille, masque))
+        couvrants = {}
+        reste = touches
+        while reste:
+            bit = reste & -reste
+            reste ^= bit
+            couvrants[bit] = [(taille, masque) for taille in set(tailles)
+                              for (masque, _) in valides[taille] if masque & bit]
+
+        poids_placements = {}
+        acceptes = 0
+        echeance = self.echeance
+        self.interrompu = False
+        for n in range(self.nb_echantillons):
+            # Budget de temps vérifié toutes les 64 flottes
+            if echeance is not None and not n & 63 and time.perf_counter() > echeance:
+                self.interrompu = True
+                break
+            occupe = 0
+            restantes = list(tailles)
+            choisis = []
+            poids = 1
+            a_couvrir = touches
+            echec = False
+            while a_couvrir:
+                candidats = couvrants[a_couvrir & -a_couvrir]
+                poids *= len(candidats)
+                for _ in range(essais):
+                    (taille, masque) = candidats[randrange(len(candidats))] if candidats else (0, 0)
+                    if masque and not masque & occupe and taille in restantes:
+                        break
+                else:
+                    echec = True
+                    break
+                restantes.remove(taille)
+                occupe |= masque
+                choisis.append(masque)
+                a_couvrir &= ~masque
+            if echec:
+                continue
+            for taille in restantes:
+                liste = valides[taille]
+                if not liste:
+                    echec = True
+                    break
+                for _ in range(essais):
+                    masque = liste[randrange(len(liste))][0]
+                    if not masque & occupe:
+                        break
+                else:
+                    echec = True
+                    break
+                occupe |= masque
+                choisis.append(masque)
+                poids *= len(liste)
+            if echec:
+                continue
+            acceptes += 1
+            for masque in choisis:
+                poids_placements[masque] = poids_placements.get(masque, 0) + poids
+
+        self.acceptes = acceptes
+        if not acceptes:
+            return super().densites()
+
+        # Report du poids de chaque placement tiré sur ses cases
+        cases_de = {masque: cases for liste in valides.values() for (masque, cases) in liste}
+        compte = [0] * (self.rows * self.cols)
+        for masque, nb in poids_placements.items():
+            for i in cases_de[masque]:
+                compte[i] += nb
+        return compte
@@ -0,0 +1,224 @@
+"""
+Module Instrumentation
+----------------------
+Chronométrage optionnel des phases d'un tour de jeu (tir du joueur,
+décision de l'IA, affichage, statistiques...), pour savoir où passe le
+temps dans l'interface Tk ou dans une simulation.
+
+    with instrumentation.phase("tir_joueur"):
+        resultat = joueur.tirer_sur(ordinateur, row, col)
+
+    plateau.flush = instrumentation.envelopper("affichage", plateau.flush)
+
+Désactivée (par défaut), une Instrumentation ne mesure rien : phase()
+retourne un contexte vide partagé et envelopper() rend la fonction telle
+quelle. Elle peut donc rester en place en production.
+
+Activée, chaque phase garde ses FENETRE dernières durées (histogramme
+glissant) et son temps cumulé par pile de phases imbriquées
+("tour;tir_joueur"), enregistrable au format « collapsed stacks » de
+flamegraph.pl / speedscope (enregistrer_piles). Un profil cProfile de
+toute la session peut s'y ajouter (demarrer_profil / enregistrer_profil,
+fichier lisible par pstats, snakeviz, flameprof...).
+
+    python main.py --instrumentation
+    python main.py --profil session.prof       (+ session.prof.folded)
+    python Simulation.py -n 1000 --ia1 expert --profil simulation.prof
+"""
+import threading
+import time
+from collections import deque
+
+
+class _SansMesure:
+    """Contexte vide retourné par phase() quand l'instrumentation est désactivée."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+SANS_MESURE = _SansMesure()
+
+
+class _Chrono:
+    """Contexte qui chronomètre une phase et l'ajoute à l'instrumentation."""
+    def __init__(self, instrumentation, nom):
+        self.instrumentation = instrumentation
+        self.nom = nom
+
+    def __enter__(self):
+        self.pile = self.instrumentation.pile()
+        self.pile.append(self.nom)
+        self.debut = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duree = time.perf_counter() - self.debut
+        self.instrumentation.ajouter(self.nom, duree, ";".join(self.pile))
+        self.pile.pop()
+        return False
+
+
+def centile(valeurs_triees, p):
+    """
+    Retourne le centile 'p' (0-100) d'une liste triée.
+    """
+    return valeurs_triees[min(len(valeurs_triees) - 1, int(p / 100 * len(valeurs_triees)))]
+
+
+class Instrumentation:
+    """
+    Classe Instrumentation
+    ---------------------
+    Durées des phases d'un tour, par phase et par pile de phases.
+
+    Attributs principaux :
+    - actif (bool) : si False, rien n'est mesuré
+    - fenetre (int) : nombre de dernières durées gardées par phase
+    - durees (dict[str, deque[float]]) : dernières durées de chaque phase (s)
+    - appels (dict[str, int]) : nombre total de mesures de chaque phase
+    - piles (dict[str, float]) : temps cumulé par pile "phase;sous-phase" (s)
+    - profil (cProfile.Profile|None) : profil en cours (demarrer_profil)
+
+    Les phases peuvent être mesurées depuis plusieurs threads (ex : tir de
+    l'IA calculé par TourIA) : chaque thread a sa propre pile.
+
+    Méthodes principales :
+    - phase(nom) : contexte qui chronomètre une phase
+    - envelopper(nom, fonction) : fonction chronométrée comme une phase
+    - ajouter(nom, duree) : ajoute une durée mesurée ailleurs
+    - histogramme(nom) : répartition des dernières durées
+    - rapport() : texte résumant toutes les phases
+    - enregistrer_piles(chemin) : temps par pile, format flamegraph
+    - demarrer_profil(), enregistrer_profil(chemin) : profil cProfile
+    """
+    FENETRE = 1000
+
+    def __init__(self, actif=False, fenetre=None):
+        self.actif = actif
+        self.fenetre = self.FENETRE if fenetre is None else fenetre
+        self.durees = {}
+        self.appels = {}
+        self.piles = {}
+        self.local = threading.local()
+        self.verrou = threading.Lock()
+        self.profil = None
+
+    def pile(self):
+        """Retourne la pile des phases en cours du thread appelant."""
+        try:
+            return self.local.pile
+        except AttributeError:
+            self.local.pile = []
+            return self.local.pile
+
+    def phase(self, nom):
+        """
+        Retourne un contexte (with) qui chronomètre la phase 'nom',
+        ou un contexte vide si l'instrumentation est désactivée.
+        """
+        if not self.actif:
+            return SANS_MESURE
+        return _Chrono(self, nom)
+
+    def envelopper(self, nom, fonction):
+        """
+        Retourne 'fonction' chronométrée comme la phase 'nom' à chaque
+        appel ; désactivée, retourne 'fonction' elle-même (aucun surcoût).
+        """
+        if not self.actif:
+            return fonction
+
+        def chronometree(*args, **kwargs):
+            with _Chrono(self, nom):
+                return fonction(*args, **kwargs)
+        return chronometree
+
+    def ajouter(self, nom, duree, pile=None):
+        """
+        Ajoute une durée (secondes) à la phase 'nom' ; 'pile' est la pile
+        de phases complète ("tour;nom"), par défaut le nom seul.
+        """
+        with self.verrou:
+            if nom not in self.durees:
+                self.durees[nom] = deque(maxlen=self.fenetre)
+                self.appels[nom] = 0
+            self.durees[nom].append(duree)
+            self.appels[nom] += 1
+            pile = nom if pile is None else pile
+            self.piles[pile] = self.piles.get(pile, 0.0) + duree
+
+    def histogramme(self, nom):
+        """
+        Retourne la répartition des dernières durées de la phase 'nom' par
+        puissances de 2 : liste de (borne basse µs, borne haute µs, nombre).
+        """
+        comptes = {}
+        for duree in list(self.durees.get(nom, ())):
+            classe = int(duree * 1e6).bit_length()
+            comptes[classe] = comptes.get(classe, 0) + 1
+        return [((1 << classe) >> 1, 1 << classe, comptes[classe]) for classe in sorted(comptes)]
+
+    def rapport(self, histogrammes=False):
+        """
+        Retourne un texte résumant chaque phase : nombre de mesures, puis
+        moyenne, centiles et maximum des dernières durées (µs).
+        Avec 'histogrammes', ajoute la répartition des durées de chaque phase.
+        """
+        with self.verrou:
+            phases = {nom: sorted(durees) for nom, durees in self.durees.items()}
+        if not phases:
+            return "[INSTRUMENTATION] Aucune mesure."
+        lignes = [f"[INSTRUMENTATION] {'phase':<16} {'appels':>8} {'moy µs':>9} {'p50 µs':>9} "
+                  f"{'p95 µs':>9} {'p99 µs':>9} {'max µs':>9}"]
+        for nom in sorted(phases, key=lambda n: -sum(phases[n])):
+            durees = phases[nom]
+            (moyenne, p50, p95, p99, maximum) = (1e6 * sum(durees) / len(durees), 1e6 * centile(durees, 50),
+                                                 1e6 * centile(durees, 95), 1e6 * centile(durees, 99),
+                                                 1e6 * durees[-1])
+            lignes.append(f"[INSTRUMENTATION] {nom:<16} {self.appels[nom]:>8} {moyenne:>9.1f} {p50:>9.1f} "
+                          f"{p95:>9.1f} {p99:>9.1f} {maximum:>9.1f}")
+            if histogrammes:
+                classes = self.histogramme(nom)
+                plus_grande = max(nombre for (_, _, nombre) in classes)
+                for (bas, haut, nombre) in classes:
+                    barre = "#" * max(1, round(40 * nombre / plus_grande))
+                    lignes.append(f"    {bas:>8}-{haut:<8} µs {nombre:>6} {barre}")
+        return "\n".join(lignes)
+
+    def enregistrer_piles(self, chemin):
+        """
+        Écrit le temps cumulé de chaque pile de phases au format
+        « collapsed stacks » ("tour;tir_joueur 1234", en µs), lisible par
+        flamegraph.pl ou speedscope. Le temps propre d'une phase est son
+        temps total moins celui de ses sous-phases.
+        """
+        propres = dict(self.piles)
+        for pile, duree in self.piles.items():
+            parent = pile.rpartition(";")[0]
+            if parent in propres:
+                propres[parent] -= duree
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            for pile in sorted(propres):
+                microsecondes = round(1e6 * propres[pile])
+                if microsecondes > 0:
+                    fichier.write(f"{pile} {microsecondes}\n")
+
+    def demarrer_profil(self):
+        """Démarre un profil cProfile (toutes les fonctions) du thread appelant."""
+        import cProfile
+        self.profil = cProfile.Profile()
+        self.profil.enable()
+
+    def enregistrer_profil(self, chemin):
+        """
+        Arrête le profil cProfile et l'écrit dans 'chemin' (format pstats),
+        puis écrit les piles de phases dans chemin + ".folded".
+        """
+        if self.profil is not None:
+            self.profil.disable()
+            self.profil.dump_stats(chemin)
+            self.profil = None
+        self.enregistrer_piles(chemin + ".folded")
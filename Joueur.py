@@ -1,5 +1,10 @@
 import random
+from collections import deque
 from Navire import *
+from CasesLibres import *
+from IA import *
+from CacheTirs import *
+from Placements import *
 class Joueur:
     """
     Classe Joueur
@@ -8,27 +13,60 @@ class Joueur:
 
     Attributs principaux :
     - nom (str) : le nom du joueur
+    - rows, cols (int) : dimensions de la grille (par défaut 10x10)
+    - flotte (list[tuple[str, int]]) : (nom, taille) des navires de la partie
+      (par défaut Navire.NAVIRES_DISPONIBLES)
     - navires (list[Navire]) : la liste de tous ses navires
-    - grille (list[list[Navire|None]]) : grille 10x10, None si vide
+    - navires_a_flot (int) : nombre de ses navires pas encore coulés
+    - grille (dict[tuple[int, int], Navire]) : grille creuse, seules les
+      cases occupées y figurent (utiliser navire_en(row, col))
+    - occupation (int) : masque des cases occupées (bit row*cols+col),
+      utilisé avec Placements pour valider un placement
+    - rng : générateur aléatoire du joueur (placement aléatoire, tirs de
+      l'IA) ; par défaut le module random, une partie reproductible passe
+      son propre générateur (voir Aleatoire.nouveau_generateur)
     - tirs_effectues (set[tuple[int, int]]) : ensemble des coups déjà tirés
+    - cases_libres (CasesLibres|None) : cases de la grille adverse pas encore
+      visées (index row*cols+col), pour un tir aléatoire en O(1) ; créé au
+      premier tir (un joueur qui ne tire jamais n'en a pas besoin)
+    - niveau (str) : niveau de l'IA, "facile", "difficile", "expert" ou "monte-carlo"
     - mode_difficile (bool) : True si l'IA est en mode difficile (cases
       adjacentes ciblées après un tir touché), False sinon
-    - reserve_cibles_proches (list[tuple[int, int]]) : liste des cases à
-      cibler en priorité quand un navire vient d'être touché (IA difficile)
+    - ia (IADensite|IAMonteCarlo|None) : stratégie des niveaux "expert"
+      et "monte-carlo"
+    - dernier_coule (Navire|None) : dernier navire adverse coulé par ce joueur
+    - reserve_cibles_proches (deque[tuple[int, int]]|None) : file des cases à
+      cibler en priorité quand un navire vient d'être touché (IA difficile,
+      créée au passage en mode difficile)
+    - cibles_en_reserve (set[tuple[int, int]]|None) : cases présentes dans la
+      file, pour ne pas l'alimenter deux fois avec la même case
     - tirs_reussis (int) : nombre de tirs réussis (touché ou coulé)
     - tirs_rates (int) : nombre de tirs ratés (manqué)
     """
-    def __init__(self, nom):
+    NIVEAUX = ("facile", "difficile", "expert", "monte-carlo")
+
+    def __init__(self, nom, rows=10, cols=10, flotte=None, rng=None):
         self.nom = nom
+        self.rows = rows
+        self.cols = cols
+        self.flotte = Navire.NAVIRES_DISPONIBLES if flotte is None else flotte
         self.navires = []
-        # Grille 10x10 : None => case vide, sinon référence vers un Navire
-        self.grille = [[None for _ in range(10)] for _ in range(10)]
+        self.navires_a_flot = 0
+        # Grille creuse : (row, col) => Navire, case absente => vide
+        self.grille = {}
+        self.occupation = 0
+        self.rng = random if rng is None else rng
         # Liste des coups déjà tirés (row, col)
         self.tirs_effectues = set()
+        self.cases_libres = None
 
         # Pour la difficulté IA
+        self.niveau = "facile"
         self.mode_difficile = False
-        self.reserve_cibles_proches = []
+        self.ia = None
+        self.reserve_cibles_proches = None
+        self.cibles_en_reserve = None
+        self.dernier_coule = None
 
         # Pour le comptage des tirs
         self.tirs_reussis = 0
@@ -40,18 +78,60 @@ class Joueur:
         - True => IA tire sur les cases adjacentes quand un tir est touché
         - False => IA tire de façon totalement aléatoire
         """
-        self.mode_difficile = not self.mode_difficile
+        self.definir_niveau("facile" if self.mode_difficile else "difficile")
         mode_str = "DIFFICILE" if self.mode_difficile else "FACILE"
         print(f"[INFO] Le mode de {self.nom} est maintenant : {mode_str}")
 
+    def definir_niveau(self, niveau):
+        """
+        Choisit le niveau de l'IA :
+        - "facile" => tirs totalement aléatoires
+        - "difficile" => cases adjacentes ciblées après un tir touché
+        - "expert" => tir sur la case de plus forte densité de placements
+          possibles (voir IADensite)
+        - "monte-carlo" => tir sur la case la plus souvent occupée dans des
+          flottes complètes tirées au hasard (voir IAMonteCarlo) ; réservé
+          aux grilles indexables (Placements.indexable), ValueError sinon
+        """
+        if niveau not in self.NIVEAUX:
+            raise ValueError(f"Niveau inconnu : {niveau}")
+        if niveau == "monte-carlo" and not indexable(self.rows, self.cols):
+            raise ValueError(f"Niveau monte-carlo impossible sur une grille {self.rows}x{self.cols}")
+        self.niveau = niveau
+        self.mode_difficile = (niveau == "difficile")
+        if self.mode_difficile and self.reserve_cibles_proches is None:
+            self.reserve_cibles_proches = deque()
+            self.cibles_en_reserve = set()
+        self.ia = None
+        if niveau in ("expert", "monte-carlo"):
+            classe = IADensite if niveau == "expert" else IAMonteCarlo
+            self.ia = classe(self.flotte, self.rows, self.cols, self.rng,
+                             cache_partage(classe, self.rows, self.cols))
+            # Niveau choisi en cours de partie : on ne retire pas sur les mêmes cases
+            for (r, c) in self.tirs_effectues:
+                self.ia.marquer_tire(r, c)
+
+    def niveau_suivant(self):
+        """
+        Passe au niveau suivant (facile -> difficile -> expert -> monte-carlo -> facile),
+        sans monte-carlo sur une grille trop grande (voir definir_niveau).
+        """
+        i = self.NIVEAUX.index(self.niveau)
+        niveau = self.NIVEAUX[(i + 1) % len(self.NIVEAUX)]
+        if niveau == "monte-carlo" and not indexable(self.rows, self.cols):
+            niveau = self.NIVEAUX[0]
+        self.definir_niveau(niveau)
+        print(f"[INFO] Le mode de {self.nom} est maintenant : {self.niveau.upper()}")
+
     def initialiser_navires(self):
         """
-        Crée tous les navires définis dans Navire.NAVIRES_DISPONIBLES
+        Crée tous les navires définis dans self.flotte
         et les ajoute à la liste self.navires.
         """
-        for (nom, taille) in Navire.NAVIRES_DISPONIBLES:
+        for (nom, taille) in self.flotte:
             navire = Navire(nom, taille)
             self.navires.append(navire)
+            self.navires_a_flot += 1
 
     def navires_non_places(self):
         """
@@ -70,55 +150,122 @@ class Joueur:
                 return n
         return None
 
+    def navire_en(self, row, col):
+        """
+        Retourne le Navire occupant la case (row, col), ou None si elle est vide.
+        """
+        return self.grille.get((row, col))
+
     def peut_placer_navire(self, navire, start_row, start_col, orientation):
         """
         Vérifie si le navire (Navire) peut être placé à (start_row, start_col)
         en orientation 'H' (horizontal) ou 'V' (vertical),
         sans chevaucher un autre navire ou sortir de la grille.
         """
-        if orientation == 'H':
-            if start_col + navire.taille > 10:
-                return False
-            for c in range(start_col, start_col + navire.taille):
-                if self.grille[start_row][c] is not None:
-                    return False
-        else:  # 'V'
-            if start_row + navire.taille > 10:
-                return False
-            for r in range(start_row, start_row + navire.taille):
-                if self.grille[r][start_col] is not None:
-                    return False
-        return True
+        masque = masque_placement(navire.taille, start_row, start_col, orientation,
+                                  self.rows, self.cols)
+        return masque is not None and not (masque & self.occupation)
 
     def placer_navire(self, navire, start_row, start_col, orientation):
         """
         Place le navire (Navire) dans la grille (self.grille)
         et assigne ses positions (navire.positions).
         """
+        for (r, c) in navire.positions:
+            del self.grille[(r, c)]
+            self.occupation &= ~(1 << (r * self.cols + c))
         navire.positions.clear()
+        self.occupation |= masque_placement(navire.taille, start_row, start_col, orientation,
+                                            self.rows, self.cols)
         if orientation == 'H':
             for c in range(start_col, start_col + navire.taille):
-                self.grille[start_row][c] = navire
+                self.grille[(start_row, c)] = navire
                 navire.positions.append((start_row, c))
         else:
             for r in range(start_row, start_row + navire.taille):
-                self.grille[r][start_col] = navire
+                self.grille[(r, start_col)] = navire
                 navire.positions.append((r, start_col))
 
     def placement_aleatoire(self):
         """
         Place tous les navires de façon aléatoire (pour l'ordinateur).
-        Tente un placement jusqu'à ce que tous les navires soient positionnés.
+        Chaque navire est tiré uniformément parmi ses placements encore
+        valides (Placements.tirer_placement), sans boucle de rejet.
         """
         for navire in self.navires:
-            placed = False
-            while not placed:
-                ori = random.choice(["H", "V"])
-                row = random.randint(0, 9)
-                col = random.randint(0, 9)
-                if self.peut_placer_navire(navire, row, col, ori):
-                    self.placer_navire(navire, row, col, ori)
-                    placed = True
+            placement = tirer_placement(navire.taille, self.occupation, self.rng,
+                                        self.rows, self.cols)
+            if placement is None:
+                raise ValueError(f"Impossible de placer {navire.nom} : grille trop encombrée")
+            (_, row, col, ori, _) = placement
+            self.placer_navire(navire, row, col, ori)
+
+    def placement_uniforme(self):
+        """
+        Place tous les navires en tirant la flotte uniformément parmi
+        toutes les flottes légales (Placements.tirer_flotte), sans
+        favoriser le centre de la grille comme placement_aleatoire.
+        Sur une grille trop encombrée pour ce tirage, repli sur
+        placement_aleatoire.
+        """
+        flotte = tirer_flotte([navire.taille for navire in self.navires], self.rng, self.rows, self.cols)
+        if flotte is None:
+            self.placement_aleatoire()
+            return
+        for (navire, (_, row, col, ori, _)) in zip(self.navires, flotte):
+            self.placer_navire(navire, row, col, ori)
+
+    def choisir_tir(self):
+        """
+        Choisit la prochaine case visée par l'IA.
+        - Aux niveaux expert et monte-carlo, on délègue à self.ia.
+        - En mode difficile, on vide d'abord reserve_cibles_proches
+          (cases adjacentes d'un tir touché) en ignorant les cases déjà tirées.
+        - Sinon (ou si la réserve est vide), tir aléatoire sur une case libre,
+          tirée en O(1) dans self.cases_libres.
+        Retourne (row, col), ou None si toutes les cases ont été tirées.
+        """
+        ia = self.ia
+        if ia is not None:
+            return ia.choisir_tir()
+
+        if self.mode_difficile:
+            reserve = self.reserve_cibles_proches
+            while reserve:
+                cible = reserve.popleft()
+                self.cibles_en_reserve.discard(cible)
+                if cible not in self.tirs_effectues:
+                    return cible
+
+        if self.cases_libres is None:
+            self.cases_libres = CasesLibres(self.rows * self.cols)
+        case = self.cases_libres.tirer(self.rng)
+        if case is None:
+            return None
+        return divmod(case, self.cols)
+
+    def enregistrer_resultat(self, row, col, resultat):
+        """
+        Met à jour la mémoire de l'IA après son tir en (row, col).
+        En mode difficile, un tir "touche" ajoute les cases adjacentes
+        non encore tirées dans reserve_cibles_proches.
+        Aux niveaux expert et monte-carlo, le résultat (et les cases d'un navire coulé)
+        est transmis à self.ia.
+        """
+        if self.ia is not None:
+            cases_coule = self.dernier_coule.positions if resultat == "coule" else None
+            self.ia.enregistrer(row, col, resultat, cases_coule)
+            return
+
+        if resultat == "touche" and self.mode_difficile:
+            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            for (dr, dc) in directions:
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    cible = (nr, nc)
+                    if cible not in self.tirs_effectues and cible not in self.cibles_en_reserve:
+                        self.cibles_en_reserve.add(cible)
+                        self.reserve_cibles_proches.append(cible)
 
     def tirer_sur(self, autre_joueur, row, col):
         """
@@ -131,22 +278,26 @@ class Joueur:
         if (row, col) in self.tirs_effectues:
             return "deja_tire"
         self.tirs_effectues.add((row, col))
+        if self.cases_libres is None:
+            self.cases_libres = CasesLibres(self.rows * self.cols)
+        self.cases_libres.retirer(row * self.cols + col)
 
-        navire = autre_joueur.grille[row][col]
+        navire = autre_joueur.grille.get((row, col))
         if navire is None:
             # Tir manqué
             self.tirs_rates += 1
             return "manque"
         else:
             # Tir touché
-            if (row, col) not in navire.positions_touchees:
-                navire.positions_touchees.append((row, col))
+            navire.toucher(row, col)
 
             # On incrémente les tirs réussis
             self.tirs_reussis += 1
 
             # Vérifier si le navire est coulé
-            if navire.est_coule():
+            if navire.nb_touches == navire.taille:
+                self.dernier_coule = navire
+                autre_joueur.navires_a_flot -= 1
                 return "coule"
             else:
                 return "touche"
@@ -155,7 +306,7 @@ class Joueur:
         """
         Retourne True si tous les navires du joueur
         (self.navires) sont coulés, False sinon.
+        Temps constant : on tient le compte des navires à flot.
         """
-
-        return all(navire.est_coule() for navire in self.navires)
+        return self.navires_a_flot == 0
 
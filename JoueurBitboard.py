@@ -0,0 +1,320 @@
+import random
+from collections import deque
+from Navire import *
+from CasesLibres import *
+from IA import *
+from CacheTirs import *
+from Placements import *
+
+
+class JoueurBitboard:
+    """
+    Classe JoueurBitboard
+    --------------------
+    Variante compacte de Joueur pour la simulation : la grille, les tirs
+    et les touches sont des entiers de rows*cols bits (bit row*cols+col =
+    case (row, col)). Les tests de placement, la résolution d'un tir et la
+    détection "coulé" deviennent des opérations de masques.
+
+    Les navires sont désignés par leur index dans self.flotte (par défaut
+    Navire.NAVIRES_DISPONIBLES), aucun objet Navire n'est créé.
+
+    Chaque tir recopie le masque des tirs : ce backend vise les petites
+    grilles, les grandes grilles creuses relèvent de Joueur.
+
+    Pour la simulation, jouer_coup enchaîne choisir_tir, tirer_sur et
+    enregistrer_resultat en un seul appel, sur des index de cases, et
+    les attributs sont déclarés dans __slots__ (pas de dictionnaire par
+    instance) : un état de partie tient en une fraction de celui de Joueur.
+
+    Attributs principaux :
+    - nom (str) : le nom du joueur
+    - rows, cols (int) : dimensions de la grille
+    - flotte (list[tuple[str, int]]) : (nom, taille) de chaque navire
+    - masques (list[int]) : masque des cases de chaque navire (0 si non placé)
+    - occupation (int) : union des masques de tous les navires (le navire
+      touché est retrouvé en parcourant masques, quelques navires)
+    - coups_recus (int) : cases de CE joueur touchées par l'adversaire
+    - tirs (int) : cases sur lesquelles CE joueur a déjà tiré
+    - rng, niveau, mode_difficile, ia, cases_libres, reserve_cibles_proches,
+      cibles_en_reserve, tirs_reussis, tirs_rates : mêmes rôles que dans Joueur
+    - dernier_coule (int) : masque du dernier navire adverse coulé
+    """
+    __slots__ = ("nom", "rows", "cols", "nb_cases", "flotte", "masques", "occupation", "bits",
+                 "coups_recus", "tirs", "rng", "cases_libres", "niveau", "mode_difficile", "ia",
+                 "reserve_cibles_proches", "cibles_en_reserve", "dernier_coule", "tirs_reussis", "tirs_rates")
+    NIVEAUX = ("facile", "difficile", "expert", "monte-carlo")
+    # nb_cases -> tuple BITS où BITS[i] == 1 << i (petites grilles seulement),
+    # évite de recalculer le décalage à chaque tir
+    BITS = {}
+
+    def __init__(self, nom, rows=10, cols=10, flotte=None, rng=None):
+        self.nom = nom
+        self.rows = rows
+        self.cols = cols
+        self.nb_cases = rows * cols
+        self.flotte = Navire.NAVIRES_DISPONIBLES if flotte is None else flotte
+        self.masques = [0] * len(self.flotte)
+        self.occupation = 0
+        self.bits = None
+        if indexable(rows, cols):
+            if self.nb_cases not in self.BITS:
+                self.BITS[self.nb_cases] = tuple(1 << i for i in range(self.nb_cases))
+            self.bits = self.BITS[self.nb_cases]
+        self.coups_recus = 0
+        self.tirs = 0
+        self.rng = random if rng is None else rng
+        self.cases_libres = None
+
+        # Pour la difficulté IA
+        self.niveau = "facile"
+        self.mode_difficile = False
+        self.ia = None
+        self.reserve_cibles_proches = None
+        self.cibles_en_reserve = None
+        self.dernier_coule = 0
+
+        # Pour le comptage des tirs
+        self.tirs_reussis = 0
+        self.tirs_rates = 0
+
+    def masque_navire(self, taille, start_row, start_col, orientation):
+        """
+        Retourne le masque des cases couvertes par un navire de 'taille'
+        placé en (start_row, start_col), ou None s'il sort de la grille
+        (voir Placements.masque_placement).
+        """
+        return masque_placement(taille, start_row, start_col, orientation, self.rows, self.cols)
+
+    def cases(self, masque):
+        """
+        Retourne la liste des (row, col) dont le bit est à 1 dans 'masque'.
+        """
+        n = self.cols
+        positions = []
+        while masque:
+            bas = masque & -masque
+            indice = bas.bit_length() - 1
+            positions.append(divmod(indice, n))
+            masque ^= bas
+        return positions
+
+    def peut_placer_navire(self, indice, start_row, start_col, orientation):
+        """
+        Vérifie si le navire n° 'indice' peut être placé à (start_row, start_col)
+        en orientation 'H' ou 'V', sans chevaucher un autre navire ni sortir
+        de la grille.
+        """
+        taille = self.flotte[indice][1]
+        masque = self.masque_navire(taille, start_row, start_col, orientation)
+        return masque is not None and not (masque & self.occupation)
+
+    def placer_navire(self, indice, start_row, start_col, orientation):
+        """
+        Place le navire n° 'indice' (remplace un éventuel placement précédent).
+        """
+        taille = self.flotte[indice][1]
+        masque = self.masque_navire(taille, start_row, start_col, orientation)
+        self.occupation = (self.occupation & ~self.masques[indice]) | masque
+        self.masques[indice] = masque
+
+    def placement_aleatoire(self):
+        """
+        Place tous les navires de façon aléatoire, avec le même tirage
+        que Joueur.placement_aleatoire (uniforme parmi les placements valides).
+        """
+        for indice, (nom, taille) in enumerate(self.flotte):
+            placement = tirer_placement(taille, self.occupation, self.rng, self.rows, self.cols)
+            if placement is None:
+                raise ValueError(f"Impossible de placer {nom} : grille trop encombrée")
+            (_, row, col, ori, _) = placement
+            self.placer_navire(indice, row, col, ori)
+
+    def placement_uniforme(self):
+        """
+        Même tirage que Joueur.placement_uniforme (flotte uniforme parmi
+        les flottes légales).
+        """
+        flotte = tirer_flotte([taille for (_, taille) in self.flotte], self.rng, self.rows, self.cols)
+        if flotte is None:
+            self.placement_aleatoire()
+            return
+        for indice, (_, row, col, ori, _) in enumerate(flotte):
+            self.placer_navire(indice, row, col, ori)
+
+    def definir_niveau(self, niveau):
+        """
+        Même logique que Joueur.definir_niveau.
+        """
+        if niveau not in self.NIVEAUX:
+            raise ValueError(f"Niveau inconnu : {niveau}")
+        if niveau == "monte-carlo" and not indexable(self.rows, self.cols):
+            raise ValueError(f"Niveau monte-carlo impossible sur une grille {self.rows}x{self.cols}")
+        self.niveau = niveau
+        self.mode_difficile = (niveau == "difficile")
+        if self.mode_difficile and self.reserve_cibles_proches is None:
+            self.reserve_cibles_proches = deque()
+            self.cibles_en_reserve = set()
+        self.ia = None
+        if niveau in ("expert", "monte-carlo"):
+            classe = IADensite if niveau == "expert" else IAMonteCarlo
+            self.ia = classe(self.flotte, self.rows, self.cols, self.rng,
+                             cache_partage(classe, self.rows, self.cols))
+            for (r, c) in self.cases(self.tirs):
+                self.ia.marquer_tire(r, c)
+
+    def choisir_tir(self):
+        """
+        Même logique que Joueur.choisir_tir : self.ia aux niveaux expert et monte-carlo,
+        réserve de cases adjacentes en mode difficile, sinon une case
+        libre tirée uniformément.
+        """
+        ia = self.ia
+        if ia is not None:
+            return ia.choisir_tir()
+
+        n = self.cols
+        if self.mode_difficile:
+            reserve = self.reserve_cibles_proches
+            while reserve:
+                cible = reserve.popleft()
+                self.cibles_en_reserve.discard(cible)
+                if not (self.tirs >> (cible[0] * n + cible[1])) & 1:
+                    return cible
+
+        if self.cases_libres is None:
+            self.cases_libres = CasesLibres(self.nb_cases)
+        indice = self.cases_libres.tirer(self.rng)
+        if indice is None:
+            return None
+        return divmod(indice, n)
+
+    def enregistrer_resultat(self, row, col, resultat):
+        """
+        Même logique que Joueur.enregistrer_resultat.
+        """
+        if self.ia is not None:
+            cases_coule = self.cases(self.dernier_coule) if resultat == "coule" else None
+            self.ia.enregistrer(row, col, resultat, cases_coule)
+            return
+
+        if resultat == "touche" and self.mode_difficile:
+            directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+            for (dr, dc) in directions:
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    cible = (nr, nc)
+                    if not (self.tirs >> (nr * self.cols + nc)) & 1 and cible not in self.cibles_en_reserve:
+                        self.cibles_en_reserve.add(cible)
+                        self.reserve_cibles_proches.append(cible)
+
+    def tirer_sur(self, autre_joueur, row, col):
+        """
+        Le joueur (self) tire sur 'autre_joueur' à (row, col).
+        Retourne : "touche", "coule", "manque" ou "deja_tire".
+        """
+        case = row * self.cols + col
+        bit = 1 << case if self.bits is None else self.bits[case]
+        tirs = self.tirs
+        if tirs & bit:
+            return "deja_tire"
+        self.tirs = tirs | bit
+        libres = self.cases_libres
+        if libres is None:
+            libres = self.cases_libres = CasesLibres(self.nb_cases)
+        libres.retirer(case)
+
+        if not (autre_joueur.occupation & bit):
+            self.tirs_rates += 1
+            return "manque"
+
+        recus = autre_joueur.coups_recus | bit
+        autre_joueur.coups_recus = recus
+        self.tirs_reussis += 1
+        for masque in autre_joueur.masques:
+            if masque & bit:
+                break
+        if recus & masque == masque:
+            self.dernier_coule = masque
+            return "coule"
+        return "touche"
+
+    def jouer_coup(self, cible):
+        """
+        Joue un tour contre 'cible' : choisir_tir, tirer_sur puis
+        enregistrer_resultat, avec les mêmes tirages (même partie pour une
+        même graine), mais sans passer par (row, col) ni vérifier une case
+        que choisir_tir garantit libre.
+        Retourne le résultat du tir ("manque", "touche" ou "coule"), ou
+        None si toutes les cases ont été tirées.
+        """
+        if self.ia is not None:
+            tir = self.choisir_tir()
+            if tir is None:
+                return None
+            resultat = self.tirer_sur(cible, *tir)
+            self.enregistrer_resultat(*tir, resultat)
+            return resultat
+
+        n = self.cols
+        tirs = self.tirs
+        case = -1
+        if self.mode_difficile:
+            reserve = self.reserve_cibles_proches
+            while reserve:
+                cible_proche = reserve.popleft()
+                self.cibles_en_reserve.discard(cible_proche)
+                indice = cible_proche[0] * n + cible_proche[1]
+                if not (tirs >> indice) & 1:
+                    case = indice
+                    break
+        libres = self.cases_libres
+        if libres is None:
+            libres = self.cases_libres = CasesLibres(self.nb_cases)
+        if case < 0:
+            case = libres.tirer(self.rng)
+            if case is None:
+                return None
+
+        # tirer_sur
+        bit = 1 << case if self.bits is None else self.bits[case]
+        self.tirs = tirs | bit
+        libres.retirer(case)
+        if not (cible.occupation & bit):
+            self.tirs_rates += 1
+            return "manque"
+        recus = cible.coups_recus | bit
+        cible.coups_recus = recus
+        self.tirs_reussis += 1
+        for masque in cible.masques:
+            if masque & bit:
+                break
+        if recus & masque == masque:
+            self.dernier_coule = masque
+            return "coule"
+        if self.mode_difficile:
+            self.enregistrer_resultat(*divmod(case, n), "touche")
+        return "touche"
+
+    def navire_en(self, row, col):
+        """
+        Retourne l'index du navire occupant (row, col), ou None si la case est vide.
+        """
+        bit = 1 << (row * self.cols + col)
+        for (indice, masque) in enumerate(self.masques):
+            if masque & bit:
+                return indice
+        return None
+
+    def est_coule(self, indice):
+        """
+        Retourne True si toutes les cases du navire n° 'indice' sont touchées.
+        """
+        masque = self.masques[indice]
+        return self.coups_recus & masque == masque
+
+    def tous_navires_coules(self):
+        """
+        Retourne True si toutes les cases occupées ont été touchées.
+        """
+        return self.coups_recus & self.occupation == self.occupation
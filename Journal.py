@@ -0,0 +1,296 @@
+"""
+Module Journal
+--------------
+Journal d'événements structuré, en ajout seul, pour enregistrer les
+parties (interface Tk ou simulation) et les rejouer.
+
+Une ligne JSON par événement, le premier champ "e" donnant le type :
+- {"e": "partie", "rows": 10, "cols": 10, "flotte": [[nom, taille], ...],
+   "graine": 42}  (graine seulement si la partie a été jouée avec une graine)
+- {"e": "placement", "j": 0, "n": 2, "row": 3, "col": 4, "ori": "H"}
+- {"e": "tir", "j": 1, "row": 3, "col": 4, "res": "touche", "t": 1.25}
+- {"e": "fin", "gagnant": 0, "t": 42.0}
+"j" vaut 0 pour le joueur (ou la première IA) et 1 pour l'ordinateur,
+"n" est l'index du navire dans la flotte, "t" le temps écoulé depuis le
+début de la partie (secondes).
+
+L'écriture est bufferisée par lots (Journal.TAILLE_LOT événements) et la
+lecture se fait ligne par ligne avec des générateurs : un journal de
+millions d'événements n'est jamais chargé en entier en mémoire.
+"""
+import json
+import time
+from Joueur import *
+from Sauvegarde import *
+
+
+class Journal:
+    """
+    Classe Journal
+    -------------
+    Enregistreur d'événements de parties, en ajout seul.
+
+    Attributs principaux :
+    - chemin (str) : fichier du journal (ouvert en ajout)
+    - tampon (list[str]) : lignes en attente d'écriture
+    - debut (float) : instant (perf_counter) du début de la partie en cours
+    - evenements (int) : nombre d'événements enregistrés
+
+    Méthodes principales :
+    - debut_partie(rows, cols, flotte), placement(...), tir(...),
+      fin_partie(gagnant) : enregistrent un événement
+    - vider() : écrit le tampon sur le disque
+    - fermer() : vide le tampon et ferme le fichier
+    """
+    TAILLE_LOT = 4096
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.fichier = open(chemin, "a", encoding="utf-8")
+        self.tampon = []
+        self.debut = time.perf_counter()
+        self.evenements = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def _ajouter(self, evenement):
+        """Ajoute un événement au tampon, et l'écrit si le lot est plein."""
+        self.tampon.append(json.dumps(evenement, ensure_ascii=False, separators=(",", ":")))
+        self.evenements += 1
+        if len(self.tampon) >= self.TAILLE_LOT:
+            self.vider()
+
+    def temps(self):
+        """Retourne le temps écoulé depuis le début de la partie (secondes)."""
+        return round(time.perf_counter() - self.debut, 6)
+
+    def debut_partie(self, rows, cols, flotte, graine=None):
+        """Enregistre le début d'une partie et remet le chronomètre à zéro."""
+        self.debut = time.perf_counter()
+        evenement = {"e": "partie", "rows": rows, "cols": cols,
+                     "flotte": [list(navire) for navire in flotte]}
+        if graine is not None:
+            evenement["graine"] = graine
+        self._ajouter(evenement)
+
+    def placement(self, joueur, indice, row, col, orientation):
+        """Enregistre le placement du navire n° 'indice' du joueur 0 ou 1."""
+        self._ajouter({"e": "placement", "j": joueur, "n": indice,
+                       "row": row, "col": col, "ori": orientation})
+
+    def placements(self, j, joueur):
+        """
+        Enregistre le placement de tous les navires placés de 'joueur'
+        (Joueur ou JoueurBitboard), sous l'index j (0 ou 1).
+        """
+        for indice, code in enumerate(placements_joueur(joueur)):
+            if code != NON_PLACE:
+                (row, col) = divmod(code // 2, joueur.cols)
+                self.placement(j, indice, row, col, 'V' if code % 2 else 'H')
+
+    def historique(self, j, tireur, cible):
+        """
+        Enregistre les tirs déjà effectués par 'tireur' (Joueur) sur 'cible'
+        lors de la reprise d'une partie sauvegardée, dans l'ordre des cases
+        (celui de decoder_partie) : le dernier tir sur chaque navire coulé
+        est noté "coule", ce qui rend la partie rejouable.
+        """
+        restants = {}
+        for (row, col) in sorted(tireur.tirs_effectues):
+            navire = cible.navire_en(row, col)
+            if navire is None:
+                self.tir(j, row, col, "manque")
+                continue
+            restants.setdefault(navire.nom, navire.nb_touches)
+            restants[navire.nom] -= 1
+            coule = navire.est_coule() and restants[navire.nom] == 0
+            self.tir(j, row, col, "coule" if coule else "touche")
+
+    def tir(self, joueur, row, col, resultat):
+        """Enregistre un tir du joueur 0 ou 1 et son résultat."""
+        # Événement le plus fréquent : ligne JSON formatée directement,
+        # sans passer par json.dumps
+        self.tampon.append(
+            f'{{"e":"tir","j":{joueur},"row":{row},"col":{col},'
+            f'"res":"{resultat}","t":{time.perf_counter() - self.debut:.6f}}}'
+        )
+        self.evenements += 1
+        if len(self.tampon) >= self.TAILLE_LOT:
+            self.vider()
+
+    def fin_partie(self, gagnant):
+        """Enregistre la fin de la partie (gagnant : 0, 1 ou None) et vide le tampon."""
+        self._ajouter({"e": "fin", "gagnant": gagnant, "t": self.temps()})
+        self.vider()
+
+    def vider(self):
+        """Écrit les événements en attente sur le disque."""
+        if self.tampon:
+            self.fichier.write("\n".join(self.tampon))
+            self.fichier.write("\n")
+            self.tampon.clear()
+        self.fichier.flush()
+
+    def fermer(self):
+        """Vide le tampon et ferme le fichier."""
+        if not self.fichier.closed:
+            self.vider()
+            self.fichier.close()
+
+
+def lire_evenements(chemin):
+    """
+    Générateur qui lit le journal ligne par ligne et produit chaque
+    événement (dict). Les lignes vides ou tronquées sont ignorées.
+    """
+    with open(chemin, encoding="utf-8") as fichier:
+        for ligne in fichier:
+            ligne = ligne.strip()
+            if not ligne:
+                continue
+            try:
+                yield json.loads(ligne)
+            except ValueError:
+                # Dernière ligne incomplète (écriture interrompue)
+                continue
+
+
+def lire_parties(evenements):
+    """
+    Générateur qui regroupe un flux d'événements par partie : produit
+    une liste d'événements pour chaque partie (de "partie" à "fin" ou
+    jusqu'à la partie suivante). Seule une partie est en mémoire à la fois.
+    """
+    partie = None
+    for evenement in evenements:
+        if evenement["e"] == "partie":
+            if partie:
+                yield partie
+            partie = [evenement]
+        elif partie is not None:
+            partie.append(evenement)
+            if evenement["e"] == "fin":
+                yield partie
+                partie = None
+    if partie:
+        yield partie
+
+
+def rejouer_partie(evenements, classe=Joueur):
+    """
+    Générateur qui rejoue une partie (liste ou flux d'événements, voir
+    lire_parties) dans deux joueurs neufs de 'classe'. Après chaque
+    événement, produit (evenement, joueurs) où joueurs est le couple
+    (joueur 0, joueur 1) dans l'état correspondant.
+    Lève ValueError si un tir ne redonne pas le résultat enregistré.
+    """
+    joueurs = None
+    for evenement in evenements:
+        genre = evenement["e"]
+        if genre == "partie":
+            flotte = [tuple(navire) for navire in evenement["flotte"]]
+            joueurs = (classe("Joueur", evenement["rows"], evenement["cols"], flotte),
+                       classe("Ordinateur", evenement["rows"], evenement["cols"], flotte))
+            if classe is Joueur:
+                for j in joueurs:
+                    j.initialiser_navires()
+        elif genre == "placement":
+            j = joueurs[evenement["j"]]
+            navire = evenement["n"] if classe is not Joueur else j.navires[evenement["n"]]
+            j.placer_navire(navire, evenement["row"], evenement["col"], evenement["ori"])
+        elif genre == "tir":
+            tireur = joueurs[evenement["j"]]
+            cible = joueurs[1 - evenement["j"]]
+            resultat = tireur.tirer_sur(cible, evenement["row"], evenement["col"])
+            if resultat != evenement["res"]:
+                raise ValueError(f"Tir incohérent lors du rejeu : {evenement} => {resultat}")
+        yield (evenement, joueurs)
+
+
+def rejouer_sur_plateaux(evenements, plateaux, root, delai_ms=100):
+    """
+    Relecture visuelle d'une partie dans deux Plateau Tk :
+    plateaux[0] affiche la grille du joueur 0 (ses navires et les tirs
+    reçus), plateaux[1] celle du joueur 1. Un événement est rejoué tous
+    les 'delai_ms' millisecondes via root.after.
+    """
+    etapes = rejouer_partie(evenements)
+
+    def etape_suivante():
+        try:
+            (evenement, joueurs) = next(etapes)
+        except StopIteration:
+            return
+        if evenement["e"] == "placement" and evenement["j"] == 0:
+            navire = joueurs[0].navires[evenement["n"]]
+            for (r, c) in navire.positions:
+                plateaux[0].color_cell(r, c, "gray")
+        elif evenement["e"] == "tir":
+            cible = 1 - evenement["j"]
+            (row, col) = (evenement["row"], evenement["col"])
+            plateau = plateaux[cible]
+            if evenement["res"] == "manque":
+                plateau.color_cell(row, col, "blue")
+            elif evenement["res"] == "touche":
+                plateau.color_cell(row, col, "red")
+            elif evenement["res"] == "coule":
+                for (r, c) in joueurs[cible].navire_en(row, col).positions:
+                    plateau.color_cell(r, c, "black")
+        root.after(delai_ms, etape_suivante)
+
+    etape_suivante()
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande :
+        python Journal.py parties.journal             (résumé en flux)
+        python Journal.py parties.journal --rejouer 3 (relecture visuelle)
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Lecture et relecture d'un journal de parties")
+    parser.add_argument("chemin", help="fichier journal")
+    parser.add_argument("--rejouer", type=int, default=None, metavar="N",
+                        help="rejoue visuellement la partie n° N (à partir de 0)")
+    parser.add_argument("--delai", type=int, default=100, help="délai entre deux événements (ms)")
+    args = parser.parse_args()
+
+    if args.rejouer is None:
+        nb_parties = nb_evenements = 0
+        victoires = [0, 0]
+        for partie in lire_parties(lire_evenements(args.chemin)):
+            nb_parties += 1
+            nb_evenements += len(partie)
+            fin = partie[-1]
+            if fin["e"] == "fin" and fin["gagnant"] is not None:
+                victoires[fin["gagnant"]] += 1
+        print(f"[JOURNAL] {nb_parties} parties, {nb_evenements} événements, "
+              f"victoires joueur 0 / 1 : {victoires[0]} / {victoires[1]}")
+        return
+
+    for numero, partie in enumerate(lire_parties(lire_evenements(args.chemin))):
+        if numero == args.rejouer:
+            break
+    else:
+        print(f"[JOURNAL] Partie n° {args.rejouer} introuvable.")
+        return
+
+    # Imports graphiques uniquement pour la relecture visuelle
+    from tkinter import Tk, LEFT
+    from Plateau import Plateau
+    root = Tk()
+    root.title(f"Relecture de la partie n° {args.rejouer}")
+    (rows, cols) = (partie[0]["rows"], partie[0]["cols"])
+    plateaux = (Plateau(root, rows, cols), Plateau(root, rows, cols))
+    for plateau in plateaux:
+        plateau.canvas.pack(side=LEFT, padx=10, pady=10)
+    rejouer_sur_plateaux(partie, plateaux, root, args.delai)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
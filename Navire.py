@@ -7,11 +7,15 @@ class Navire:
     - taille (int) : le nombre de cases occupées (ex : 5)
     - positions (list[tuple[int, int]]) : liste des coordonnées (row, col)
       où est placé le navire.
+    - touches (int) : masque des cases touchées, le bit i correspondant
+      à positions[i] (le navire étant droit, i se déduit de la case en O(1))
+    - nb_touches (int) : nombre de cases touchées
     - positions_touchees (list[tuple[int, int]]) : liste des cases
-      du navire qui ont été touchées.
+      du navire qui ont été touchées (calculée à partir de touches).
 
     La classe fournit :
     - la liste des navires disponibles (NAVIRES_DISPONIBLES)
+    - une méthode toucher(row, col) qui enregistre une touche en O(1)
     - une méthode est_coule() pour vérifier si toutes les positions
       ont été touchées.
     """
@@ -24,16 +28,39 @@ class Navire:
         ("Sous-marin2", 2)
     ]
 
+    # Pas de __dict__ par instance : moins de mémoire, accès plus rapides
+    __slots__ = ("nom", "taille", "positions", "touches", "nb_touches")
+
     def __init__(self, nom, taille):
         self.nom = nom
         self.taille = taille
         self.positions = []           # Liste de (row, col)
-        self.positions_touchees = []  # Cases où le navire a été touché
+        self.touches = 0              # Masque des cases touchées (bit i => positions[i])
+        self.nb_touches = 0
+
+    @property
+    def positions_touchees(self):
+        """
+        Liste des cases (row, col) du navire qui ont été touchées.
+        """
+        return [p for i, p in enumerate(self.positions) if (self.touches >> i) & 1]
+
+    def toucher(self, row, col):
+        """
+        Enregistre une touche en (row, col), case du navire.
+        Retourne False si la case était déjà touchée, True sinon.
+        """
+        (r0, c0) = self.positions[0]
+        bit = 1 << (row - r0 + col - c0)
+        if self.touches & bit:
+            return False
+        self.touches |= bit
+        self.nb_touches += 1
+        return True
 
     def est_coule(self):
         """
         Retourne True si toutes les positions du navire
-        sont touchées, c'est-à-dire si la longueur de
-        positions_touchees == taille du navire.
+        sont touchées, c'est-à-dire si nb_touches == taille du navire.
         """
-        return len(self.positions_touchees) == self.taille
\ No newline at end of file
+        return self.nb_touches == self.taille
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+Module Placements
+-----------------
+Index précalculé de tous les placements possibles d'un navire sur une
+grille vide, par taille de navire et par orientation.
+
+Chaque placement est un tuple (masque, row, col, orientation, cases) :
+- masque (int) : un bit à 1 par case couverte (bit row*cols+col)
+- row, col (int) : case de départ du navire
+- orientation (str) : 'H' ou 'V'
+- cases (tuple[int]) : index (row*cols+col) des cases couvertes
+
+Un placement est compatible avec une grille si son masque n'a aucun bit
+commun avec le masque d'occupation de la grille : un seul ET binaire.
+
+L'index n'est construit que pour les grilles d'au plus LIMITE_INDEX cases :
+au-delà (100x100, 1000x1000...), il occuperait trop de mémoire, et les
+masques sont calculés à la demande, les placements aléatoires étant tirés
+par numéro de placement. L'index d'une taille de navire est construit
+à sa première utilisation, pas à l'import.
+"""
+from Navire import *
+
+# Nombre maximal de cases d'une grille pour laquelle on précalcule l'index
+LIMITE_INDEX = 1024
+# Nombre de tirages directs tentés sur une grande grille avant l'énumération
+ESSAIS_GRANDE_GRILLE = 64
+# Nombre de flottes entières rejetées par tirer_flotte avant d'abandonner
+ESSAIS_FLOTTE = 1000
+
+# (rows, cols, taille) -> liste des placements
+INDEX = {}
+# (rows, cols, taille) -> {(row, col, orientation): masque}
+MASQUES = {}
+
+
+def _construire(taille, rows, cols):
+    """
+    Énumère tous les placements d'un navire de 'taille' sur une grille
+    rows x cols et remplit INDEX et MASQUES.
+    """
+    placements = []
+    masques = {}
+    for row in range(rows):
+        for col in range(cols):
+            if col + taille <= cols:
+                cases = tuple(row * cols + c for c in range(col, col + taille))
+                masque = sum(1 << i for i in cases)
+                placements.append((masque, row, col, 'H', cases))
+                masques[(row, col, 'H')] = masque
+            if row + taille <= rows:
+                cases = tuple(r * cols + col for r in range(row, row + taille))
+                masque = sum(1 << i for i in cases)
+                # Un navire de taille 1 n'a qu'un seul placement par case
+                if taille > 1:
+                    placements.append((masque, row, col, 'V', cases))
+                masques[(row, col, 'V')] = masque
+    INDEX[(rows, cols, taille)] = placements
+    MASQUES[(rows, cols, taille)] = masques
+
+
+def indexable(rows, cols):
+    """
+    Retourne True si l'index des placements est construit pour une
+    grille rows x cols (au plus LIMITE_INDEX cases).
+    """
+    return rows * cols <= LIMITE_INDEX
+
+
+def placements(taille, rows=10, cols=10):
+    """
+    Retourne la liste de tous les placements d'un navire de 'taille'
+    sur une grille vide rows x cols (calculée une seule fois).
+    À réserver aux grilles indexables : la liste a ~2*rows*cols éléments.
+    """
+    cle = (rows, cols, taille)
+    if cle not in INDEX:
+        _construire(taille, rows, cols)
+    return INDEX[cle]
+
+
+def masque_placement(taille, start_row, start_col, orientation, rows=10, cols=10):
+    """
+    Retourne le masque d'un navire de 'taille' placé en (start_row, start_col)
+    avec 'orientation', ou None si le navire sort de la grille.
+    """
+    if indexable(rows, cols):
+        cle = (rows, cols, taille)
+        if cle not in MASQUES:
+            _construire(taille, rows, cols)
+        return MASQUES[cle].get((start_row, start_col, orientation))
+
+    # Grande grille : calcul direct du masque
+    if start_row < 0 or start_col < 0:
+        return None
+    if orientation == 'H':
+        if start_row >= rows or start_col + taille > cols:
+            return None
+        return ((1 << taille) - 1) << (start_row * cols + start_col)
+    if start_col >= cols or start_row + taille > rows:
+        return None
+    masque = 0
+    for r in range(start_row, start_row + taille):
+        masque |= 1 << (r * cols + start_col)
+    return masque
+
+
+def _placement_numero(numero, taille, rows, cols):
+    """
+    Retourne le placement n° 'numero' (dans l'ordre : tous les 'H' ligne
+    par ligne, puis tous les 'V') sans construire l'index.
+    """
+    nb_h = rows * max(cols - taille + 1, 0)
+    if numero < nb_h:
+        (row, col) = divmod(numero, cols - taille + 1)
+        ori = 'H'
+        cases = tuple(row * cols + c for c in range(col, col + taille))
+    else:
+        (row, col) = divmod(numero - nb_h, cols)
+        ori = 'V'
+        cases = tuple(r * cols + col for r in range(row, row + taille))
+    masque = masque_placement(taille, row, col, ori, rows, cols)
+    return (masque, row, col, ori, cases)
+
+
+def nb_placements(taille, rows=10, cols=10):
+    """
+    Retourne le nombre de placements d'un navire de 'taille' sur une grille
+    vide rows x cols.
+    """
+    nb_h = rows * max(cols - taille + 1, 0)
+    nb_v = cols * max(rows - taille + 1, 0) if taille > 1 else 0
+    return nb_h + nb_v
+
+
+def placements_valides(taille, occupation, rows=10, cols=10):
+    """
+    Retourne les placements d'un navire de 'taille' qui ne chevauchent
+    aucune case de 'occupation' (masque des cases déjà prises).
+    """
+    return [p for p in placements(taille, rows, cols) if not p[0] & occupation]
+
+
+def tirer_placement(taille, occupation, rng, rows=10, cols=10):
+    """
+    Tire uniformément un placement d'un navire de 'taille' compatible avec
+    'occupation', ou retourne None s'il n'en existe aucun.
+    Un premier tirage direct dans l'index suffit la plupart du temps ;
+    sinon on tire parmi la liste filtrée des placements valides. Le coût
+    est donc borné par la taille de l'index, sans boucle de rejet.
+    'rng' est un générateur possédant choice() et randrange() (ex : random).
+    """
+    if not indexable(rows, cols):
+        return _tirer_placement_grande_grille(taille, occupation, rng, rows, cols)
+
+    tous = placements(taille, rows, cols)
+    placement = rng.choice(tous)
+    if not placement[0] & occupation:
+        return placement
+    valides = [p for p in tous if not p[0] & occupation]
+    if not valides:
+        return None
+    return rng.choice(valides)
+
+
+def _tirer_placement_grande_grille(taille, occupation, rng, rows, cols):
+    """
+    Version de tirer_placement pour les grilles non indexées : quelques
+    tirages directs par numéro de placement (la grille est presque vide en
+    pratique), puis énumération complète si la grille est encombrée.
+    """
+    total = nb_placements(taille, rows, cols)
+    if total == 0:
+        return None
+    for _ in range(ESSAIS_GRANDE_GRILLE):
+        placement = _placement_numero(rng.randrange(total), taille, rows, cols)
+        if not placement[0] & occupation:
+            return placement
+    valides = [numero for numero in range(total)
+               if not _placement_numero(numero, taille, rows, cols)[0] & occupation]
+    if not valides:
+        return None
+    return _placement_numero(rng.choice(valides), taille, rows, cols)
+
+
+def tirer_flotte(tailles, rng, rows=10, cols=10, essais=ESSAIS_FLOTTE):
+    """
+    Tire une flotte (un navire par taille de 'tailles') uniformément parmi
+    toutes les flottes légales : chaque navire est tiré parmi tous ses
+    placements sur la grille vide, et toute la flotte est rejetée au
+    premier chevauchement. Chaque flotte légale a ainsi la même
+    probabilité, ce que ne donne pas tirer_placement navire par navire
+    (les cases du bord y sont moins souvent occupées, voir
+    StatistiquesPlacement).
+    Retourne la liste des placements, ou None si 'essais' flottes de
+    suite ont été rejetées (grille trop encombrée pour le rejet).
+    """
+    index = indexable(rows, cols)
+    listes = [placements(t, rows, cols) if index else nb_placements(t, rows, cols) for t in tailles]
+    if not all(listes):
+        return None
+    for _ in range(essais):
+        occupation = 0
+        flotte = []
+        for (taille, liste) in zip(tailles, listes):
+            if index:
+                placement = rng.choice(liste)
+            else:
+                placement = _placement_numero(rng.randrange(liste), taille, rows, cols)
+            if placement[0] & occupation:
+                break
+            occupation |= placement[0]
+            flotte.append(placement)
+        else:
+            return flotte
+    return None
@@ -1,10 +1,10 @@
 from tkinter import *
-from Joueur import *
 class Plateau:
     """
     Classe Plateau
     -------------
-    Gère l'affichage d'un plateau (10x10) dans un Canvas Tkinter,
+    Gère l'affichage d'un plateau de rows x cols cases (10x10 par défaut)
+    dans un Canvas Tkinter,
     ainsi que les sons associés (tir, touche, coule).
 
     Attributs principaux :
@@ -13,17 +13,21 @@ class Plateau:
     - cell_size (int) : taille d'une cellule en pixels
     - canvas (Canvas) : le canevas Tkinter où est dessinée la grille
     - grid_color (list[list[str]]) : couleur "définitive" de chaque case
-    - preview_items (list[int]) : liste des ID graphiques (rectangles) temporaires
-    - joueur (Joueur) : le Joueur associé à ce plateau
-    - ordinateur (Joueur) : l'adversaire (IA)
+    - cell_items (list[list[int]]) : ID du rectangle PERSISTANT de chaque case,
+      créé une seule fois puis recoloré avec itemconfig
+    - displayed_color (list[list[str]]) : couleur actuellement affichée
+    - dirty_cells (set[tuple[int, int]]) : cases dont la couleur a changé
+      depuis le dernier flush()
+    - preview_pool (list[int]) : rectangles de prévisualisation réutilisables
+    - preview_items (list[int]) : rectangles de prévisualisation affichés
 
     Méthodes principales :
-    - draw_grid() : dessine la grille initiale
     - color_cell(row, col, color) : colorie de façon permanente une case
+    - flush() : applique au canvas les couleurs des cases modifiées
     - clear_preview() : efface la prévisualisation
     - color_preview_cell(row, col, color) : colorie une case en mode preview
     - redraw_all_cells() : redessine toutes les cases permanentes
-    - toggle_orientation() : change l'orientation de placement (H/V)
+    - reinitialiser() : remet la grille à blanc pour une nouvelle partie
     - play_sound_tir(), play_sound_touche(), play_sound_coule() :
       méthodes pour jouer les sons associés.
     """
@@ -38,91 +42,97 @@ class Plateau:
             height=self.rows * self.cell_size,
             bg="white"
         )
-        self.draw_grid()
 
         # Couleur réelle de chaque case
         self.grid_color = [["white" for _ in range(self.cols)] for _ in range(self.rows)]
-        # Éléments temporaires (preview)
+        # Un rectangle persistant par case, dont le contour dessine la grille :
+        # le nombre d'éléments du canvas reste fixe
+        self.displayed_color = [["white" for _ in range(self.cols)] for _ in range(self.rows)]
+        self.cell_items = [
+            [self.canvas.create_rectangle(*self.cell_coords(r, c), fill="white", outline="black")
+             for c in range(self.cols)]
+            for r in range(self.rows)
+        ]
+        self.dirty_cells = set()
+        self.flush_scheduled = False
+        # Éléments temporaires (preview), réutilisés d'un mouvement à l'autre
+        self.preview_pool = []
         self.preview_items = []
 
-        # Création des Joueurs
-        self.joueur = Joueur("Humain")
-        self.joueur.initialiser_navires()
-
-        self.ordinateur = Joueur("Ordinateur")
-        self.ordinateur.initialiser_navires()
-        self.ordinateur.placement_aleatoire()
-
-        self.orientation_joueur = StringVar()
-        self.orientation_joueur.set("H")
-
-        # Phase de jeu : "placement" ou "battle"
-        self.phase = StringVar()
-        self.phase.set("placement")  # Par défaut, on est en phase de placement
-
-    def draw_grid(self):
-        """Dessine la grille (lignes noires) dans le canvas."""
-        for i in range(self.rows + 1):
-            self.canvas.create_line(
-                0,
-                i * self.cell_size,
-                self.cols * self.cell_size,
-                i * self.cell_size,
-                fill="black"
-            )
-        for j in range(self.cols + 1):
-            self.canvas.create_line(
-                j * self.cell_size,
-                0,
-                j * self.cell_size,
-                self.rows * self.cell_size,
-                fill="black"
-            )
+    def cell_coords(self, row, col):
+        """Retourne les coordonnées (x1, y1, x2, y2) de la case (row, col)."""
+        x1 = col * self.cell_size
+        y1 = row * self.cell_size
+        return (x1, y1, x1 + self.cell_size, y1 + self.cell_size)
 
     def color_cell(self, row, col, color):
         """
         Colorie la case (row, col) en 'color' de façon PERMANENTE,
         et met à jour self.grid_color.
+        Le rectangle de la case est recoloré au prochain flush(), programmé
+        automatiquement : plusieurs appels dans un même événement ne
+        touchent le canvas qu'une fois par case.
         """
-        x1 = col * self.cell_size
-        y1 = row * self.cell_size
-        x2 = x1 + self.cell_size
-        y2 = y1 + self.cell_size
-        self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="black")
         self.grid_color[row][col] = color
+        self.dirty_cells.add((row, col))
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.canvas.after_idle(self.flush)
+
+    def flush(self):
+        """
+        Applique au canvas la couleur des cases modifiées (dirty_cells),
+        en ignorant celles dont la couleur affichée est déjà la bonne.
+        """
+        self.flush_scheduled = False
+        for (r, c) in self.dirty_cells:
+            color = self.grid_color[r][c]
+            if self.displayed_color[r][c] != color:
+                self.canvas.itemconfig(self.cell_items[r][c], fill=color)
+                self.displayed_color[r][c] = color
+        self.dirty_cells.clear()
 
     def clear_preview(self):
-        """Supprime les éléments graphiques de prévisualisation."""
+        """Masque les éléments graphiques de prévisualisation (sans les détruire)."""
         for item_id in self.preview_items:
-            self.canvas.delete(item_id)
+            self.canvas.itemconfig(item_id, state="hidden")
         self.preview_items.clear()
 
     def color_preview_cell(self, row, col, color):
         """
         Colorie la case (row, col) en 'color' TEMPORAIREMENT,
         sans modifier self.grid_color.
-        Retourne l'ID de l'objet graphique créé, afin de pouvoir le supprimer.
+        Réutilise un rectangle de preview_pool (créé au besoin), l'ajoute à
+        self.preview_items et retourne son ID.
         """
-        x1 = col * self.cell_size
-        y1 = row * self.cell_size
-        x2 = x1 + self.cell_size
-        y2 = y1 + self.cell_size
-        rect_id = self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="black")
+        index = len(self.preview_items)
+        if index == len(self.preview_pool):
+            self.preview_pool.append(
+                self.canvas.create_rectangle(0, 0, 0, 0, outline="black", state="hidden")
+            )
+        rect_id = self.preview_pool[index]
+        self.canvas.coords(rect_id, *self.cell_coords(row, col))
+        self.canvas.itemconfig(rect_id, fill=color, state="normal")
+        self.preview_items.append(rect_id)
         return rect_id
 
     def redraw_all_cells(self):
         """
         Redessine toutes les cases permanentes (utile après reset ou nouvelle partie).
+        Seules les cases dont la couleur affichée diffère sont touchées.
         """
         for r in range(self.rows):
             for c in range(self.cols):
-                color = self.grid_color[r][c]
-                self.color_cell(r, c, color)
+                self.dirty_cells.add((r, c))
+        self.flush()
 
-    def toggle_orientation(self):
+    def reinitialiser(self):
         """
-        Bascule l'orientation de placement entre 'H' et 'V'.
+        Remet toutes les cases en blanc et masque la prévisualisation pour
+        une nouvelle partie, en réutilisant les éléments du canvas.
         """
-        self.orientation_joueur.set("V" if self.orientation_joueur.get() == "H" else "H")
-        print(f"[INFO] Orientation : {self.orientation_joueur.get()}")
-
+        for ligne in self.grid_color:
+            for c in range(self.cols):
+                ligne[c] = "white"
+        self.clear_preview()
+        self.redraw_all_cells()
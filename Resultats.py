@@ -0,0 +1,460 @@
+"""
+Module Resultats
+----------------
+Fichier de résultats de campagnes de simulation (millions de parties),
+en colonnes et projeté en mémoire (mmap) : chaque partie occupe un
+enregistrement de taille fixe, mais chaque champ est rangé dans sa propre
+colonne contiguë. Agréger une colonne (vainqueurs, tirs) ne lit que ses
+pages : rien n'est chargé en entier ni gardé en mémoire par le programme.
+
+Format (petit-boutiste) :
+- en-tête (ENTETE) : b"BNRS", version, rows, cols, nombre de navires,
+  options (OPTION_SEQUENCES, OPTION_TIRS_LARGES), capacité (parties
+  réservées), nombre de parties écrites ; puis la taille de chaque navire
+  (1 octet chacun, donc au plus 255 cases)
+- une colonne par champ, réservée pour 'capacité' parties, chacune
+  commençant sur un multiple de ALIGNEMENT octets :
+  - graine (uint64) : graine de la partie, SANS_GRAINE si aucune
+  - gagnant (int8) : 0 ou 1, -1 pour un match nul
+  - tirs (uint16, ou uint32 si OPTION_TIRS_LARGES) : tirs du vainqueur
+    (0 pour un match nul)
+  - nb_tirs (même type) : tirs des deux joueurs
+  - coules (même type x 2*navires) : numéro du tir (dans la séquence) qui
+    a coulé chaque navire, ceux du joueur 0 puis ceux du joueur 1 ; valeur
+    maximale du type (A_FLOT en uint16) si le navire n'a pas été coulé ou
+    si ce n'est pas connu
+  - sequence (option, uint8, uint16 ou uint32 x 2*rows*cols) : case row*cols+col
+    de chaque tir, les joueurs alternant à partir du joueur 0 ; la fin est
+    complétée par la valeur maximale du type (FIN_SEQUENCE)
+- une partie compte au plus 2*rows*cols tirs : OPTION_TIRS_LARGES est
+  posée dès que ce nombre atteint 0xFFFF (voir tirs_larges)
+
+Écriture (FichierResultats) : en ajout, directement dans la projection.
+Quand la capacité est atteinte, les colonnes sont recopiées dans un
+fichier temporaire de capacité double, qui remplace ensuite l'original
+(os.replace) : une interruption pendant la copie laisse l'ancien fichier
+intact. Le nombre de parties de l'en-tête est mis à jour après chaque
+partie complète : un fichier dont l'écriture est interrompue reste
+lisible.
+
+Lecture (LectureResultats) : sans copie, chaque colonne est une vue
+memoryview (bibliothèque standard) ou une vue NumPy (colonne(), si NumPy
+est installé) sur la projection.
+
+    python Simulation.py -n 100000 --ia1 difficile --resultats parties.res
+    python SimulationLot.py -n 10000000 --resultats campagne.res
+    python Resultats.py campagne.res
+"""
+import mmap
+import os
+import struct
+from Navire import *
+from JoueurBitboard import *
+
+MAGIC = b"BNRS"
+VERSION = 1
+ENTETE = struct.Struct("<4sBHHBBQQ")
+# Position, dans l'en-tête, de la capacité et du nombre de parties écrites
+POSITION_CAPACITE = ENTETE.size - 16
+POSITION_NOMBRE = ENTETE.size - 8
+OPTION_SEQUENCES = 1
+OPTION_TIRS_LARGES = 2
+# Début de chaque colonne : multiple de ALIGNEMENT octets (vues NumPy alignées)
+ALIGNEMENT = 64
+CAPACITE_INITIALE = 4096
+# Lignes de l'histogramme des tirs affiché par main()
+LIGNES_HISTOGRAMME = 25
+# Octets recopiés à la fois quand le fichier est agrandi (mémoire bornée)
+TAILLE_COPIE = 1 << 24
+SANS_GRAINE = (1 << 64) - 1
+A_FLOT = 0xFFFF
+# Code struct => type NumPy (petit-boutiste)
+TYPES_NUMPY = {"Q": "<u8", "b": "i1", "I": "<u4", "H": "<u2", "B": "u1"}
+
+
+def _aligner(n):
+    """Retourne le premier multiple de ALIGNEMENT supérieur ou égal à n."""
+    return -(-n // ALIGNEMENT) * ALIGNEMENT
+
+
+def tirs_larges(rows, cols):
+    """
+    Retourne True si les colonnes tirs, nb_tirs et coules doivent être en
+    uint32 : une partie compte jusqu'à 2*rows*cols tirs, et la valeur
+    maximale du type est réservée (A_FLOT).
+    """
+    return 2 * rows * cols >= 0xFFFF
+
+
+def valeur_max(code):
+    """Retourne la valeur maximale du type non signé de code struct 'code'."""
+    return (1 << (8 * struct.calcsize("<" + code))) - 1
+
+
+def colonnes(rows, cols, nb_navires, sequences):
+    """
+    Retourne les colonnes du fichier : liste de (nom, code struct, nombre
+    de valeurs par partie).
+    """
+    code_tirs = "I" if tirs_larges(rows, cols) else "H"
+    liste = [("graine", "Q", 1), ("gagnant", "b", 1), ("tirs", code_tirs, 1), ("nb_tirs", code_tirs, 1),
+             ("coules", code_tirs, 2 * nb_navires)]
+    if sequences:
+        code = "B" if rows * cols < 0xFF else "H" if rows * cols < 0xFFFF else "I"
+        liste.append(("sequence", code, 2 * rows * cols))
+    return liste
+
+
+def disposition(rows, cols, tailles, sequences, capacite):
+    """
+    Retourne (places, taille du fichier) pour 'capacite' parties, places
+    donnant pour chaque colonne (décalage, code struct, valeurs par partie).
+    """
+    position = _aligner(ENTETE.size + len(tailles))
+    places = {}
+    for (nom, code, nb) in colonnes(rows, cols, len(tailles), sequences):
+        places[nom] = (position, code, nb)
+        position += _aligner(capacite * nb * struct.calcsize(code))
+    return (places, position)
+
+
+def lire_entete(donnees):
+    """
+    Décode l'en-tête d'un fichier de résultats.
+    Retourne (rows, cols, tailles, sequences, capacite, nombre).
+    """
+    if len(donnees) < ENTETE.size:
+        raise ValueError("Fichier de résultats invalide")
+    (magic, version, rows, cols, nb_navires, options, capacite, nombre) = ENTETE.unpack_from(donnees, 0)
+    if magic != MAGIC or version != VERSION or bool(options & OPTION_TIRS_LARGES) != tirs_larges(rows, cols):
+        raise ValueError("Fichier de résultats invalide")
+    tailles = list(donnees[ENTETE.size:ENTETE.size + nb_navires])
+    return (rows, cols, tailles, bool(options & OPTION_SEQUENCES), capacite, nombre)
+
+
+def index_navire(joueur, row, col):
+    """
+    Retourne l'index, dans la flotte, du navire de 'joueur' (Joueur ou
+    JoueurBitboard) qui occupe (row, col).
+    """
+    if isinstance(joueur, JoueurBitboard):
+        return joueur.navire_en(row, col)
+    return joueur.navires.index(joueur.navire_en(row, col))
+
+
+class FichierResultats:
+    """
+    Classe FichierResultats
+    ----------------------
+    Écriture en ajout d'un fichier de résultats (voir la documentation du
+    module). Un fichier existant est complété s'il a la même grille, la
+    même flotte et les mêmes options.
+
+    Attributs principaux :
+    - chemin (str) : fichier de résultats
+    - rows, cols (int), tailles (list[int]) : grille et tailles des navires
+    - sequences (bool) : si True, la séquence des tirs est enregistrée
+    - capacite (int) : parties que le fichier peut recevoir sans être agrandi
+    - nombre (int) : parties écrites
+    - places (dict) : colonne => (décalage, code struct, valeurs par partie)
+    - a_flot (int) : valeur de coules d'un navire non coulé (ou inconnu)
+
+    Méthodes principales :
+    - ajouter(graine, gagnant, tirs, sequence, coules) : écrit une partie
+    - ajouter_lot(gagnants, tirs, graines) : écrit un lot de parties (NumPy)
+    - fermer() : écrit tout sur le disque et ferme le fichier
+    """
+    def __init__(self, chemin, rows=10, cols=10, flotte=None, sequences=True, capacite=None):
+        self.chemin = chemin
+        self.rows = rows
+        self.cols = cols
+        self.tailles = [taille for (_, taille) in (Navire.NAVIRES_DISPONIBLES if flotte is None else flotte)]
+        self.sequences = sequences
+        if not (0 < rows <= 0xFFFF and 0 < cols <= 0xFFFF) or 2 * rows * cols >= 0xFFFFFFFF:
+            raise ValueError(f"Grille trop grande pour un fichier de résultats : {rows}x{cols}")
+        if len(self.tailles) > 0xFF or any(not 0 < taille <= 0xFF for taille in self.tailles):
+            raise ValueError(f"Flotte impossible à enregistrer (au plus 255 navires de 1 à 255 cases) : {self.tailles}")
+        existe = os.path.exists(chemin) and os.path.getsize(chemin) > 0
+        self.fichier = open(chemin, "r+b" if existe else "w+b")
+        if existe:
+            (rows_f, cols_f, tailles, sequences_f, self.capacite, self.nombre) = \
+                lire_entete(self.fichier.read(ENTETE.size + 255))
+            if (rows_f, cols_f, tailles, sequences_f) != (rows, cols, self.tailles, sequences):
+                self.fichier.close()
+                raise ValueError(f"Fichier de résultats {chemin} incompatible "
+                                 f"(grille {rows_f}x{cols_f}, flotte {tailles}, séquences {sequences_f})")
+        else:
+            self.capacite = max(1, CAPACITE_INITIALE if capacite is None else capacite)
+            self.nombre = 0
+        (self.places, taille) = disposition(rows, cols, self.tailles, sequences, self.capacite)
+        if not existe:
+            self.fichier.truncate(taille)
+        self.mm = mmap.mmap(self.fichier.fileno(), taille)
+        if not existe:
+            options = (OPTION_SEQUENCES if sequences else 0) | (OPTION_TIRS_LARGES if tirs_larges(rows, cols) else 0)
+            ENTETE.pack_into(self.mm, 0, MAGIC, VERSION, rows, cols, len(self.tailles),
+                             options, self.capacite, 0)
+            self.mm[ENTETE.size:ENTETE.size + len(self.tailles)] = bytes(self.tailles)
+        self.formats = {nom: struct.Struct(f"<{nb}{code}") for (nom, (_, code, nb)) in self.places.items()}
+        self.a_flot = valeur_max(self.places["coules"][1])
+        self.fin_sequence = valeur_max(self.places["sequence"][1]) if sequences else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def agrandir(self, capacite):
+        """
+        Porte la capacité à 'capacite' parties : en-tête et colonnes sont
+        recopiés (par blocs de TAILLE_COPIE octets) à leur nouvel
+        emplacement dans un fichier temporaire, qui remplace le fichier une
+        fois écrit sur le disque. Jusque-là, l'original n'est pas modifié.
+        """
+        (places, taille) = disposition(self.rows, self.cols, self.tailles, self.sequences, capacite)
+        temporaire = self.chemin + ".tmp"
+        with open(temporaire, "w+b") as fichier:
+            fichier.truncate(taille)
+            with mmap.mmap(fichier.fileno(), taille) as mm:
+                copies = [(0, 0, ENTETE.size + len(self.tailles))]
+                for (nom, (position, code, nb)) in places.items():
+                    copies.append((position, self.places[nom][0], self.nombre * nb * struct.calcsize(code)))
+                for (destination, source, longueur) in copies:
+                    for debut in range(0, longueur, TAILLE_COPIE):
+                        fin = min(longueur, debut + TAILLE_COPIE)
+                        mm[destination + debut:destination + fin] = self.mm[source + debut:source + fin]
+                struct.pack_into("<Q", mm, POSITION_CAPACITE, capacite)
+                mm.flush()
+            os.fsync(fichier.fileno())
+        self.mm.close()
+        self.fichier.close()
+        os.replace(temporaire, self.chemin)
+        self.fichier = open(self.chemin, "r+b")
+        self.mm = mmap.mmap(self.fichier.fileno(), taille)
+        self.places = places
+        self.capacite = capacite
+
+    def _ecrire(self, nom, valeurs):
+        """Écrit les valeurs de la colonne 'nom' de la partie n° self.nombre."""
+        format_ = self.formats[nom]
+        format_.pack_into(self.mm, self.places[nom][0] + self.nombre * format_.size, *valeurs)
+
+    def ajouter(self, graine, gagnant, tirs, sequence=(), coules=None):
+        """
+        Écrit une partie : graine (None si aucune), gagnant (0, 1 ou None
+        pour un match nul), tirs du vainqueur, cases visées (row*cols+col,
+        joueurs alternés) et, pour chaque navire (joueur 0 puis joueur 1),
+        numéro du tir qui l'a coulé ou None.
+        """
+        if self.nombre == self.capacite:
+            self.agrandir(2 * self.capacite)
+        self._ecrire("graine", (SANS_GRAINE if graine is None else graine,))
+        self._ecrire("gagnant", (-1 if gagnant is None else gagnant,))
+        self._ecrire("tirs", (tirs,))
+        self._ecrire("nb_tirs", (len(sequence),))
+        nb_coules = 2 * len(self.tailles)
+        self._ecrire("coules", [self.a_flot] * nb_coules if coules is None else
+                     [self.a_flot if n is None else n for n in coules])
+        if self.sequences:
+            self._ecrire("sequence", list(sequence) + [self.fin_sequence] * (2 * self.rows * self.cols - len(sequence)))
+        # Partie complète : elle devient visible des lecteurs
+        self.nombre += 1
+        struct.pack_into("<Q", self.mm, POSITION_NOMBRE, self.nombre)
+
+    def ajouter_lot(self, gagnants, tirs, graines=None):
+        """
+        Écrit un lot de parties d'un coup (tableaux NumPy, ex : résultats
+        de SimulationLot.jouer_lot) : gagnant (0, 1 ou -1) et tirs du
+        vainqueur de chaque partie, graines optionnelles. Les navires
+        coulés et la séquence des tirs ne sont pas connus.
+        """
+        import numpy as np
+        nb = len(gagnants)
+        if self.nombre + nb > self.capacite:
+            self.agrandir(max(2 * self.capacite, self.nombre + nb))
+        gagnants = np.asarray(gagnants)
+        tirs = np.asarray(tirs)
+        # Tirs des deux joueurs : le joueur 0 tire en premier
+        nb_tirs = np.where(gagnants == 0, 2 * tirs - 1, np.where(gagnants == 1, 2 * tirs, 0))
+        valeurs = {
+            "graine": SANS_GRAINE if graines is None else graines,
+            "gagnant": gagnants,
+            "tirs": tirs,
+            "nb_tirs": nb_tirs,
+            "coules": self.a_flot,
+            "sequence": self.fin_sequence,
+        }
+        for (nom, (position, code, par_partie)) in self.places.items():
+            vue = np.frombuffer(self.mm, dtype=TYPES_NUMPY[code], count=nb * par_partie,
+                                offset=position + self.nombre * par_partie * struct.calcsize(code))
+            try:
+                # Colonnes à plusieurs valeurs par partie : une seule valeur (A_FLOT, fin)
+                vue[:] = valeurs[nom]
+            finally:
+                del vue
+        self.nombre += nb
+        struct.pack_into("<Q", self.mm, POSITION_NOMBRE, self.nombre)
+
+    def fermer(self):
+        """Écrit la projection sur le disque et ferme le fichier."""
+        if not self.fichier.closed:
+            self.mm.flush()
+            self.mm.close()
+            self.fichier.close()
+
+
+class LectureResultats:
+    """
+    Classe LectureResultats
+    ----------------------
+    Lecture sans copie d'un fichier de résultats (voir la documentation
+    du module) : les colonnes sont des vues sur la projection en mémoire,
+    seules les pages lues sont chargées par le système.
+
+    Attributs principaux :
+    - chemin (str), rows, cols (int), tailles (list[int]), sequences (bool)
+    - nombre (int) : parties lisibles (écrites à l'ouverture)
+    - places (dict) : colonne => (décalage, code struct, valeurs par partie)
+    - a_flot (int) : valeur de coules d'un navire non coulé (ou inconnu)
+
+    Méthodes principales :
+    - memoire(nom) : colonne en memoryview (sans NumPy)
+    - colonne(nom) : colonne en vue NumPy, (nombre,) ou (nombre, valeurs)
+    - victoires() : (victoires du joueur 0, du joueur 1, nuls)
+    - histogramme_tirs(j) : nombre de parties gagnées en n tirs
+    - fermer()
+    """
+    def __init__(self, chemin):
+        self.chemin = chemin
+        with open(chemin, "rb") as fichier:
+            self.mm = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        (self.rows, self.cols, self.tailles, self.sequences, capacite, self.nombre) = lire_entete(self.mm)
+        (self.places, taille) = disposition(self.rows, self.cols, self.tailles, self.sequences, capacite)
+        if len(self.mm) < taille:
+            self.mm.close()
+            raise ValueError(f"Fichier de résultats {chemin} tronqué")
+        self.a_flot = valeur_max(self.places["coules"][1])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def memoire(self, nom):
+        """
+        Retourne la colonne 'nom' en memoryview sans copie : une valeur
+        par partie, ou (nombre, valeurs) pour coules et sequence.
+        """
+        (position, code, nb) = self.places[nom]
+        octets = memoryview(self.mm)[position:position + self.nombre * nb * struct.calcsize(code)]
+        return octets.cast(code) if nb == 1 or not self.nombre else octets.cast(code, (self.nombre, nb))
+
+    def colonne(self, nom):
+        """
+        Retourne la colonne 'nom' en vue NumPy sans copie (lecture seule) :
+        forme (nombre,), ou (nombre, valeurs) pour coules et sequence.
+        """
+        import numpy as np
+        (position, code, nb) = self.places[nom]
+        vue = np.frombuffer(self.mm, dtype=TYPES_NUMPY[code], count=self.nombre * nb, offset=position)
+        return vue if nb == 1 else vue.reshape(self.nombre, nb)
+
+    def victoires(self):
+        """
+        Retourne (victoires du joueur 0, victoires du joueur 1, nuls),
+        comptés directement sur les octets de la colonne gagnant.
+        """
+        (position, _, _) = self.places["gagnant"]
+        octets = self.mm[position:position + self.nombre]
+        return (octets.count(b"\x00"), octets.count(b"\x01"), octets.count(b"\xff"))
+
+    def histogramme_tirs(self, j=None):
+        """
+        Retourne la liste h où h[n] est le nombre de parties gagnées en
+        n tirs (par le joueur j, ou par l'un ou l'autre si j est None).
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is None:
+            comptes = {}
+            for (gagnant, tirs) in zip(self.memoire("gagnant"), self.memoire("tirs")):
+                if gagnant >= 0 and j in (None, gagnant):
+                    comptes[tirs] = comptes.get(tirs, 0) + 1
+            return [comptes.get(n, 0) for n in range(max(comptes, default=-1) + 1)]
+        gagnants = self.colonne("gagnant")
+        tirs = self.colonne("tirs")
+        tirs = tirs[gagnants >= 0] if j is None else tirs[gagnants == j]
+        return np.bincount(tirs).tolist()
+
+    def fermer(self):
+        """
+        Ferme la projection ; si des vues (colonne, memoire) existent
+        encore, elle reste ouverte jusqu'à leur disparition.
+        """
+        try:
+            self.mm.close()
+        except BufferError:
+            pass
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande : résumé d'un fichier de résultats
+    (taux de victoire, histogramme des tirs du vainqueur, navires coulés).
+        python Resultats.py campagne.res
+    """
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Résumé d'un fichier de résultats de simulation")
+    parser.add_argument("chemin", help="fichier de résultats (Simulation.py --resultats)")
+    args = parser.parse_args()
+
+    debut = time.perf_counter()
+    with LectureResultats(args.chemin) as resultats:
+        (v0, v1, nuls) = resultats.victoires()
+        histogramme = resultats.histogramme_tirs()
+        nombre = resultats.nombre
+        print(f"[RESULTATS] {nombre} parties ({resultats.rows}x{resultats.cols}, flotte {resultats.tailles}, "
+              f"séquences {'oui' if resultats.sequences else 'non'})")
+        if not nombre:
+            return
+        for (j, v) in ((0, v0), (1, v1)):
+            print(f"  Joueur {j} : {v} victoires ({100 * v / nombre:.1f} %)")
+        print(f"  Nuls : {nuls}")
+        gagnees = sum(histogramme)
+        if gagnees:
+            moyenne = sum(n * c for n, c in enumerate(histogramme)) / gagnees
+            print(f"  Tirs du vainqueur : moyenne {moyenne:.1f}")
+            # Au plus LIGNES_HISTOGRAMME classes de même largeur
+            largeur = -(-len(histogramme) // LIGNES_HISTOGRAMME)
+            classes = [sum(histogramme[n:n + largeur]) for n in range(0, len(histogramme), largeur)]
+            plus_grande = max(classes)
+            for i, c in enumerate(classes):
+                if c:
+                    print(f"    {i * largeur:>4}-{(i + 1) * largeur - 1:<4} {c:>10} "
+                          f"{'#' * max(1, round(40 * c / plus_grande))}")
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            coules = resultats.colonne("coules")
+            nb_navires = len(resultats.tailles)
+            connus = coules != resultats.a_flot
+            if connus.any():
+                print("  Tir moyen (dans la partie) auquel chaque navire est coulé, s'il l'est :")
+                for n, taille in enumerate(resultats.tailles):
+                    tirs = np.concatenate([coules[:, n][connus[:, n]], coules[:, nb_navires + n][connus[:, nb_navires + n]]])
+                    if len(tirs):
+                        print(f"    navire {n + 1} (taille {taille}) : {tirs.mean() + 1:.1f} "
+                              f"({100 * len(tirs) / (2 * nombre):.1f} % coulés)")
+            del coules, connus
+    print(f"[BENCH] Agrégation en {time.perf_counter() - debut:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import json
+from Joueur import *
+from JoueurBitboard import *
+from Sauvegarde import *
+
+# Port par défaut du serveur (Serveur.py)
+PORT = 5454
+
+
+def encoder(message):
+    """Retourne la ligne (bytes) d'un message du protocole (voir Serveur.py)."""
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class Salle:
+    """
+    Classe Salle
+    -----------
+    Une partie en réseau, sans entrée/sortie : deux joueurs (deux humains,
+    ou un humain et l'IA du serveur) dont les placements et les tirs sont
+    validés et résolus côté serveur avec les règles de Joueur
+    (peut_placer_navire, placer_navire, tirer_sur).
+
+    Les méthodes retournent la liste des événements à envoyer, sous forme
+    (destinataire, message) : destinataire 0 ou 1, ou None pour les deux
+    joueurs ; message est un dict (voir Serveur.py pour le protocole).
+    Une commande invalide lève ValueError (rien n'est modifié).
+
+    Phases : "placement" (chaque joueur place sa flotte), "battle" (tirs
+    alternés, le joueur 0 commence), "fin".
+
+    Attributs principaux :
+    - numero (int) : identifiant de la salle
+    - joueurs (list) : grilles des joueurs 0 et 1 (Joueur ou JoueurBitboard)
+    - ia (str|None) : niveau de l'IA du serveur (joueur 1), None entre humains
+    - prets (list[bool]) : True quand la flotte du joueur est placée
+    - phase (str) : "placement", "battle" ou "fin"
+    - tour (int) : joueur dont c'est le tour de tirer
+    - gagnant (int|None) : vainqueur une fois la partie finie
+    - coups (int) : nombre de tirs joués
+
+    Méthodes principales :
+    - placer(j, placements) : place la flotte du joueur j (au hasard si None)
+    - tirer(j, row, col) : tir du joueur j
+    - tir_ia() : tir de l'IA du serveur
+    - abandon(j) : le joueur j quitte la partie
+    """
+    def __init__(self, numero, ia=None, classe=Joueur, rows=10, cols=10, flotte=None, rng=None):
+        if ia is not None and ia not in Joueur.NIVEAUX:
+            raise ValueError(f"Niveau inconnu : {ia}")
+        self.numero = numero
+        self.ia = ia
+        self.classe = classe
+        self.rows = rows
+        self.cols = cols
+        self.flotte = flotte
+        self.rng = rng
+        self.joueurs = [self.nouveau_joueur("Joueur1"), self.nouveau_joueur("Joueur2")]
+        self.prets = [False, False]
+        self.phase = "placement"
+        self.tour = 0
+        self.gagnant = None
+        self.coups = 0
+        if ia is not None:
+            self.joueurs[1].placement_aleatoire()
+            self.joueurs[1].definir_niveau(ia)
+            self.prets[1] = True
+
+    def nouveau_joueur(self, nom):
+        """
+        Crée une grille vide (navires non placés) pour un joueur.
+        """
+        joueur = self.classe(nom, self.rows, self.cols, self.flotte, self.rng)
+        if self.classe is Joueur:
+            joueur.initialiser_navires()
+        return joueur
+
+    def description(self, j):
+        """
+        Retourne le message d'ouverture de la salle pour le joueur j.
+        """
+        return {"e": "partie", "salle": self.numero, "joueur": j, "rows": self.rows, "cols": self.cols,
+                "flotte": self.joueurs[j].flotte, "ia": self.ia}
+
+    def placer(self, j, placements=None):
+        """
+        Place la flotte du joueur j : 'placements' donne [row, col, ori]
+        pour chaque navire, dans l'ordre de la flotte ; None => placement
+        aléatoire. La bataille commence quand les deux flottes sont placées.
+        """
+        if self.phase != "placement" or self.prets[j]:
+            raise ValueError("Placement impossible maintenant")
+        if placements is None:
+            self.joueurs[j].placement_aleatoire()
+        else:
+            joueur = self.nouveau_joueur(self.joueurs[j].nom)
+            if not isinstance(placements, list) or len(placements) != len(joueur.flotte):
+                raise ValueError(f"{len(joueur.flotte)} placements attendus")
+            for indice, placement in enumerate(placements):
+                try:
+                    (row, col, ori) = placement
+                    row, col = int(row), int(col)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Placement mal formé : {placement}")
+                navire = indice if self.classe is JoueurBitboard else joueur.navires[indice]
+                if ori not in ("H", "V") or not joueur.peut_placer_navire(navire, row, col, ori):
+                    raise ValueError(f"Placement invalide : {placement}")
+                joueur.placer_navire(navire, row, col, ori)
+            self.joueurs[j] = joueur
+        self.prets[j] = True
+
+        codes = placements_joueur(self.joueurs[j])
+        evenements = [(j, {"e": "placement",
+                           "placements": [[*divmod(code // 2, self.cols), "V" if code % 2 else "H"]
+                                          for code in codes]})]
+        if all(self.prets):
+            self.phase = "battle"
+            evenements.append((None, {"e": "debut", "tour": self.tour}))
+        return evenements
+
+    def cases_coulees(self, tireur):
+        """
+        Retourne les [row, col] du navire que 'tireur' vient de couler.
+        """
+        if self.classe is JoueurBitboard:
+            return [list(case) for case in tireur.cases(tireur.dernier_coule)]
+        return [list(case) for case in tireur.dernier_coule.positions]
+
+    def tirer(self, j, row, col):
+        """
+        Tir du joueur j en (row, col), résolu par tirer_sur.
+        """
+        if self.phase != "battle":
+            raise ValueError("La bataille n'a pas commencé" if self.phase == "placement" else "Partie terminée")
+        if self.tour != j:
+            raise ValueError("Ce n'est pas votre tour")
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"Case hors de la grille : ({row}, {col})")
+        (tireur, cible) = (self.joueurs[j], self.joueurs[1 - j])
+        resultat = tireur.tirer_sur(cible, row, col)
+        if resultat == "deja_tire":
+            raise ValueError(f"Case déjà visée : ({row}, {col})")
+        if j == 1 and self.ia is not None:
+            tireur.enregistrer_resultat(row, col, resultat)
+        self.coups += 1
+
+        message = {"e": "tir", "j": j, "row": row, "col": col, "res": resultat}
+        if resultat == "coule":
+            message["cases"] = self.cases_coulees(tireur)
+        evenements = [(None, message)]
+        if cible.tous_navires_coules():
+            evenements.extend(self.terminer(j))
+        else:
+            self.tour = 1 - j
+        return evenements
+
+    def tir_ia(self):
+        """
+        Tir de l'IA du serveur (joueur 1), à son tour.
+        """
+        tir = self.joueurs[1].choisir_tir()
+        if tir is None:
+            return self.terminer(None)
+        return self.tirer(1, *tir)
+
+    def terminer(self, gagnant, abandon=False):
+        """
+        Termine la partie et retourne l'événement de fin.
+        """
+        self.phase = "fin"
+        self.gagnant = gagnant
+        message = {"e": "fin", "gagnant": gagnant}
+        if abandon:
+            message["abandon"] = True
+        return [(None, message)]
+
+    def abandon(self, j):
+        """
+        Le joueur j quitte la salle : l'adversaire gagne si la partie
+        n'était pas finie.
+        """
+        if self.phase == "fin":
+            return []
+        return self.terminer(1 - j, abandon=True)
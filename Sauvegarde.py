@@ -0,0 +1,222 @@
+"""
+Module Sauvegarde
+-----------------
+Instantané binaire compact d'une partie (joueur contre ordinateur, ou
+deux IA en simulation), pour sauvegarder/reprendre une partie ou stocker
+des millions de parties simulées.
+
+Format (petit-boutiste) :
+- en-tête fixe (ENTETE, 14 octets) : b"BN", version, rows, cols,
+  nombre de navires, phase, niveau de l'ordinateur, temps écoulé (s)
+- taille de chaque navire (1 octet par navire, 2 si la grille a plus de
+  255 lignes ou colonnes)
+- pour chaque joueur (joueur puis ordinateur) :
+  - placement de chaque navire : (case de départ * 2 + V), ou la valeur
+    maximale du champ si le navire n'est pas encore placé ; sur 2 octets
+    si la grille a moins de 32768 cases, 4 ou 8 au-delà (formats())
+  - masque des tirs effectués par ce joueur (ceil(rows*cols/8) octets)
+
+Les largeurs ne dépendent que de la grille (formats) : en 10x10 ce sont
+celles de la version 1, dont les instantanés restent lisibles.
+
+Les touches, navires coulés et compteurs de tirs ne sont pas stockés :
+ils se déduisent des tirs et des placements adverses, et sont
+reconstruits au chargement en rejouant les tirs avec tirer_sur.
+Une partie standard (10x10, 6 navires) occupe 70 octets.
+"""
+import struct
+from Navire import *
+from Joueur import *
+from JoueurBitboard import *
+
+MAGIC = b"BN"
+VERSION = 2
+ENTETE = struct.Struct("<2sBHHBBBI")
+# Placement d'un navire non placé (version 1 et grilles de moins de 32768 cases)
+NON_PLACE = 0xFFFF
+PHASES = ("placement", "battle", "fin")
+
+
+def formats(rows, cols, version=VERSION):
+    """
+    Retourne (code struct d'une taille de navire, code struct d'un
+    placement, valeur d'un navire non placé) pour une grille rows x cols.
+    """
+    if version == 1:
+        return ("B", "H", NON_PLACE)
+    taille = "B" if max(rows, cols) <= 0xFF else "H"
+    placement = "H" if 2 * rows * cols < 0xFFFF else "I" if 2 * rows * cols < 0xFFFFFFFF else "Q"
+    return (taille, placement, (1 << (8 * struct.calcsize(placement))) - 1)
+
+
+def taille_enregistrement(rows, cols, nb_navires, version=VERSION):
+    """
+    Retourne la taille en octets d'un instantané pour une grille rows x cols
+    et une flotte de nb_navires navires.
+    """
+    (code_taille, code_placement, _) = formats(rows, cols, version)
+    octets_tirs = (rows * cols + 7) // 8
+    return (ENTETE.size + nb_navires * struct.calcsize(code_taille)
+            + 2 * (nb_navires * struct.calcsize(code_placement) + octets_tirs))
+
+
+def placements_joueur(joueur, non_place=NON_PLACE):
+    """
+    Retourne, pour chaque navire du joueur (Joueur ou JoueurBitboard),
+    son placement codé (case de départ * 2 + 1 si vertical) ou 'non_place'.
+    """
+    codes = []
+    if isinstance(joueur, JoueurBitboard):
+        for (_, taille), masque in zip(joueur.flotte, joueur.masques):
+            if not masque:
+                codes.append(non_place)
+                continue
+            depart = (masque & -masque).bit_length() - 1
+            # Vertical si la case sous le départ en fait partie (un navire
+            # horizontal tient sur une ligne, même si cols == 1)
+            vertical = taille > 1 and (masque >> (depart + joueur.cols)) & 1
+            codes.append(depart * 2 + vertical)
+    else:
+        for navire in joueur.navires:
+            if not navire.positions:
+                codes.append(non_place)
+                continue
+            (row, col) = navire.positions[0]
+            vertical = len(navire.positions) > 1 and navire.positions[1][1] == col
+            codes.append((row * joueur.cols + col) * 2 + vertical)
+    return codes
+
+
+def _masque_tirs(joueur):
+    """
+    Retourne le masque (bit row*cols+col) des cases visées par le joueur.
+    """
+    if isinstance(joueur, JoueurBitboard):
+        return joueur.tirs
+    masque = 0
+    for (row, col) in joueur.tirs_effectues:
+        masque |= 1 << (row * joueur.cols + col)
+    return masque
+
+
+def encoder_partie(joueur, ordinateur, phase="battle", temps=0):
+    """
+    Encode l'état de la partie (deux joueurs de même grille et même flotte,
+    phase de jeu, temps écoulé en secondes) en un instantané binaire.
+    """
+    rows, cols = joueur.rows, joueur.cols
+    tailles = [taille for (_, taille) in joueur.flotte]
+    if len(tailles) > 0xFF:
+        raise ValueError(f"Flotte trop grande pour un instantané : {len(tailles)} navires")
+    (code_taille, code_placement, non_place) = formats(rows, cols)
+    octets_tirs = (rows * cols + 7) // 8
+    morceaux = [
+        ENTETE.pack(MAGIC, VERSION, rows, cols, len(tailles), PHASES.index(phase),
+                    Joueur.NIVEAUX.index(ordinateur.niveau), int(temps)),
+        struct.pack(f"<{len(tailles)}{code_taille}", *tailles),
+    ]
+    for j in (joueur, ordinateur):
+        codes = placements_joueur(j, non_place)
+        morceaux.append(struct.pack(f"<{len(codes)}{code_placement}", *codes))
+        morceaux.append(_masque_tirs(j).to_bytes(octets_tirs, "little"))
+    return b"".join(morceaux)
+
+
+def decoder_partie(donnees, classe=Joueur, flotte=None, rng=None):
+    """
+    Décode un instantané produit par encoder_partie.
+    Retourne (joueur, ordinateur, phase, temps), les joueurs étant des
+    instances de 'classe' (Joueur ou JoueurBitboard) avec navires placés,
+    tirs rejoués (touches, coulés, compteurs) et IA de l'ordinateur restaurée.
+    'flotte' donne les noms des navires si les tailles correspondent,
+    sinon les navires sont nommés "Navire1", "Navire2"...
+    'rng' est le générateur aléatoire donné aux joueurs (voir Joueur).
+    Un instantané invalide ou corrompu lève ValueError.
+    """
+    if len(donnees) < ENTETE.size:
+        raise ValueError("Instantané de partie tronqué")
+    (magic, version, rows, cols, nb_navires, phase, niveau, temps) = \
+        ENTETE.unpack_from(donnees, 0)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError("Instantané de partie invalide")
+    if phase >= len(PHASES) or niveau >= len(Joueur.NIVEAUX):
+        raise ValueError(f"Instantané de partie corrompu (phase {phase}, niveau {niveau})")
+    if len(donnees) < taille_enregistrement(rows, cols, nb_navires, version):
+        raise ValueError("Instantané de partie tronqué")
+    (code_taille, code_placement, non_place) = formats(rows, cols, version)
+    position = ENTETE.size
+    tailles = list(struct.unpack_from(f"<{nb_navires}{code_taille}", donnees, position))
+    position += nb_navires * struct.calcsize(code_taille)
+
+    if flotte is None:
+        flotte = Navire.NAVIRES_DISPONIBLES
+    if [taille for (_, taille) in flotte] != tailles:
+        flotte = [(f"Navire{i + 1}", taille) for i, taille in enumerate(tailles)]
+
+    octets_tirs = (rows * cols + 7) // 8
+    joueurs = []
+    tirs = []
+    for nom in ("Humain", "Ordinateur"):
+        j = classe(nom, rows, cols, flotte, rng)
+        if classe is Joueur:
+            j.initialiser_navires()
+        codes = struct.unpack_from(f"<{nb_navires}{code_placement}", donnees, position)
+        position += nb_navires * struct.calcsize(code_placement)
+        for indice, code in enumerate(codes):
+            if code == non_place:
+                continue
+            (row, col) = divmod(code // 2, cols)
+            ori = 'V' if code % 2 else 'H'
+            navire = indice if classe is JoueurBitboard else j.navires[indice]
+            if not j.peut_placer_navire(navire, row, col, ori):
+                raise ValueError(f"Instantané de partie corrompu (placement {code} du navire {indice + 1})")
+            j.placer_navire(navire, row, col, ori)
+        masque = int.from_bytes(donnees[position:position + octets_tirs], "little")
+        if masque >> (rows * cols):
+            raise ValueError("Instantané de partie corrompu (tirs hors de la grille)")
+        tirs.append(masque)
+        position += octets_tirs
+        joueurs.append(j)
+
+    (joueur, ordinateur) = joueurs
+    ordinateur.definir_niveau(Joueur.NIVEAUX[niveau])
+    # On rejoue les tirs : touches, coulés, compteurs et mémoire de l'IA
+    for tireur, cible, masque in ((joueur, ordinateur, tirs[0]), (ordinateur, joueur, tirs[1])):
+        while masque:
+            bas = masque & -masque
+            (row, col) = divmod(bas.bit_length() - 1, cols)
+            masque ^= bas
+            resultat = tireur.tirer_sur(cible, row, col)
+            tireur.enregistrer_resultat(row, col, resultat)
+    return (joueur, ordinateur, PHASES[phase], temps)
+
+
+def sauvegarder(chemin, joueur, ordinateur, phase="battle", temps=0):
+    """
+    Écrit l'instantané de la partie dans le fichier 'chemin'.
+    """
+    with open(chemin, "wb") as fichier:
+        fichier.write(encoder_partie(joueur, ordinateur, phase, temps))
+
+
+def charger(chemin, classe=Joueur, flotte=None):
+    """
+    Lit le fichier 'chemin' et retourne (joueur, ordinateur, phase, temps).
+    """
+    with open(chemin, "rb") as fichier:
+        return decoder_partie(fichier.read(), classe, flotte)
+
+
+def lire_parties(fichier, classe=Joueur, flotte=None):
+    """
+    Générateur qui décode un à un les instantanés concaténés dans un
+    fichier binaire ouvert (ex : parties simulées écrites à la suite avec
+    encoder_partie), sans charger tout le fichier en mémoire.
+    """
+    while True:
+        entete = fichier.read(ENTETE.size)
+        if len(entete) < ENTETE.size:
+            return
+        (_, version, rows, cols, nb_navires, _, _, _) = ENTETE.unpack(entete)
+        reste = fichier.read(taille_enregistrement(rows, cols, nb_navires, version) - ENTETE.size)
+        yield decoder_partie(entete + reste, classe, flotte)
@@ -0,0 +1,293 @@
+"""
+Module Serveur
+--------------
+Serveur de parties en réseau (asyncio, TCP) : chaque partie est une
+Salle, dont les placements et les tirs sont validés côté serveur.
+
+    python Serveur.py --port 5454
+
+Protocole : une ligne JSON par message, dans chaque sens.
+
+Client -> serveur (clé "c") :
+- {"c": "rejoindre", "ia": null}      attend un autre humain
+- {"c": "rejoindre", "ia": "expert"}  partie immédiate contre l'IA du serveur
+- {"c": "placer", "placements": [[row, col, "H"|"V"], ...]}
+  (un par navire, dans l'ordre de la flotte ; sans "placements" : au hasard)
+- {"c": "tir", "row": r, "col": c}
+- {"c": "stats"}                      état du serveur (voir stats())
+- {"c": "quitter"}
+
+Serveur -> client (clé "e") :
+- {"e": "attente"}
+- {"e": "partie", "salle", "joueur" (0 ou 1), "rows", "cols", "flotte", "ia"}
+- {"e": "placement", "placements"}    flotte placée (telle que retenue)
+- {"e": "debut", "tour"}              les deux flottes sont placées
+- {"e": "tir", "j", "row", "col", "res"[, "cases"]}  tir du joueur j, envoyé
+  aux deux joueurs ; "cases" donne le navire coulé
+- {"e": "fin", "gagnant"[, "abandon"]}
+- {"e": "erreur", "msg"}              commande refusée, rien n'a changé
+"""
+import argparse
+import asyncio
+import json
+import time
+from Simulation import *
+from Aleatoire import *
+from Salle import *
+
+
+def augmenter_limite_fichiers():
+    """
+    Relève la limite de descripteurs ouverts au maximum permis (Unix) :
+    une connexion par joueur, des milliers de salles.
+    """
+    try:
+        import resource
+        (_, maximum) = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (maximum, maximum))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+class Serveur:
+    """
+    Classe Serveur
+    -------------
+    Gestionnaire des salles : associe les connexions deux à deux (ou à
+    l'IA du serveur), transmet les commandes à la Salle et diffuse les
+    événements qu'elle retourne. Tout tourne dans une seule boucle
+    asyncio ; seuls les tirs de l'IA monte-carlo (plusieurs ms) sont
+    calculés dans un thread.
+
+    Attributs principaux :
+    - classe (type) : Joueur ou JoueurBitboard (grilles des salles)
+    - rows, cols (int), flotte : paramètres des parties
+    - salles (dict[int, Salle]) : salles ouvertes
+    - clients (dict[int, list]) : écrivains (StreamWriter) des deux
+      joueurs de chaque salle (None pour l'IA)
+    - connexions (dict[StreamWriter, list]) : [salle, j] de chaque connexion
+      (salle None tant qu'elle n'est pas placée)
+    - attente (StreamWriter|None) : humain en attente d'un adversaire
+    - graine (int|None) : si fournie, la salle n est jouée avec la graine
+      (graine + n)
+    - parties, coups (int) : parties terminées, tirs joués
+    - salles_secondes (float) : intégrale du nombre de salles ouvertes
+      dans le temps (salles x s), à jour à chaque ouverture, fermeture et
+      appel de stats()
+    """
+    def __init__(self, backend="objets", rows=10, cols=10, flotte=None, graine=None, generateur="mt"):
+        if backend not in Simulation.BACKENDS:
+            raise ValueError(f"Backend inconnu : {backend}")
+        self.classe = Simulation.BACKENDS[backend]
+        self.rows = rows
+        self.cols = cols
+        self.flotte = flotte
+        self.graine = graine
+        self.generateur = generateur
+        self.salles = {}
+        self.clients = {}
+        self.connexions = {}
+        self.attente = None
+        self.numero = 0
+        self.parties = 0
+        self.coups = 0
+        self.debut = time.perf_counter()
+        self.salles_secondes = 0.0
+        self.instant_salles = self.debut
+
+    def ouvrir_salle(self, ia=None):
+        """
+        Crée une salle (contre l'IA du serveur si 'ia' est un niveau).
+        """
+        self.numero += 1
+        graine = None if self.graine is None else self.graine + self.numero
+        rng = nouveau_generateur(graine, self.generateur)
+        salle = Salle(self.numero, ia, self.classe, self.rows, self.cols, self.flotte, rng)
+        self.cumuler_salles()
+        self.salles[salle.numero] = salle
+        self.clients[salle.numero] = [None, None]
+        return salle
+
+    def rejoindre(self, writer, ia):
+        """
+        Place la connexion dans une salle : contre l'IA, avec l'humain en
+        attente, ou en attente d'un adversaire.
+        """
+        if ia is not None:
+            salle = self.ouvrir_salle(ia)
+            self.installer(salle, 0, writer)
+        elif self.attente is None or self.attente is writer:
+            self.attente = writer
+            writer.write(encoder({"e": "attente"}))
+        else:
+            salle = self.ouvrir_salle()
+            self.installer(salle, 0, self.attente)
+            self.installer(salle, 1, writer)
+            self.attente = None
+
+    def installer(self, salle, j, writer):
+        """Associe la connexion 'writer' au joueur j de la salle."""
+        self.clients[salle.numero][j] = writer
+        self.connexions[writer] = [salle, j]
+        writer.write(encoder(salle.description(j)))
+
+    def diffuser(self, salle, evenements):
+        """
+        Envoie les événements (destinataire, message) aux joueurs de la
+        salle, et ferme la salle si la partie est finie.
+        """
+        clients = self.clients.get(salle.numero, (None, None))
+        for (destinataire, message) in evenements:
+            ligne = encoder(message)
+            for j, writer in enumerate(clients):
+                if writer is not None and destinataire in (None, j) and not writer.is_closing():
+                    writer.write(ligne)
+        if salle.phase == "fin":
+            self.fermer_salle(salle)
+
+    def fermer_salle(self, salle):
+        """Retire une salle terminée (les connexions restent ouvertes)."""
+        if salle.numero not in self.salles:
+            return
+        self.cumuler_salles()
+        del self.salles[salle.numero]
+        self.parties += 1
+        self.coups += salle.coups
+        for writer in self.clients.pop(salle.numero):
+            if writer is not None and writer in self.connexions:
+                self.connexions[writer] = [None, None]
+
+    def cumuler_salles(self):
+        """
+        Ajoute à salles_secondes les salles ouvertes depuis le dernier
+        appel ; à appeler avant tout changement du nombre de salles.
+        """
+        maintenant = time.perf_counter()
+        self.salles_secondes += len(self.salles) * (maintenant - self.instant_salles)
+        self.instant_salles = maintenant
+
+    def stats(self):
+        """
+        Retourne l'état du serveur : salles ouvertes, connexions, parties
+        terminées, tirs joués, temps CPU, durée depuis le démarrage (s) et
+        salles_secondes (le nombre moyen de salles ouvertes entre deux
+        appels est l'écart de salles_secondes divisé par celui de duree).
+        """
+        self.cumuler_salles()
+        return {"e": "stats", "salles": len(self.salles), "connexions": len(self.connexions),
+                "parties": self.parties, "coups": self.coups + sum(s.coups for s in self.salles.values()),
+                "cpu": time.process_time(), "duree": self.instant_salles - self.debut,
+                "salles_secondes": self.salles_secondes}
+
+    async def traiter(self, writer, message):
+        """
+        Exécute une commande du client ; ValueError => message d'erreur.
+        """
+        commande = message.get("c")
+        (salle, j) = self.connexions.get(writer, (None, None))
+        if commande == "rejoindre":
+            if salle is not None:
+                raise ValueError("Déjà dans une partie")
+            self.rejoindre(writer, message.get("ia"))
+        elif commande == "stats":
+            writer.write(encoder(self.stats()))
+        elif commande in ("placer", "tir"):
+            if salle is None:
+                raise ValueError("Aucune partie en cours")
+            if commande == "placer":
+                evenements = salle.placer(j, message.get("placements"))
+            else:
+                try:
+                    (row, col) = (int(message["row"]), int(message["col"]))
+                except (KeyError, TypeError, ValueError):
+                    raise ValueError("Tir mal formé")
+                evenements = salle.tirer(j, row, col)
+            self.diffuser(salle, evenements)
+            # Riposte de l'IA du serveur
+            while salle.ia is not None and salle.phase == "battle" and salle.tour == 1:
+                if salle.ia == "monte-carlo":
+                    evenements = await asyncio.to_thread(salle.tir_ia)
+                else:
+                    evenements = salle.tir_ia()
+                self.diffuser(salle, evenements)
+        else:
+            raise ValueError(f"Commande inconnue : {commande}")
+
+    async def servir(self, reader, writer):
+        """
+        Boucle d'une connexion : lit les commandes ligne par ligne jusqu'à
+        "quitter" ou la déconnexion, puis libère la salle. Une ligne plus
+        longue que la limite du StreamReader (64 Kio) ferme la connexion
+        après un message d'erreur.
+        """
+        self.connexions[writer] = [None, None]
+        try:
+            while True:
+                try:
+                    ligne = await reader.readline()
+                except ValueError:
+                    writer.write(encoder({"e": "erreur", "msg": "Ligne trop longue"}))
+                    await writer.drain()
+                    break
+                if not ligne:
+                    break
+                try:
+                    message = json.loads(ligne)
+                    if not isinstance(message, dict):
+                        raise ValueError("Message JSON attendu")
+                    if message.get("c") == "quitter":
+                        break
+                    await self.traiter(writer, message)
+                except ValueError as e:
+                    writer.write(encoder({"e": "erreur", "msg": str(e)}))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.deconnecter(writer)
+            writer.close()
+
+    def deconnecter(self, writer):
+        """
+        Oublie la connexion : l'adversaire gagne par abandon.
+        """
+        if self.attente is writer:
+            self.attente = None
+        (salle, j) = self.connexions.pop(writer, (None, None))
+        if salle is not None and salle.numero in self.salles:
+            self.clients[salle.numero][j] = None
+            self.diffuser(salle, salle.abandon(j))
+
+    async def lancer(self, hote="127.0.0.1", port=PORT):
+        """
+        Écoute sur (hote, port) jusqu'à l'interruption du programme.
+        """
+        serveur = await asyncio.start_server(self.servir, hote, port, backlog=4096)
+        print(f"[INFO] Serveur à l'écoute sur {hote}:{port}")
+        async with serveur:
+            await serveur.serve_forever()
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande : lance le serveur.
+    """
+    parser = argparse.ArgumentParser(description="Serveur de Bataille Navale en réseau")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse d'écoute (0.0.0.0 : toutes)")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--backend", choices=sorted(Simulation.BACKENDS), default="objets",
+                        help="grilles des salles (bits : moins de mémoire par salle)")
+    parser.add_argument("--graine", type=int, default=None, help="graine : la salle n utilise graine + n")
+    parser.add_argument("--generateur", choices=sorted(GENERATEURS), default="mt")
+    args = parser.parse_args()
+
+    augmenter_limite_fichiers()
+    serveur = Serveur(args.backend, graine=args.graine, generateur=args.generateur)
+    try:
+        asyncio.run(serveur.lancer(args.hote, args.port))
+    except KeyboardInterrupt:
+        print(f"[INFO] Arrêt : {serveur.parties} parties, {serveur.coups} tirs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import time
+from Joueur import *
+from JoueurBitboard import *
+from Journal import *
+from Resultats import *
+from Aleatoire import *
+from Instrumentation import *
+
+
+class Simulation:
+    """
+    Classe Simulation
+    ----------------
+    Moteur de jeu sans affichage (aucune dépendance à Tkinter) qui fait
+    s'affronter deux IA en reprenant exactement les règles de main.py :
+    placement aléatoire des flottes, Joueur.tirer_sur pour résoudre les
+    tirs, Joueur.choisir_tir / Joueur.enregistrer_resultat pour l'IA.
+
+    Attributs principaux :
+    - modes (tuple[str, str]) : niveau de chaque IA (voir Joueur.NIVEAUX)
+    - backend (str) : "objets" (Joueur) ou "bits" (JoueurBitboard)
+    - rows, cols (int) : dimensions des grilles
+    - flotte (list[tuple[str, int]]|None) : flotte de chaque joueur
+      (None => Navire.NAVIRES_DISPONIBLES)
+    - parties (int) : nombre de parties jouées
+    - victoires (list[int]) : nombre de victoires de chaque IA
+    - nuls (int) : nombre de parties sans vainqueur
+    - tirs_vainqueur (int) : somme des tirs effectués par les vainqueurs
+    - tirs_derniere_partie (int) : tirs du vainqueur de la dernière partie
+    - duree (float) : temps total passé à simuler (secondes)
+    - chronometrer (bool) : si True, mesure le temps de décision de chaque IA
+    - temps_ia (list[float]) : temps cumulé dans choisir_tir et
+      enregistrer_resultat pour chaque IA (si chronometrer)
+    - coups_ia (list[int]) : nombre de coups joués par chaque IA (si chronometrer)
+    - journal (Journal|None) : si fourni, chaque partie y est enregistrée
+      (placements, tirs, résultats, temps ; voir Journal.py)
+    - resultats (FichierResultats|None) : si fourni, chaque partie y est
+      ajoutée (graine, vainqueur, tirs, navires coulés ; voir Resultats.py)
+    - graine (int|None) : si fournie, la partie i de lancer() est jouée avec
+      la graine (graine + i) et peut être rejouée seule avec jouer_partie
+    - generateur (str) : générateur aléatoire ("mt" ou "splitmix", voir
+      Aleatoire.py), propre à la simulation : l'état global de random
+      n'est jamais utilisé
+    - instrumentation (Instrumentation|None) : si fournie et active, reçoit
+      la durée de chaque décision d'IA ("decision_ia", choisir_tir et
+      enregistrer_resultat) et de chaque tir ("tir", tirer_sur)
+
+    Méthodes principales :
+    - creer_joueur(nom, mode, rng) : crée un Joueur IA avec sa flotte placée
+    - jouer_partie(graine) : joue une partie complète, retourne l'index du vainqueur
+    - lancer(n) : joue n parties et cumule les statistiques
+    - rapport() : texte résumant parties/s et taux de victoire
+    """
+    MODES = Joueur.NIVEAUX
+    BACKENDS = {"objets": Joueur, "bits": JoueurBitboard}
+
+    def __init__(self, mode1="facile", mode2="facile", backend="objets",
+                 rows=10, cols=10, flotte=None, chronometrer=False, journal=None,
+                 graine=None, generateur="mt", instrumentation=None, resultats=None):
+        for mode in (mode1, mode2):
+            if mode not in self.MODES:
+                raise ValueError(f"Mode inconnu : {mode}")
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend inconnu : {backend}")
+        if "monte-carlo" in (mode1, mode2) and not indexable(rows, cols):
+            raise ValueError(f"Niveau monte-carlo impossible sur une grille {rows}x{cols}")
+        self.modes = (mode1, mode2)
+        self.backend = backend
+        self.rows = rows
+        self.cols = cols
+        self.flotte = flotte
+        self.parties = 0
+        self.victoires = [0, 0]
+        self.nuls = 0
+        self.tirs_vainqueur = 0
+        self.tirs_derniere_partie = 0
+        self.duree = 0.0
+        self.chronometrer = chronometrer
+        self.temps_ia = [0.0, 0.0]
+        self.coups_ia = [0, 0]
+        self.journal = journal
+        self.graine = graine
+        self.generateur = generateur
+        self.rng = nouveau_generateur(graine, generateur)
+        self.instrumentation = instrumentation
+        self.resultats = resultats
+
+    def creer_joueur(self, nom, mode, rng=None):
+        """
+        Crée un joueur IA (Joueur ou JoueurBitboard selon self.backend)
+        dans le mode demandé, avec ses navires placés aléatoirement
+        à l'aide de 'rng' (par défaut le générateur de la simulation).
+        """
+        rng = self.rng if rng is None else rng
+        joueur = self.BACKENDS[self.backend](nom, self.rows, self.cols, self.flotte, rng)
+        joueur.definir_niveau(mode)
+        if self.backend == "objets":
+            joueur.initialiser_navires()
+        joueur.placement_aleatoire()
+        return joueur
+
+    def jouer_partie(self, graine=None):
+        """
+        Joue une partie complète IA contre IA, l'IA 0 tirant en premier
+        (comme le joueur humain dans main.py).
+        Avec une 'graine', la partie est entièrement déterminée par elle
+        (même placement, mêmes tirs) ; sinon le générateur de la simulation
+        poursuit sa suite.
+        Retourne 0 ou 1 (index du vainqueur), ou None en cas de match nul.
+        """
+        rng = self.rng if graine is None else nouveau_generateur(graine, self.generateur)
+        joueurs = (
+            self.creer_joueur("IA 1", self.modes[0], rng),
+            self.creer_joueur("IA 2", self.modes[1], rng),
+        )
+        mesure = self.instrumentation
+        if mesure is not None and not mesure.actif:
+            mesure = None
+        chronometrer = self.chronometrer or mesure is not None
+        journal = self.journal
+        if journal is not None:
+            journal.debut_partie(self.rows, self.cols, joueurs[0].flotte, graine)
+            for j in (0, 1):
+                journal.placements(j, joueurs[j])
+        resultats = self.resultats
+        if resultats is not None:
+            sequence = []
+            coules = [None] * (2 * len(joueurs[0].flotte))
+        tour = 0
+        if not chronometrer and journal is None and resultats is None and hasattr(joueurs[0], "jouer_coup"):
+            # Rien à mesurer ni à enregistrer, et un backend qui fusionne les
+            # trois étapes d'un tour (JoueurBitboard.jouer_coup) : un appel par tour
+            while True:
+                (tireur, cible) = (joueurs[tour], joueurs[1 - tour])
+                resultat = tireur.jouer_coup(cible)
+                if resultat is None:
+                    return None
+                if resultat == "coule" and cible.tous_navires_coules():
+                    self.tirs_derniere_partie = tireur.tirs_reussis + tireur.tirs_rates
+                    self.tirs_vainqueur += self.tirs_derniere_partie
+                    return tour
+                tour = 1 - tour
+        while True:
+            tireur = joueurs[tour]
+            cible = joueurs[1 - tour]
+
+            if chronometrer:
+                debut = time.perf_counter()
+            tir = tireur.choisir_tir()
+            if tir is None:
+                if journal is not None:
+                    journal.fin_partie(None)
+                if resultats is not None:
+                    resultats.ajouter(graine, None, 0, sequence, coules)
+                return None
+            (row, col) = tir
+            if chronometrer:
+                milieu = time.perf_counter()
+                duree_ia = milieu - debut
+            resultat = tireur.tirer_sur(cible, row, col)
+            if chronometrer:
+                debut = time.perf_counter()
+                duree_tir = debut - milieu
+            tireur.enregistrer_resultat(row, col, resultat)
+            if chronometrer:
+                duree_ia += time.perf_counter() - debut
+                self.temps_ia[tour] += duree_ia
+                self.coups_ia[tour] += 1
+                if mesure is not None:
+                    mesure.ajouter("decision_ia", duree_ia)
+                    mesure.ajouter("tir", duree_tir)
+            if journal is not None:
+                journal.tir(tour, row, col, resultat)
+            if resultats is not None:
+                sequence.append(row * self.cols + col)
+                if resultat == "coule":
+                    coules[(1 - tour) * len(cible.flotte) + index_navire(cible, row, col)] = len(sequence) - 1
+
+            if resultat == "coule" and cible.tous_navires_coules():
+                self.tirs_derniere_partie = tireur.tirs_reussis + tireur.tirs_rates
+                self.tirs_vainqueur += self.tirs_derniere_partie
+                if journal is not None:
+                    journal.fin_partie(tour)
+                if resultats is not None:
+                    resultats.ajouter(graine, tour, self.tirs_derniere_partie, sequence, coules)
+                return tour
+            tour = 1 - tour
+
+    def lancer(self, n):
+        """
+        Joue n parties et cumule les statistiques (victoires, nuls, durée).
+        """
+        debut = time.perf_counter()
+        for i in range(n):
+            graine = None if self.graine is None else self.graine + self.parties + i
+            gagnant = self.jouer_partie(graine)
+            if gagnant is None:
+                self.nuls += 1
+            else:
+                self.victoires[gagnant] += 1
+        self.duree += time.perf_counter() - debut
+        self.parties += n
+
+    def rapport(self):
+        """
+        Retourne un texte résumant les statistiques accumulées :
+        parties/s, taux de victoire de chaque IA, tirs moyens du vainqueur.
+        """
+        if self.parties == 0:
+            return "[INFO] Aucune partie jouée."
+        vitesse = self.parties / self.duree if self.duree > 0 else float("inf")
+        gagnees = self.parties - self.nuls
+        tirs_moyens = self.tirs_vainqueur / gagnees if gagnees else 0.0
+        lignes = [
+            f"[SIMULATION] {self.parties} parties ({self.backend}, {self.rows}x{self.cols}) "
+            f"en {self.duree:.2f} s "
+            f"({vitesse:.0f} parties/s, {vitesse * 3600:.0f} parties/h)",
+        ]
+        for i, mode in enumerate(self.modes):
+            taux = 100.0 * self.victoires[i] / self.parties
+            lignes.append(f"  IA {i + 1} ({mode}) : {self.victoires[i]} victoires ({taux:.1f} %)")
+        lignes.append(f"  Nuls : {self.nuls}")
+        lignes.append(f"  Tirs moyens du vainqueur : {tirs_moyens:.1f}")
+        return "\n".join(lignes)
+
+
+def lire_flotte(texte):
+    """
+    Convertit une liste de tailles "5,4,3,3,2,2" en flotte
+    [("Navire1", 5), ("Navire2", 4), ...].
+    """
+    tailles = [int(t) for t in texte.split(",") if t.strip()]
+    return [(f"Navire{i + 1}", taille) for i, taille in enumerate(tailles)]
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande :
+        python Simulation.py -n 10000 --ia1 difficile --ia2 facile --backend bits
+        python Simulation.py -n 100 --lignes 1000 --colonnes 1000 --flotte 5,4,3,3,2,2
+        python Simulation.py -n 100000 --journal parties.journal
+        python Simulation.py -n 1 --graine 4217 --journal partie.journal  (rejoue la partie 4217)
+        python Simulation.py -n 1000 --ia1 expert --profil simulation.prof  (voir Instrumentation.py)
+        python Simulation.py -n 100000 --resultats parties.res  (voir Resultats.py)
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulation Bataille Navale IA contre IA (sans affichage)")
+    parser.add_argument("-n", "--parties", type=int, default=1000, help="nombre de parties à jouer")
+    parser.add_argument("--ia1", choices=Simulation.MODES, default="facile", help="mode de l'IA qui tire en premier")
+    parser.add_argument("--ia2", choices=Simulation.MODES, default="facile", help="mode de la seconde IA")
+    parser.add_argument("--backend", choices=sorted(Simulation.BACKENDS), default="objets",
+                        help="représentation des grilles : objets (Joueur) ou bits (JoueurBitboard)")
+    parser.add_argument("--lignes", type=int, default=10, help="nombre de lignes de la grille")
+    parser.add_argument("--colonnes", type=int, default=10, help="nombre de colonnes de la grille")
+    parser.add_argument("--flotte", type=lire_flotte, default=None,
+                        help="tailles des navires séparées par des virgules (ex : 5,4,3,3,2,2)")
+    parser.add_argument("--journal", default=None, metavar="FICHIER",
+                        help="enregistre toutes les parties dans ce journal (voir Journal.py)")
+    parser.add_argument("--resultats", default=None, metavar="FICHIER",
+                        help="ajoute le résultat de chaque partie à ce fichier (voir Resultats.py)")
+    parser.add_argument("--graine", type=int, default=None,
+                        help="graine de la première partie (parties reproductibles)")
+    parser.add_argument("--generateur", choices=sorted(GENERATEURS), default="mt",
+                        help="générateur aléatoire : mt (Mersenne Twister) ou splitmix (à compteur)")
+    parser.add_argument("--instrumentation", action="store_true",
+                        help="chronomètre décisions et tirs (histogrammes en fin de simulation)")
+    parser.add_argument("--profil", default=None, metavar="FICHIER",
+                        help="enregistre un profil cProfile (et FICHIER.folded) de la simulation")
+    args = parser.parse_args()
+
+    journal = Journal(args.journal) if args.journal else None
+    resultats = FichierResultats(args.resultats, args.lignes, args.colonnes, args.flotte) if args.resultats else None
+    instrumentation = Instrumentation(actif=args.instrumentation or args.profil is not None)
+    simulation = Simulation(args.ia1, args.ia2, args.backend,
+                            args.lignes, args.colonnes, args.flotte, journal=journal,
+                            graine=args.graine, generateur=args.generateur,
+                            instrumentation=instrumentation, resultats=resultats)
+    if args.profil:
+        instrumentation.demarrer_profil()
+    simulation.lancer(args.parties)
+    if args.profil:
+        instrumentation.enregistrer_profil(args.profil)
+        print(f"[INFO] Profil enregistré dans {args.profil} (piles de phases : {args.profil}.folded)")
+    if journal is not None:
+        journal.fermer()
+        print(f"[INFO] {journal.evenements} événements enregistrés dans {args.journal}")
+    if resultats is not None:
+        resultats.fermer()
+        print(f"[INFO] {resultats.nombre} parties dans {args.resultats}")
+    print(simulation.rapport())
+    if instrumentation.actif:
+        print(instrumentation.rapport(histogrammes=True))
+
+
+if __name__ == "__main__":
+    main()
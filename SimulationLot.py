@@ -0,0 +1,356 @@
+"""
+Module SimulationLot
+--------------------
+Moteur de simulation par lots (NumPy) : des milliers de parties IA contre
+IA indépendantes avancent ensemble, un tir par partie à chaque étape.
+
+Au lieu d'un graphe d'objets Joueur / Navire par partie, l'état de toutes
+les parties d'un lot est rangé en tableaux (structure de tableaux), une
+ligne par partie et une colonne par case (row*cols+col) :
+- grilles (parties x rows x cols, int8, ou int16 à partir de 128
+  navires ou d'un navire de 128 cases, voir type_navires) : index du
+  navire occupant la case, -1 si elle est vide
+- tirs (parties x cases, bool) : cases déjà visées par l'IA
+- touches (parties x navires) : touches reçues par chaque navire
+- a_flot (parties) : navires pas encore coulés
+Les tirs d'une IA ne dépendent que de la grille adverse : chaque IA joue
+donc sa moitié des parties seule (tirs_pour_couler), et le vainqueur est
+celle qui coule la flotte adverse en premier, tirs alternés.
+
+Les règles sont celles de Joueur, appliquées à tout le lot à la fois :
+- placement : chaque navire, dans l'ordre de la flotte, est tiré
+  uniformément parmi ses placements encore valides (comme
+  Joueur.placement_aleatoire, avec l'index de Placements) ;
+- tir : résultat "manque", "touche" ou "coule" comme Joueur.tirer_sur ;
+- IA "facile" : case libre uniforme ; IA "difficile" : file des cases
+  adjacentes à un tir "touche", vidée avant tout tir aléatoire (comme
+  Joueur.choisir_tir / Joueur.enregistrer_resultat).
+Les niveaux "expert" et "monte-carlo" ne sont pas vectorisés (voir
+Simulation). Les parties ne reprennent pas les graines de Simulation :
+les résultats sont identiques en loi, pas partie par partie.
+
+    python SimulationLot.py -n 100000 --ia1 difficile --ia2 facile
+    python SimulationLot.py -n 100000 --comparer      (débit face à Simulation)
+    python SimulationLot.py -n 10000000 --resultats campagne.res   (voir Resultats.py)
+"""
+import time
+import numpy as np
+from Navire import *
+from Placements import *
+
+# Tirages directs d'un placement avant l'énumération de ses placements valides
+ESSAIS_PLACEMENT = 32
+# Voisins ajoutés à la file de l'IA difficile, dans l'ordre de Joueur.enregistrer_resultat
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def type_navires(flotte):
+    """
+    Retourne le type NumPy (int8 ou int16) des grilles, des tailles et des
+    touches d'une flotte : il doit contenir l'index de chaque navire, -1
+    (case vide) et la taille du plus grand navire.
+    Lève ValueError si la flotte dépasse int16.
+    """
+    borne = max([len(flotte)] + [taille for (_, taille) in flotte])
+    for type_ in (np.int8, np.int16):
+        if borne <= np.iinfo(type_).max:
+            return type_
+    raise ValueError(f"Flotte trop grande pour le moteur par lots : {len(flotte)} navires, "
+                     f"navire de {max(taille for (_, taille) in flotte)} cases")
+
+
+class SimulationLot:
+    """
+    Classe SimulationLot
+    -------------------
+    Parties IA contre IA jouées par lots de 'taille_lot' parties simultanées
+    (voir la documentation du module). Mêmes statistiques que Simulation.
+
+    Attributs principaux :
+    - modes (tuple[str, str]) : niveau de chaque IA ("facile" ou "difficile")
+    - rows, cols (int) : dimensions des grilles
+    - flotte (list[tuple[str, int]]) : flotte de chaque joueur
+    - type_navires (type NumPy) : type des grilles, tailles et touches
+    - tailles (ndarray) : taille de chaque navire de la flotte
+    - cases_placements (dict[int, ndarray]) : pour chaque taille de navire,
+      les cases de chacun de ses placements (placements x taille)
+    - taille_lot (int) : nombre de parties avancées ensemble
+    - rng (numpy.random.Generator) : générateur du moteur (graine fixe =>
+      lots reproductibles)
+    - parties, victoires, nuls, tirs_vainqueur, duree : comme Simulation
+    - resultats (FichierResultats|None) : si fourni, chaque lot y est ajouté
+      (vainqueur et tirs de chaque partie ; voir Resultats.py)
+
+    Méthodes principales :
+    - placer_flottes(nb) : grilles de nb joueurs, flottes placées
+    - tirs_pour_couler(mode, grilles) : tirs d'une IA pour couler chaque flotte
+    - jouer_lot(nb) : joue nb parties, retourne (gagnants, tirs du vainqueur)
+    - lancer(n) : joue n parties par lots et cumule les statistiques
+    - rapport() : texte résumant parties/s et taux de victoire
+    """
+    MODES = ("facile", "difficile")
+    TAILLE_LOT = 20000
+
+    def __init__(self, mode1="facile", mode2="facile", rows=10, cols=10, flotte=None,
+                 graine=None, taille_lot=None, resultats=None):
+        for mode in (mode1, mode2):
+            if mode not in self.MODES:
+                raise ValueError(f"Mode non vectorisé : {mode} (voir Simulation)")
+        if not indexable(rows, cols):
+            raise ValueError(f"Grille trop grande pour le moteur par lots : {rows}x{cols}")
+        self.modes = (mode1, mode2)
+        self.rows = rows
+        self.cols = cols
+        self.flotte = Navire.NAVIRES_DISPONIBLES if flotte is None else flotte
+        self.type_navires = type_navires(self.flotte)
+        self.tailles = np.array([taille for (_, taille) in self.flotte], dtype=self.type_navires)
+        self.cases_placements = {
+            taille: np.array([p[4] for p in placements(taille, rows, cols)], dtype=np.intp)
+            for taille in set(self.tailles.tolist())
+        }
+        self.taille_lot = self.TAILLE_LOT if taille_lot is None else taille_lot
+        self.rng = np.random.default_rng(graine)
+        self.parties = 0
+        self.victoires = [0, 0]
+        self.nuls = 0
+        self.tirs_vainqueur = 0
+        self.duree = 0.0
+        self.resultats = resultats
+
+    def placer_flottes(self, nb):
+        """
+        Place la flotte sur nb grilles vides et retourne les grilles
+        (nb x rows x cols, type_navires : index du navire, -1 pour une
+        case vide).
+        Chaque navire est d'abord tiré au hasard parmi tous ses placements
+        et retiré s'il chevauche la flotte (ESSAIS_PLACEMENT fois), puis
+        tiré parmi ses placements valides : dans les deux cas uniformément
+        parmi les placements valides, comme Joueur.placement_aleatoire.
+        """
+        nb_cases = self.rows * self.cols
+        grilles = np.full((nb, nb_cases), -1, dtype=self.type_navires)
+        occupation = np.zeros((nb, nb_cases), dtype=bool)
+        for (indice, (nom, taille)) in enumerate(self.flotte):
+            cases = self.cases_placements[taille]
+            if len(cases) == 0:
+                raise ValueError(f"Impossible de placer {nom} : grille trop petite")
+            choix = np.empty(nb, dtype=np.intp)
+            restants = np.arange(nb)
+            for _ in range(ESSAIS_PLACEMENT):
+                if not len(restants):
+                    break
+                tirage = self.rng.integers(len(cases), size=len(restants))
+                conflit = occupation[restants[:, None], cases[tirage]].any(axis=1)
+                choix[restants[~conflit]] = tirage[~conflit]
+                restants = restants[conflit]
+            if len(restants):
+                # Grilles encombrées : tirage parmi les placements valides
+                valides = ~occupation[restants[:, None, None], cases[None]].any(axis=2)
+                if not valides.any(axis=1).all():
+                    raise ValueError(f"Impossible de placer {nom} : grille trop encombrée")
+                cles = np.where(valides, self.rng.random(valides.shape), -1.0)
+                choix[restants] = cles.argmax(axis=1)
+            lignes = np.arange(nb)[:, None]
+            occupation[lignes, cases[choix]] = True
+            grilles[lignes, cases[choix]] = indice
+        return grilles.reshape(nb, self.rows, self.cols)
+
+    def tirs_pour_couler(self, mode, grilles):
+        """
+        Fait tirer une IA 'mode' sur chacune des grilles (parties x cases,
+        aplaties en un seul tableau) jusqu'à ce qu'elle ait coulé toute la
+        flotte, toutes les grilles avançant d'un tir à chaque étape.
+        Retourne le nombre de tirs effectués sur chaque grille.
+        """
+        nb_cases = self.rows * self.cols
+        nb = len(grilles) // nb_cases
+        cols = self.cols
+        nb_navires = len(self.tailles)
+        # La case c de la grille g est en g * nb_cases + c (un seul index par accès)
+        tirs = np.zeros(nb * nb_cases, dtype=bool)
+        touches = np.zeros(nb * nb_navires, dtype=self.type_navires)
+        a_flot = np.full(nb, nb_navires, dtype=np.int16)
+        # Tirs aléatoires : ordre de tir uniforme, les cases déjà visées
+        # (par la file de l'IA difficile) sont sautées
+        type_case = np.int16 if nb_cases < (1 << 15) else np.int32
+        ordres = self.rng.random((nb, nb_cases)).argsort(axis=1).astype(type_case).reshape(-1)
+        suivants = np.zeros(nb, dtype=np.intp)
+        difficile = mode == "difficile"
+        if difficile:
+            # File des cases adjacentes : au plus une entrée par case
+            files = np.zeros(nb * nb_cases, dtype=type_case)
+            en_file = np.zeros(nb * nb_cases, dtype=bool)
+            tetes = np.zeros(nb, dtype=np.intp)
+            queues = np.zeros(nb, dtype=np.intp)
+
+        nb_tirs = np.zeros(nb, dtype=np.int32)
+        actives = np.arange(nb)
+        tir = 0
+        while len(actives):
+            tir += 1
+            base = actives * nb_cases
+
+            # 1) Choix du tir : d'abord la file (IA difficile), sinon aléatoire
+            if difficile:
+                cases = np.empty(len(actives), dtype=np.intp)
+                tete = tetes[actives]
+                cible = tete < queues[actives]
+                aleatoire = ~cible
+                cases[cible] = files[base[cible] + tete[cible]]
+                tetes[actives[cible]] += 1
+                en_file[base[cible] + cases[cible]] = False
+                g = actives[aleatoire]
+            else:
+                g = actives
+            if len(g):
+                debut = g * nb_cases
+                suivant = suivants[g]
+                choix = ordres[debut + suivant]
+                if difficile:
+                    deja = tirs[debut + choix]
+                    while deja.any():
+                        suivant[deja] += 1
+                        choix[deja] = ordres[debut[deja] + suivant[deja]]
+                        deja[deja] = tirs[debut[deja] + choix[deja]]
+                    cases[aleatoire] = choix
+                else:
+                    cases = choix
+                suivants[g] = suivant + 1
+
+            # 2) Résolution du tir (Joueur.tirer_sur)
+            vises = base + cases
+            tirs[vises] = True
+            navires = grilles[vises]
+            touche = navires >= 0
+            g = actives[touche]
+            touchees = g * nb_navires + navires[touche]
+            touches[touchees] += 1
+            coule = touches[touchees] == self.tailles[navires[touche]]
+            coulees = g[coule]
+            a_flot[coulees] -= 1
+
+            # 3) IA difficile : cases adjacentes d'un tir "touche" mises en file
+            if difficile:
+                g = g[~coule]
+                (row, col) = np.divmod(cases[touche][~coule], cols)
+                for (dr, dc) in DIRECTIONS:
+                    (nr, nc) = (row + dr, col + dc)
+                    dedans = (nr >= 0) & (nr < self.rows) & (nc >= 0) & (nc < cols)
+                    (gd, voisin) = (g[dedans], (nr * cols + nc)[dedans])
+                    index = gd * nb_cases + voisin
+                    nouveau = ~(tirs[index] | en_file[index])
+                    (gd, voisin, index) = (gd[nouveau], voisin[nouveau], index[nouveau])
+                    en_file[index] = True
+                    files[gd * nb_cases + queues[gd]] = voisin
+                    queues[gd] += 1
+
+            # 4) Grilles dont toute la flotte est coulée
+            fini = coulees[a_flot[coulees] == 0]
+            if len(fini):
+                nb_tirs[fini] = tir
+                actives = actives[nb_tirs[actives] == 0]
+        return nb_tirs
+
+    def jouer_lot(self, nb):
+        """
+        Joue nb parties, l'IA 0 tirant en premier dans chacune.
+        Les deux IA ne se gênent pas : les tirs de l'une ne dépendent que
+        de la grille adverse et de ses propres résultats. Chaque IA tire
+        donc sur la grille adverse jusqu'à l'avoir coulée
+        (tirs_pour_couler) ; les tirs alternant, l'IA 0 gagne si elle y
+        parvient en autant de tirs que l'IA 1, ou moins.
+        Retourne (gagnants, tirs) : index du vainqueur de chaque partie et
+        nombre de tirs qu'il a effectués (tableaux de nb entiers).
+        """
+        grilles = [self.placer_flottes(nb).reshape(-1) for _ in (0, 1)]
+        tirs = [self.tirs_pour_couler(self.modes[j], grilles[1 - j]) for j in (0, 1)]
+        gagnants = np.where(tirs[0] <= tirs[1], 0, 1)
+        return (gagnants, np.minimum(tirs[0], tirs[1]))
+
+    def lancer(self, n):
+        """
+        Joue n parties par lots de taille_lot et cumule les statistiques.
+        """
+        debut = time.perf_counter()
+        restantes = n
+        while restantes > 0:
+            nb = min(restantes, self.taille_lot)
+            (gagnants, tirs) = self.jouer_lot(nb)
+            for j in (0, 1):
+                self.victoires[j] += int((gagnants == j).sum())
+            self.tirs_vainqueur += int(tirs.sum())
+            if self.resultats is not None:
+                self.resultats.ajouter_lot(gagnants, tirs)
+            restantes -= nb
+        self.duree += time.perf_counter() - debut
+        self.parties += n
+
+    def rapport(self):
+        """
+        Retourne un texte résumant les statistiques accumulées :
+        parties/s, taux de victoire de chaque IA, tirs moyens du vainqueur.
+        """
+        if self.parties == 0:
+            return "[INFO] Aucune partie jouée."
+        vitesse = self.parties / self.duree if self.duree > 0 else float("inf")
+        gagnees = self.parties - self.nuls
+        tirs_moyens = self.tirs_vainqueur / gagnees if gagnees else 0.0
+        lignes = [
+            f"[SIMULATION] {self.parties} parties (lots de {self.taille_lot}, {self.rows}x{self.cols}) "
+            f"en {self.duree:.2f} s "
+            f"({vitesse:.0f} parties/s, {vitesse * 3600:.0f} parties/h)",
+        ]
+        for i, mode in enumerate(self.modes):
+            taux = 100.0 * self.victoires[i] / self.parties
+            lignes.append(f"  IA {i + 1} ({mode}) : {self.victoires[i]} victoires ({taux:.1f} %)")
+        lignes.append(f"  Nuls : {self.nuls}")
+        lignes.append(f"  Tirs moyens du vainqueur : {tirs_moyens:.1f}")
+        return "\n".join(lignes)
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande (voir la documentation du module).
+    """
+    import argparse
+    from Simulation import Simulation, lire_flotte
+    from Resultats import FichierResultats
+    parser = argparse.ArgumentParser(description="Simulation Bataille Navale par lots (NumPy)")
+    parser.add_argument("-n", "--parties", type=int, default=100000, help="nombre de parties à jouer")
+    parser.add_argument("--ia1", choices=SimulationLot.MODES, default="facile", help="mode de l'IA qui tire en premier")
+    parser.add_argument("--ia2", choices=SimulationLot.MODES, default="facile", help="mode de la seconde IA")
+    parser.add_argument("--lignes", type=int, default=10, help="nombre de lignes de la grille")
+    parser.add_argument("--colonnes", type=int, default=10, help="nombre de colonnes de la grille")
+    parser.add_argument("--flotte", type=lire_flotte, default=None,
+                        help="tailles des navires séparées par des virgules (ex : 5,4,3,3,2,2)")
+    parser.add_argument("--lot", type=int, default=SimulationLot.TAILLE_LOT, help="parties avancées ensemble")
+    parser.add_argument("--graine", type=int, default=None, help="graine du générateur (lots reproductibles)")
+    parser.add_argument("--resultats", default=None, metavar="FICHIER",
+                        help="ajoute le vainqueur et les tirs de chaque partie à ce fichier (voir Resultats.py)")
+    parser.add_argument("--comparer", action="store_true",
+                        help="joue aussi des parties avec Simulation (objets et bits) et compare les débits")
+    args = parser.parse_args()
+
+    # Les lots ne connaissent pas la séquence des tirs : fichier sans séquences
+    resultats = FichierResultats(args.resultats, args.lignes, args.colonnes, args.flotte,
+                                 sequences=False) if args.resultats else None
+    simulation = SimulationLot(args.ia1, args.ia2, args.lignes, args.colonnes, args.flotte,
+                               graine=args.graine, taille_lot=args.lot, resultats=resultats)
+    simulation.lancer(args.parties)
+    if resultats is not None:
+        resultats.fermer()
+        print(f"[INFO] {resultats.nombre} parties dans {args.resultats}")
+    print(simulation.rapport())
+    if args.comparer:
+        vitesse = simulation.parties / simulation.duree
+        for backend in ("objets", "bits"):
+            # Assez de parties pour une mesure stable, sans attendre trop longtemps
+            reference = Simulation(args.ia1, args.ia2, backend, args.lignes, args.colonnes, args.flotte,
+                                   graine=args.graine)
+            reference.lancer(max(1000, args.parties // 50))
+            print(reference.rapport())
+            print(f"[BENCH] lots / {backend} : x{vitesse * reference.duree / reference.parties:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""
+Module StatistiquesPlacement
+----------------------------
+Probabilité d'occupation de chaque case par la flotte : valeur exacte
+sous la loi uniforme sur toutes les flottes légales, comparée à la loi
+empirique de Joueur.placement_aleatoire (qui place les navires l'un après
+l'autre et ne tire donc pas les flottes uniformément).
+
+Calcul exact (occupation_exacte) : programmation dynamique case par case
+(ordre row*cols+col) sur des masques de placements. Un navire est posé
+sur sa première case ; l'état avant la case i est le masque des cases
+suivantes déjà couvertes (au plus (taille max - 1) lignes plus loin) et
+le nombre de navires restants de chaque taille. Un passage avant compte
+les débuts de flottes menant à chaque état, un passage arrière les fins
+possibles depuis chaque état : la case i est vide dans
+   somme(avant[s] * arriere[état après la case i laissée vide])
+flottes. Les deux passages sont vectorisés (NumPy), quelques secondes
+pour la grille 10x10 au lieu des ~10**12 flottes d'une énumération.
+
+Loi empirique : lots de TAILLE_LOT flottes tirées par placement_aleatoire
+(graine propre à chaque lot), répartis sur un pool de processus avec le
+calcul exact. Résultats exacts et lots déjà tirés sont mis en cache dans
+un fichier JSON par grille et par flotte : une nouvelle exécution ne
+calcule que ce qui manque. Avec --tirage uniforme, les flottes sont
+tirées par Joueur.placement_uniforme, qui doit suivre la loi exacte.
+
+    python StatistiquesPlacement.py -n 1000000
+    python StatistiquesPlacement.py -n 1000000 --tirage uniforme
+    python StatistiquesPlacement.py --lignes 8 --colonnes 8 --flotte 4,3,3,2 -n 200000
+"""
+import json
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from Joueur import *
+from Aleatoire import *
+
+
+def _tailles(flotte):
+    """Retourne les tailles des navires de 'flotte' (défaut : NAVIRES_DISPONIBLES)."""
+    return [taille for (_, taille) in (Navire.NAVIRES_DISPONIBLES if flotte is None else flotte)]
+
+
+class AutomateFlottes:
+    """
+    Classe AutomateFlottes
+    ---------------------
+    Programme dynamique des flottes légales d'une grille (voir la
+    documentation du module) : un état par entier 64 bits, masque des
+    cases couvertes dans les bits bas et navires restants au-dessus.
+
+    Attributs principaux :
+    - rows, cols (int) : dimensions de la grille
+    - distinctes (list[int]) : tailles des navires, décroissantes
+    - maximums (list[int]) : nombre de navires de chaque taille
+    - depart (int) : état avant la première case (tous les navires restent)
+    - largeur (int) : nombre de bits du masque des cases couvertes
+
+    Méthodes principales :
+    - transitions(etats, i) : états atteints depuis chaque état par la case i
+    - avancer(etats, valeurs, i) : états après la case i, valeurs cumulées
+    """
+    def __init__(self, rows=10, cols=10, flotte=None):
+        tailles = _tailles(flotte)
+        self.rows = rows
+        self.cols = cols
+        self.distinctes = sorted(set(tailles), reverse=True)
+        self.maximums = [tailles.count(t) for t in self.distinctes]
+        # Navires restants : un chiffre par taille, en base (nombre + 1)
+        self.poids = [math.prod(m + 1 for m in self.maximums[:i]) for i in range(len(self.maximums))]
+        # Masque des cases couvertes, relatif à la case courante
+        self.largeur = (self.distinctes[0] - 1) * max(cols, 1) + 1
+        if self.largeur + math.prod(m + 1 for m in self.maximums).bit_length() > 62:
+            raise ValueError(f"Grille trop large pour le calcul exact : {rows}x{cols}")
+        self.depart = sum(m * p for (m, p) in zip(self.maximums, self.poids)) << self.largeur
+        self.masque_etat = (1 << self.largeur) - 1
+
+    def transitions(self, etats, i):
+        """
+        Retourne (libre, suivants) pour la case i : 'libre' indique les
+        états où elle n'est pas encore couverte ; 'suivants' commence par
+        (None, états, None) (case couverte ou laissée vide), suivi de
+        (possibles, états, (index de taille, orientation)) pour chaque
+        navire qui peut commencer sur la case.
+        """
+        (row, col) = divmod(i, self.cols)
+        couvertes = etats & self.masque_etat
+        restants = etats >> self.largeur
+        libre = (couvertes & 1) == 0
+        suivants = [(None, (restants << self.largeur) | (couvertes >> 1), None)]
+        for (index, (taille, maximum, p)) in enumerate(zip(self.distinctes, self.maximums, self.poids)):
+            disponible = libre & ((restants // p) % (maximum + 1) > 0)
+            for (orientation, dedans, masque) in (
+                    ('H', col + taille <= self.cols, (1 << taille) - 1),
+                    ('V', taille > 1 and row + taille <= self.rows,
+                     sum(1 << (k * self.cols) for k in range(taille)))):
+                if dedans:
+                    possibles = disponible & ((couvertes & masque) == 0)
+                    suivants.append((possibles, ((restants - p) << self.largeur) | ((couvertes | masque) >> 1),
+                                     (index, orientation)))
+        return (libre, suivants)
+
+    def avancer(self, etats, valeurs, i):
+        """
+        Retourne les états (triés, sans doublon) atteints après la case i
+        depuis 'etats', et pour chacun la somme des 'valeurs' des états
+        qui y mènent.
+        """
+        (_, suivants) = self.transitions(etats, i)
+        nouveaux = np.concatenate([e if possibles is None else e[possibles] for (possibles, e, _) in suivants])
+        valeurs = np.concatenate([valeurs if possibles is None else valeurs[possibles]
+                                  for (possibles, _, _) in suivants])
+        ordre = np.argsort(nouveaux, kind="stable")
+        (nouveaux, valeurs) = (nouveaux[ordre], valeurs[ordre])
+        debuts = np.flatnonzero(np.concatenate(([True], nouveaux[1:] != nouveaux[:-1])))
+        return (nouveaux[debuts], np.add.reduceat(valeurs, debuts))
+
+    def permutations(self):
+        """Nombre d'ordres des navires de même taille (navires distincts)."""
+        return math.prod(math.factorial(m) for m in self.maximums)
+
+
+def occupation_exacte(rows=10, cols=10, flotte=None):
+    """
+    Retourne (nb_flottes, comptes) : nombre de flottes légales (navires
+    distincts, même de taille égale) sur une grille rows x cols et, pour
+    chaque case row*cols+col, nombre de ces flottes qui l'occupent.
+    Les deux sont des entiers exacts.
+    """
+    automate = AutomateFlottes(rows, cols, flotte)
+    # Entiers 64 bits si aucun compte ne peut dépasser le produit des nombres
+    # de placements, entiers Python (plus lents) sinon
+    borne = math.prod(nb_placements(t, rows, cols) for t in _tailles(flotte))
+    type_compte = np.int64 if borne < (1 << 63) else object
+    nb_cases = rows * cols
+
+    # Passage avant : états (triés) et nombre de débuts de flottes avant chaque case.
+    # La grille étant symétrique par demi-tour (case i <=> case nb_cases-1-i),
+    # seule la seconde moitié des cases est calculée et gardée.
+    moitie = nb_cases // 2
+    etats = np.array([automate.depart], dtype=np.int64)
+    comptes = np.array([1], dtype=type_compte)
+    niveaux = {}
+    for i in range(nb_cases):
+        if i >= moitie:
+            niveaux[i] = (etats, comptes)
+        (etats, comptes) = automate.avancer(etats, comptes, i)
+
+    # Passage arrière : fins de flottes depuis chaque état (tous les navires posés)
+    complet = etats == 0
+    nb_flottes = int(comptes[complet].sum())
+    if not nb_flottes:
+        raise ValueError(f"Aucune flotte ne tient sur une grille {rows}x{cols}")
+    arriere = np.where(complet, 1, 0).astype(type_compte)
+    occupees = [0] * nb_cases
+    for i in range(nb_cases - 1, moitie - 1, -1):
+        (etats_i, avant) = niveaux.pop(i)
+        (libre, suivants) = automate.transitions(etats_i, i)
+        cumul = np.zeros(len(etats_i), dtype=type_compte)
+        for (possibles, e, _) in suivants:
+            if possibles is None:
+                fins = arriere[np.searchsorted(etats, e)]
+                cumul += fins
+                vides = int((avant[libre] * fins[libre]).sum())
+                occupees[i] = occupees[nb_cases - 1 - i] = nb_flottes - vides
+            else:
+                index = np.flatnonzero(possibles)
+                cumul[index] += arriere[np.searchsorted(etats, e[index])]
+        (etats, arriere) = (etats_i, cumul)
+
+    # Navires de même taille distincts : chaque flotte compte autant de fois
+    # que de façons de les permuter
+    permutations = automate.permutations()
+    return (nb_flottes * permutations, [n * permutations for n in occupees])
+
+
+def _echantillonner(tache):
+    """
+    Travail exécuté dans un processus du pool : tire 'nb' flottes par
+    Joueur.placement_aleatoire (ou placement_uniforme, selon 'methode')
+    et retourne (clé du lot, nombre de flottes occupant chaque case).
+    """
+    (cle, rows, cols, flotte, methode, graine, generateur, numero, nb) = tache
+    rng = nouveau_generateur(graine, generateur, flux=numero)
+    comptes = [0] * (rows * cols)
+    for _ in range(nb):
+        joueur = Joueur("Échantillon", rows, cols, flotte, rng)
+        joueur.initialiser_navires()
+        getattr(joueur, "placement_" + methode)()
+        for navire in joueur.navires:
+            for (row, col) in navire.positions:
+                comptes[row * cols + col] += 1
+    return (cle, comptes)
+
+
+def _calculer_exacte(tache):
+    """Travail exécuté dans un processus du pool : occupation_exacte."""
+    return ("exacte", occupation_exacte(*tache))
+
+
+class StatistiquesPlacement:
+    """
+    Classe StatistiquesPlacement
+    ---------------------------
+    Occupation des cases par la flotte : exacte (flottes uniformes) et
+    empirique (placement_aleatoire ou placement_uniforme), avec cache
+    sur disque.
+
+    Attributs principaux :
+    - rows, cols (int), flotte : grille et flotte étudiées
+    - processus (int) : taille du pool (1 : tout dans ce processus)
+    - chemin (str) : fichier JSON du cache de cette grille et de cette flotte
+    - nb_flottes (int|None) : nombre de flottes légales
+    - exacte (list[int]|None) : flottes légales occupant chaque case
+    - methode (str) : "aleatoire" ou "uniforme", placement des flottes tirées
+    - echantillons (int), empirique (list[int]) : flottes tirées et
+      nombre d'entre elles occupant chaque case
+    - duree (float), lots_calcules (int) : temps de calcul et lots tirés
+      lors de cette exécution (hors cache)
+
+    Méthodes principales :
+    - lancer(n, graine) : calcule ce qui manque (exact et n flottes tirées)
+    - rapport() : grilles de probabilités et écarts
+    """
+    TAILLE_LOT = 50000
+    DOSSIER_CACHE = "cache_placements"
+
+    def __init__(self, rows=10, cols=10, flotte=None, processus=None, dossier_cache=None):
+        self.rows = rows
+        self.cols = cols
+        self.flotte = flotte
+        self.processus = processus or os.cpu_count() or 1
+        dossier = self.DOSSIER_CACHE if dossier_cache is None else dossier_cache
+        tailles = "-".join(str(t) for t in _tailles(flotte))
+        self.chemin = os.path.join(dossier, f"placements_{rows}x{cols}_{tailles}.json")
+        self.cache = self.lire_cache()
+        self.nb_flottes = None
+        self.exacte = None
+        self.methode = "aleatoire"
+        self.echantillons = 0
+        self.empirique = [0] * (rows * cols)
+        self.duree = 0.0
+        self.lots_calcules = 0
+
+    def lire_cache(self):
+        """Lit le cache ; absent ou illisible, il est vide."""
+        if not os.path.exists(self.chemin):
+            return {"lots": {}}
+        try:
+            with open(self.chemin, encoding="utf-8") as fichier:
+                return json.load(fichier)
+        except (OSError, ValueError) as e:
+            print(f"[INFO] Cache {self.chemin} illisible : {e}")
+            return {"lots": {}}
+
+    def ecrire_cache(self):
+        """Écrit le cache (fichier temporaire puis remplacement : jamais à moitié écrit)."""
+        os.makedirs(os.path.dirname(self.chemin) or ".", exist_ok=True)
+        temporaire = self.chemin + ".tmp"
+        with open(temporaire, "w", encoding="utf-8") as fichier:
+            json.dump(self.cache, fichier)
+        os.replace(temporaire, self.chemin)
+
+    def lancer(self, n, graine=0, generateur="mt", methode="aleatoire"):
+        """
+        Obtient l'occupation exacte et celle de n flottes tirées (arrondi
+        au lot supérieur), depuis le cache ou en parallèle sur le pool.
+        Le lot k est tiré avec la graine 'graine' et le flux k : les lots
+        déjà en cache restent valables quand n augmente. 'methode' :
+        placement des flottes tirées ("aleatoire" ou "uniforme").
+        """
+        debut = time.perf_counter()
+        self.methode = methode
+        taches = []
+        if "exacte" not in self.cache:
+            taches.append((_calculer_exacte, (self.rows, self.cols, self.flotte)))
+        cles = []
+        for numero in range(-(-n // self.TAILLE_LOT)):
+            cle = f"{methode}/{generateur}/{graine}/{self.TAILLE_LOT}/{numero}"
+            cles.append(cle)
+            if cle not in self.cache["lots"]:
+                taches.append((_echantillonner, (cle, self.rows, self.cols, self.flotte, methode, graine, generateur,
+                                                 numero, self.TAILLE_LOT)))
+
+        if self.processus == 1 or len(taches) <= 1:
+            resultats = [fonction(tache) for (fonction, tache) in taches]
+        else:
+            # Calcul exact en premier : le plus long, les lots remplissent les autres cœurs
+            with multiprocessing.Pool(min(self.processus, len(taches))) as pool:
+                attentes = [pool.apply_async(fonction, (tache,)) for (fonction, tache) in taches]
+                resultats = [attente.get() for attente in attentes]
+        for (cle, valeur) in resultats:
+            if cle == "exacte":
+                (nb_flottes, comptes) = valeur
+                self.cache["exacte"] = {"flottes": nb_flottes, "comptes": comptes}
+            else:
+                self.cache["lots"][cle] = valeur
+                self.lots_calcules += 1
+        if taches:
+            self.ecrire_cache()
+
+        self.nb_flottes = self.cache["exacte"]["flottes"]
+        self.exacte = self.cache["exacte"]["comptes"]
+        self.echantillons = len(cles) * self.TAILLE_LOT
+        self.empirique = [sum(comptes) for comptes in zip(*(self.cache["lots"][cle] for cle in cles))]
+        self.duree += time.perf_counter() - debut
+
+    def grille(self, valeurs):
+        """Retourne les lignes de texte d'une grille de valeurs (en %)."""
+        return ["    " + " ".join(f"{100 * valeurs[row * self.cols + col]:6.2f}" for col in range(self.cols))
+                for row in range(self.rows)]
+
+    def rapport(self):
+        """
+        Retourne un texte présentant, en %, la probabilité exacte
+        d'occupation de chaque case, sa fréquence empirique et leur écart,
+        avec l'écart normalisé (nombre d'écarts-types) de chaque case.
+        """
+        p = [n / self.nb_flottes for n in self.exacte]
+        lignes = [
+            f"[PLACEMENTS] Grille {self.rows}x{self.cols}, flotte {_tailles(self.flotte)} : "
+            f"{self.nb_flottes} flottes légales ({self.duree:.2f} s, {self.lots_calcules} lots tirés, "
+            f"cache {self.chemin})",
+            "  Probabilité exacte d'occupation (flottes uniformes, %) :",
+        ] + self.grille(p)
+        if not self.echantillons:
+            return "\n".join(lignes)
+        n = self.echantillons
+        q = [c / n for c in self.empirique]
+        ecarts = [b - a for (a, b) in zip(p, q)]
+        z = [e / math.sqrt(a * (1 - a) / n) if 0 < a < 1 else 0.0 for (a, e) in zip(p, ecarts)]
+        pire = max(range(len(z)), key=lambda i: abs(z[i]))
+        lignes += [f"  Fréquence empirique (placement_{self.methode}, {n} flottes, %) :"] + self.grille(q)
+        lignes += ["  Écart empirique - exact (points de %) :"] + self.grille(ecarts)
+        lignes.append(f"  Écart moyen {100 * sum(abs(e) for e in ecarts) / len(ecarts):.3f} points, "
+                      f"plus grand en {divmod(pire, self.cols)} : {100 * ecarts[pire]:+.3f} points "
+                      f"({z[pire]:+.1f} écarts-types) ; somme des carrés des écarts normalisés : "
+                      f"{sum(v * v for v in z):.0f} pour {len(z)} cases")
+        return "\n".join(lignes)
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande (voir la documentation du module).
+    """
+    import argparse
+    from Simulation import lire_flotte
+    parser = argparse.ArgumentParser(description="Occupation des cases : loi exacte et placement_aleatoire")
+    parser.add_argument("-n", "--echantillons", type=int, default=1000000,
+                        help="flottes tirées par placement_aleatoire (0 : calcul exact seul)")
+    parser.add_argument("--lignes", type=int, default=10, help="nombre de lignes de la grille")
+    parser.add_argument("--colonnes", type=int, default=10, help="nombre de colonnes de la grille")
+    parser.add_argument("--flotte", type=lire_flotte, default=None,
+                        help="tailles des navires séparées par des virgules (ex : 5,4,3,3,2,2)")
+    parser.add_argument("--graine", type=int, default=0, help="graine des lots de flottes tirées")
+    parser.add_argument("--generateur", choices=sorted(GENERATEURS), default="mt")
+    parser.add_argument("--tirage", choices=["aleatoire", "uniforme"], default="aleatoire",
+                        help="placement des flottes tirées (Joueur.placement_aleatoire ou placement_uniforme)")
+    parser.add_argument("--processus", type=int, default=None, help="taille du pool (défaut : tous les cœurs)")
+    parser.add_argument("--cache", default=StatistiquesPlacement.DOSSIER_CACHE, help="dossier du cache")
+    args = parser.parse_args()
+
+    statistiques = StatistiquesPlacement(args.lignes, args.colonnes, args.flotte, args.processus, args.cache)
+    statistiques.lancer(args.echantillons, args.graine, args.generateur, args.tirage)
+    print(statistiques.rapport())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Module TirageFlottes
+--------------------
+Tirage de flottes en masse (NumPy) : N flottes d'un seul appel, rangées
+dans un tableau compact, pour préparer des simulations ou des tests.
+
+Une flotte est une ligne de numéros de placement (uint16), un par navire
+dans l'ordre de la flotte : le numéro k d'un navire de taille t désigne
+Placements.placements(t, rows, cols)[k]. N flottes de 6 navires tiennent
+en 12*N octets.
+
+Loi des flottes : uniforme parmi toutes les flottes légales, contrairement
+à Joueur.placement_aleatoire (navire par navire, voir
+StatistiquesPlacement), ou biaisée par un poids par case : une flotte a
+pour poids le produit des poids des cases qu'elle occupe.
+
+Deux méthodes :
+- "rejet" : chaque navire est tiré parmi tous ses placements sur la
+  grille vide (selon le poids de ses cases), et la flotte est rejetée
+  dès qu'un navire en chevauche un autre, pour tout le lot à la fois.
+  Rapide tant que les rejets restent rares (~28 % de flottes acceptées
+  sur la grille 10x10 avec la flotte par défaut).
+- "exacte" : tirage case par case guidé par le programme dynamique de
+  StatistiquesPlacement (poids des fins de flottes depuis chaque état),
+  sans aucun rejet quel que soit l'encombrement ; précalcul et mémoire
+  proportionnels au nombre d'états (~15 s et ~900 Mo pour la grille
+  10x10, bien moins sur les grilles encombrées où elle sert).
+Par défaut ("auto"), le rejet est abandonné pour la méthode exacte si
+moins de SEUIL_ACCEPTATION des flottes tirées sont acceptées. Avec
+"rejet" seul, tirer() lève ValueError après ESSAIS_REJET flottes tirées
+sans aucune acceptée (flotte impossible ou grille trop encombrée).
+
+    python TirageFlottes.py -n 1000000                 débit face à placement_aleatoire
+    python TirageFlottes.py -n 100000 --bord 2         flottes deux fois plus au bord
+"""
+import time
+import numpy as np
+from StatistiquesPlacement import *
+from SimulationLot import type_navires
+
+# Part minimale de flottes acceptées pour garder le rejet (méthode "auto")
+SEUIL_ACCEPTATION = 0.01
+# Flottes tirées avant de juger le taux d'acceptation
+ESSAIS_ACCEPTATION = 10000
+# Flottes tirées de suite sans acceptation avant d'abandonner le rejet
+ESSAIS_REJET = 1000000
+
+
+class TirageFlottes:
+    """
+    Classe TirageFlottes
+    -------------------
+    Générateur de flottes (voir la documentation du module).
+
+    Attributs principaux :
+    - rows, cols (int) : dimensions de la grille
+    - flotte (list[tuple[str, int]]) : (nom, taille) de chaque navire
+    - tailles (list[int]) : taille de chaque navire
+    - poids (ndarray|None) : poids de chaque case row*cols+col (None : uniforme)
+    - methode (str) : "auto", "rejet" ou "exacte"
+    - cases (dict[int, ndarray]) : pour chaque taille, les cases de chacun
+      de ses placements (placements x taille), dans l'ordre de Placements
+    - probabilites (dict[int, ndarray]|None) : loi de tirage des
+      placements de chaque taille (méthode "rejet" biaisée)
+    - rng (numpy.random.Generator) : générateur (graine fixe => mêmes flottes)
+    - candidates, acceptees (int) : flottes tirées et acceptées par le rejet
+    - automate (AutomateFlottes|None), niveaux (list|None) : programme
+      dynamique, états avant chaque case et poids de leurs fins de flottes
+      (méthode "exacte", calculés au premier tirage)
+    - facteurs (dict|None) : pour chaque (taille, orientation), poids et
+      numéro du placement commençant sur chaque case
+
+    Méthodes principales :
+    - tirer(nb) : tableau (nb, navires) de numéros de placement
+    - grilles(tirages) : index du navire occupant chaque case de chaque flotte
+    - decoder(tirage) : (row, col, orientation) de chaque navire d'une flotte
+    - placer(joueur, tirage) : place une flotte sur un Joueur ou JoueurBitboard
+    """
+    METHODES = ("auto", "rejet", "exacte")
+    # Flottes candidates tirées à la fois par le rejet (mémoire bornée)
+    TAILLE_LOT = 100000
+
+    def __init__(self, rows=10, cols=10, flotte=None, poids=None, methode="auto", graine=None):
+        if methode not in self.METHODES:
+            raise ValueError(f"Méthode inconnue : {methode}")
+        if not indexable(rows, cols):
+            raise ValueError(f"Grille trop grande pour le tirage en masse : {rows}x{cols}")
+        self.rows = rows
+        self.cols = cols
+        self.flotte = Navire.NAVIRES_DISPONIBLES if flotte is None else flotte
+        self.tailles = [taille for (_, taille) in self.flotte]
+        self.methode = methode
+        self.rng = np.random.default_rng(graine)
+        self.cases = {t: np.array([p[4] for p in placements(t, rows, cols)], dtype=np.int16).reshape(-1, t)
+                      for t in set(self.tailles)}
+        if any(len(cases) == 0 for cases in self.cases.values()):
+            raise ValueError(f"Un navire ne tient pas sur une grille {rows}x{cols}")
+        self.poids = None
+        self.probabilites = None
+        if poids is not None:
+            self.poids = np.asarray(poids, dtype=np.float64).reshape(-1)
+            if len(self.poids) != rows * cols or (self.poids < 0).any():
+                raise ValueError("Il faut un poids positif ou nul par case")
+            self.probabilites = {}
+            for (taille, cases) in self.cases.items():
+                p = self.poids[cases].prod(axis=1)
+                if not p.sum():
+                    raise ValueError(f"Aucun placement de poids non nul pour un navire de taille {taille}")
+                self.probabilites[taille] = p / p.sum()
+        self.candidates = 0
+        self.acceptees = 0
+        self.automate = None
+        self.facteurs = None
+        self.niveaux = None
+
+    def tirer(self, nb):
+        """
+        Retourne nb flottes : tableau (nb, nombre de navires) de numéros de
+        placement (uint16), ligne i = flotte i.
+        Lève ValueError si le rejet n'accepte aucune flotte en ESSAIS_REJET
+        tirages (méthode "rejet" ; "auto" passe avant à la méthode exacte).
+        """
+        tirages = np.empty((nb, len(self.tailles)), dtype=np.uint16)
+        fait = 0
+        sans_succes = 0
+        while fait < nb and self.methode != "exacte":
+            taux = self.acceptees / self.candidates if self.candidates else 1.0
+            if self.methode == "auto" and self.candidates >= ESSAIS_ACCEPTATION and taux < SEUIL_ACCEPTATION:
+                self.methode = "exacte"
+                break
+            nb_candidates = min(self.TAILLE_LOT, int((nb - fait) / max(taux, SEUIL_ACCEPTATION) * 1.1) + 16)
+            lot = self._tirer_rejet(nb_candidates)[:nb - fait]
+            sans_succes = 0 if len(lot) else sans_succes + nb_candidates
+            if sans_succes >= ESSAIS_REJET:
+                raise ValueError(f"Aucune flotte acceptée en {sans_succes} tirages : flotte impossible "
+                                 f"ou grille trop encombrée pour le rejet (méthode \"exacte\")")
+            tirages[fait:fait + len(lot)] = lot
+            fait += len(lot)
+        if fait < nb:
+            tirages[fait:] = self._tirer_exacte(nb - fait)
+        return tirages
+
+    def _tirer_rejet(self, nb):
+        """
+        Tire nb flottes candidates, chaque navire parmi tous ses placements,
+        et retourne les numéros de celles sans chevauchement. Les grands
+        navires sont tirés d'abord : la plupart des rejets tombent avant
+        de tirer les petits.
+        """
+        numeros = np.empty((nb, len(self.tailles)), dtype=np.uint16)
+        occupees = np.zeros((nb, self.rows * self.cols), dtype=bool)
+        restantes = np.arange(nb)
+        for j in sorted(range(len(self.tailles)), key=lambda j: -self.tailles[j]):
+            cases = self.cases[self.tailles[j]]
+            if self.probabilites is None:
+                tires = self.rng.integers(len(cases), size=len(restantes))
+            else:
+                tires = self.rng.choice(len(cases), size=len(restantes), p=self.probabilites[self.tailles[j]])
+            cases = cases[tires]
+            libres = ~occupees[restantes[:, None], cases].any(axis=1)
+            (restantes, tires, cases) = (restantes[libres], tires[libres], cases[libres])
+            occupees[restantes[:, None], cases] = True
+            numeros[restantes, j] = tires
+        self.candidates += nb
+        self.acceptees += len(restantes)
+        return numeros[restantes]
+
+    def _preparer_exacte(self):
+        """
+        Calcule, pour chaque case i, les états possibles avant la case et
+        le poids total des fins de flottes depuis chacun (états sans fin
+        possible retirés).
+        """
+        automate = AutomateFlottes(self.rows, self.cols, self.flotte)
+        nb_cases = self.rows * self.cols
+        etats = [np.array([automate.depart], dtype=np.int64)]
+        for i in range(nb_cases):
+            etats.append(automate.avancer(etats[-1], np.zeros(len(etats[-1]), dtype=np.int8), i)[0])
+        # Poids d'un navire posé sur la case i : produit des poids de ses cases
+        facteurs = {}
+        for (index, taille) in enumerate(automate.distinctes):
+            for (orientation, pas) in (('H', 1), ('V', self.cols)):
+                facteur = np.zeros(nb_cases)
+                numeros = np.full(nb_cases, -1, dtype=np.int32)
+                for (k, (_, row, col, ori, cases)) in enumerate(placements(taille, self.rows, self.cols)):
+                    if ori == orientation:
+                        numeros[row * self.cols + col] = k
+                        facteur[row * self.cols + col] = 1.0 if self.poids is None else self.poids[list(cases)].prod()
+                facteurs[(index, orientation)] = (facteur, numeros)
+        arriere = (etats[nb_cases] == 0).astype(np.float64)
+        niveaux = [(etats[nb_cases][arriere > 0], arriere[arriere > 0])]
+        for i in range(nb_cases - 1, -1, -1):
+            (suivants_etats, suivants_poids) = niveaux[-1]
+            cumul = np.zeros(len(etats[i]))
+            for (possibles, e, navire) in automate.transitions(etats[i], i)[1]:
+                poids = self._poids_suivants(suivants_etats, suivants_poids, e)
+                if navire is not None:
+                    poids *= possibles * facteurs[navire][0][i]
+                cumul += poids
+            niveaux.append((etats[i][cumul > 0], cumul[cumul > 0]))
+            etats[i + 1] = None
+        if not len(niveaux[-1][0]):
+            raise ValueError(f"Aucune flotte ne tient sur une grille {self.rows}x{self.cols}")
+        self.automate = automate
+        self.facteurs = facteurs
+        self.niveaux = niveaux[::-1]
+
+    @staticmethod
+    def _poids_suivants(etats, poids, e):
+        """Poids des fins de flottes depuis chaque état de 'e' (0 si absent de 'etats')."""
+        if not len(etats):
+            return np.zeros(len(e))
+        index = np.minimum(np.searchsorted(etats, e), len(etats) - 1)
+        return np.where(etats[index] == e, poids[index], 0.0)
+
+    def _tirer_exacte(self, nb):
+        """
+        Tire nb flottes case par case : à chaque case, chaque transition
+        (case laissée vide ou début d'un navire) est choisie avec une
+        probabilité proportionnelle au poids des fins de flottes qu'elle
+        permet. Les navires de même taille sont ensuite mélangés (navires
+        distincts, comme dans tirer_placement).
+        """
+        if self.niveaux is None:
+            self._preparer_exacte()
+        automate = self.automate
+        # Colonnes (navires de la flotte) de chaque taille, dans l'ordre de la flotte
+        colonnes = [np.array([j for (j, t) in enumerate(self.tailles) if t == taille])
+                    for taille in automate.distinctes]
+        tirages = np.empty((nb, len(self.tailles)), dtype=np.uint16)
+        poses = np.zeros((nb, len(colonnes)), dtype=np.intp)
+        etats = np.full(nb, automate.depart, dtype=np.int64)
+        lignes = np.arange(nb)
+        for i in range(self.rows * self.cols):
+            (suivants_etats, suivants_poids) = self.niveaux[i + 1]
+            suivants = automate.transitions(etats, i)[1]
+            poids = np.empty((len(suivants), nb))
+            for (k, (possibles, e, navire)) in enumerate(suivants):
+                poids[k] = self._poids_suivants(suivants_etats, suivants_poids, e)
+                if navire is not None:
+                    poids[k] *= possibles * self.facteurs[navire][0][i]
+            cumul = poids.cumsum(axis=0)
+            choix = (cumul < self.rng.random(nb) * cumul[-1]).sum(axis=0)
+            etats = np.stack([e for (_, e, _) in suivants])[choix, lignes]
+            for (k, (_, _, navire)) in enumerate(suivants):
+                if navire is None:
+                    continue
+                g = lignes[choix == k]
+                if len(g):
+                    (index, _) = navire
+                    tirages[g, colonnes[index][poses[g, index]]] = self.facteurs[navire][1][i]
+                    poses[g, index] += 1
+        for colonnes_taille in colonnes:
+            if len(colonnes_taille) > 1:
+                tirages[:, colonnes_taille] = self.rng.permuted(tirages[:, colonnes_taille], axis=1)
+        return tirages
+
+    def grilles(self, tirages):
+        """
+        Retourne les grilles des flottes 'tirages' : tableau
+        (nb, rows, cols), index du navire occupant chaque case, -1 si elle
+        est vide (même forme et même type que SimulationLot.placer_flottes).
+        """
+        nb = len(tirages)
+        grilles = np.full((nb, self.rows * self.cols), -1, dtype=type_navires(self.flotte))
+        lignes = np.arange(nb)[:, None]
+        for (j, taille) in enumerate(self.tailles):
+            grilles[lignes, self.cases[taille][tirages[:, j]]] = j
+        return grilles.reshape(nb, self.rows, self.cols)
+
+    def decoder(self, tirage):
+        """Retourne [(row, col, orientation)] des navires d'une flotte (ligne de tirer())."""
+        return [placements(taille, self.rows, self.cols)[int(numero)][1:4]
+                for (taille, numero) in zip(self.tailles, tirage)]
+
+    def placer(self, joueur, tirage):
+        """
+        Place la flotte 'tirage' (ligne de tirer()) sur un Joueur (navires
+        initialisés) ou un JoueurBitboard de même grille et même flotte.
+        """
+        navires = joueur.navires if isinstance(joueur, Joueur) else range(len(self.tailles))
+        for (navire, (row, col, ori)) in zip(navires, self.decoder(tirage)):
+            joueur.placer_navire(navire, row, col, ori)
+
+
+def poids_bord(rows, cols, facteur):
+    """
+    Retourne les poids d'une grille où chaque case du bord pèse 'facteur'
+    et les autres 1 (facteur > 1 : flottes plus souvent au bord).
+    """
+    return [facteur if row in (0, rows - 1) or col in (0, cols - 1) else 1.0
+            for row in range(rows) for col in range(cols)]
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande : tire n flottes et compare le débit
+    (flottes/s) à Joueur.placement_aleatoire et Joueur.placement_uniforme.
+    """
+    import argparse
+    from Simulation import lire_flotte
+    parser = argparse.ArgumentParser(description="Tirage de flottes en masse (NumPy)")
+    parser.add_argument("-n", "--flottes", type=int, default=1000000, help="nombre de flottes tirées")
+    parser.add_argument("--lignes", type=int, default=10, help="nombre de lignes de la grille")
+    parser.add_argument("--colonnes", type=int, default=10, help="nombre de colonnes de la grille")
+    parser.add_argument("--flotte", type=lire_flotte, default=None,
+                        help="tailles des navires séparées par des virgules (ex : 5,4,3,3,2,2)")
+    parser.add_argument("--methode", choices=TirageFlottes.METHODES, default="auto")
+    parser.add_argument("--bord", type=float, default=None, help="poids des cases du bord (défaut : uniforme)")
+    parser.add_argument("--graine", type=int, default=0)
+    args = parser.parse_args()
+
+    (rows, cols) = (args.lignes, args.colonnes)
+    poids = None if args.bord is None else poids_bord(rows, cols, args.bord)
+    tirage = TirageFlottes(rows, cols, args.flotte, poids, args.methode, args.graine)
+    debut = time.perf_counter()
+    tirages = tirage.tirer(args.flottes)
+    duree = time.perf_counter() - debut
+    acceptation = f", {100 * tirage.acceptees / tirage.candidates:.1f} % acceptées" if tirage.candidates else ""
+    print(f"[BENCH] TirageFlottes ({tirage.methode}{acceptation}) : {args.flottes} flottes en {duree:.2f} s "
+          f"({args.flottes / duree:.0f} flottes/s), {tirages.nbytes / args.flottes:.0f} octets/flotte")
+
+    rng = nouveau_generateur(args.graine)
+    nb = max(1000, args.flottes // 50)
+    for methode in ("placement_aleatoire", "placement_uniforme"):
+        debut = time.perf_counter()
+        for _ in range(nb):
+            joueur = Joueur("J", rows, cols, args.flotte, rng)
+            joueur.initialiser_navires()
+            getattr(joueur, methode)()
+        vitesse = nb / (time.perf_counter() - debut)
+        print(f"[BENCH] Joueur.{methode} : {vitesse:.0f} flottes/s "
+              f"(TirageFlottes x{args.flottes / duree / vitesse:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+from Instrumentation import *
+
+
+class TourIA:
+    """
+    Classe TourIA
+    ------------
+    Calcule le tir de l'ordinateur (Joueur.choisir_tir) dans un thread,
+    pour que la boucle Tk reste fluide même si l'IA réfléchit longtemps.
+
+    Le thread dépose son résultat dans une file ; la boucle Tk la consulte
+    toutes les INTERVALLE_MS (root.after) et appelle le rappel dans le
+    thread Tk : seul ce thread touche aux widgets.
+
+    Pendant le calcul, l'IA de l'ordinateur a une échéance (ia.echeance) :
+    IAMonteCarlo arrête d'échantillonner une fois le budget écoulé.
+    annuler() (ex : "Nouvelle Partie") avance cette échéance pour arrêter
+    le calcul au plus tôt, et son résultat est ignoré.
+
+    Attributs principaux :
+    - root (Tk) : fenêtre dont la boucle reçoit les résultats
+    - budget (float|None) : durée maximale de calcul d'un tir, en secondes
+    - generation (int) : numéro du calcul en cours (les résultats d'un
+      calcul annulé portent un ancien numéro)
+    - instrumentation (Instrumentation) : chronomètre la phase "decision_ia"
+
+    Méthodes principales :
+    - lancer(joueur, rappel) : calcule joueur.choisir_tir() puis appelle
+      rappel(tir) dans le thread Tk
+    - annuler() : abandonne le calcul en cours
+    - en_cours() : True si un calcul est en cours
+    """
+    INTERVALLE_MS = 16  # ~60 images/s
+
+    def __init__(self, root, budget=None, instrumentation=None):
+        self.root = root
+        self.budget = budget
+        self.instrumentation = Instrumentation() if instrumentation is None else instrumentation
+        self.generation = 0
+        self.resultats = queue.Queue()
+        self.ia = None
+        self.rappel = None
+        self.sondage = None
+
+    def en_cours(self):
+        """Retourne True si un tir est en cours de calcul."""
+        return self.rappel is not None
+
+    def lancer(self, joueur, rappel):
+        """
+        Lance le calcul du tir de 'joueur' dans un thread ; rappel(tir)
+        sera appelé dans le thread Tk (tir = (row, col) ou None).
+        """
+        if self.en_cours():
+            raise RuntimeError("Un tir de l'IA est déjà en cours de calcul")
+        self.generation += 1
+        self.rappel = rappel
+        self.ia = joueur.ia
+        if self.ia is not None and self.budget is not None:
+            self.ia.echeance = time.perf_counter() + self.budget
+        thread = threading.Thread(target=self._calculer, args=(joueur, self.generation), daemon=True)
+        thread.start()
+        self.sondage = self.root.after(self.INTERVALLE_MS, self._sonder)
+
+    def _calculer(self, joueur, generation):
+        """
+        Corps du thread : l'exception éventuelle est transmise au thread Tk.
+        """
+        try:
+            with self.instrumentation.phase("decision_ia"):
+                tir = joueur.choisir_tir()
+            self.resultats.put((generation, tir, None))
+        except Exception as e:
+            self.resultats.put((generation, None, e))
+
+    def _sonder(self):
+        """
+        Appelé par la boucle Tk : transmet le résultat s'il est prêt,
+        sinon se reprogramme.
+        """
+        self.sondage = None
+        while True:
+            try:
+                (generation, tir, erreur) = self.resultats.get_nowait()
+            except queue.Empty:
+                self.sondage = self.root.after(self.INTERVALLE_MS, self._sonder)
+                return
+            if generation == self.generation:
+                break
+
+        rappel = self.rappel
+        self._terminer()
+        if erreur is not None:
+            raise erreur
+        rappel(tir)
+
+    def _terminer(self):
+        """Remet l'échéance de l'IA à zéro et oublie le calcul en cours."""
+        if self.ia is not None:
+            self.ia.echeance = None
+        self.ia = None
+        self.rappel = None
+
+    def annuler(self):
+        """
+        Abandonne le calcul en cours : le thread est prié de s'arrêter
+        (échéance dépassée) et son résultat sera ignoré.
+        """
+        if not self.en_cours():
+            return
+        self.generation += 1
+        if self.ia is not None:
+            self.ia.echeance = 0
+        self.ia = None
+        self.rappel = None
+        if self.sondage is not None:
+            self.root.after_cancel(self.sondage)
+            self.sondage = None
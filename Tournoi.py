@@ -0,0 +1,214 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import time
+from Simulation import *
+
+
+def _nouvelles_stats():
+    """
+    Retourne un dictionnaire de statistiques vide pour une stratégie.
+    """
+    return {"parties": 0, "victoires": 0, "tirs": 0, "tirs_carres": 0, "temps": 0.0, "coups": 0}
+
+
+def _jouer_lot(tache):
+    """
+    Travail exécuté dans un processus du pool : joue les parties d'un lot
+    (même paire de stratégies, graines consécutives) et retourne les
+    statistiques brutes (victoires, tirs des vainqueurs, temps de décision).
+
+    La stratégie A commence sur les graines paires, B sur les graines impaires.
+    """
+    (strategie_a, strategie_b, graines, options) = tache
+    (backend, rows, cols, flotte, generateur) = options
+    simulations = (
+        Simulation(strategie_a, strategie_b, backend, rows, cols, flotte,
+                   chronometrer=True, generateur=generateur),
+        Simulation(strategie_b, strategie_a, backend, rows, cols, flotte,
+                   chronometrer=True, generateur=generateur),
+    )
+    stats = {"a": _nouvelles_stats(), "b": _nouvelles_stats(), "nuls": 0}
+
+    for graine in graines:
+        inverse = graine % 2
+        simulation = simulations[inverse]
+        # Générateur propre à la partie : aucun état partagé entre processus
+        gagnant = simulation.jouer_partie(graine)
+        stats["a"]["parties"] += 1
+        stats["b"]["parties"] += 1
+        if gagnant is None:
+            stats["nuls"] += 1
+            continue
+        # Index 0 de la simulation inversée = stratégie B
+        cote = "ab"[gagnant ^ inverse]
+        tirs = simulation.tirs_derniere_partie
+        stats[cote]["victoires"] += 1
+        stats[cote]["tirs"] += tirs
+        stats[cote]["tirs_carres"] += tirs * tirs
+
+    for inverse, simulation in enumerate(simulations):
+        for index in (0, 1):
+            cote = "ab"[index ^ inverse]
+            stats[cote]["temps"] += simulation.temps_ia[index]
+            stats[cote]["coups"] += simulation.coups_ia[index]
+    return (strategie_a, strategie_b, stats)
+
+
+class Tournoi:
+    """
+    Classe Tournoi
+    -------------
+    Fait s'affronter des stratégies d'IA (niveaux de Joueur.NIVEAUX :
+    "facile" = tirs aléatoires, "difficile" = cases adjacentes,
+    "expert" = densité de placements, "monte-carlo" = flottes échantillonnées)
+    deux à deux sur N parties chacune,
+    en répartissant les parties sur un pool de processus.
+
+    Les parties sont reproductibles : la partie i d'une confrontation est
+    jouée avec la graine (graine + i), les mêmes graines servant à toutes
+    les confrontations. Le premier joueur alterne d'une partie à l'autre.
+    Chaque partie a son propre générateur (voir Aleatoire.py) : le résultat
+    ne dépend ni du nombre de processus ni du découpage en lots.
+
+    Attributs principaux :
+    - strategies (list[str]) : stratégies engagées
+    - parties (int) : nombre de parties par confrontation
+    - graine (int) : graine de la première partie
+    - processus (int) : nombre de processus du pool (1 => sans pool)
+    - generateur (str) : générateur aléatoire des parties ("mt" ou "splitmix")
+    - stats (dict[str, dict]) : statistiques cumulées par stratégie
+    - confrontations (dict[tuple[str, str], list[int]]) : victoires de A,
+      victoires de B et nuls pour chaque paire (A, B)
+    - duree (float) : durée totale du tournoi (secondes)
+    """
+    # Nombre de lots par processus : assez pour équilibrer la charge,
+    # assez peu pour amortir l'envoi des tâches
+    LOTS_PAR_PROCESSUS = 8
+
+    def __init__(self, strategies, parties=1000, graine=0, processus=None,
+                 backend="objets", rows=10, cols=10, flotte=None, generateur="mt"):
+        for strategie in strategies:
+            if strategie not in Simulation.MODES:
+                raise ValueError(f"Stratégie inconnue : {strategie}")
+        self.strategies = list(strategies)
+        self.parties = parties
+        self.graine = graine
+        self.processus = processus or os.cpu_count() or 1
+        self.generateur = generateur
+        self.options = (backend, rows, cols, flotte, generateur)
+        self.stats = {s: _nouvelles_stats() for s in self.strategies}
+        self.confrontations = {}
+        self.duree = 0.0
+
+    def paires(self):
+        """
+        Retourne la liste des confrontations (A, B) à jouer : toutes les
+        paires distinctes, ou un match miroir s'il n'y a qu'une stratégie.
+        """
+        if len(self.strategies) == 1:
+            return [(self.strategies[0], self.strategies[0])]
+        return list(itertools.combinations(self.strategies, 2))
+
+    def taches(self):
+        """
+        Découpe chaque confrontation en lots de graines consécutives.
+        """
+        taille_lot = max(1, self.parties // (self.processus * self.LOTS_PAR_PROCESSUS))
+        taches = []
+        for (a, b) in self.paires():
+            for debut in range(0, self.parties, taille_lot):
+                fin = min(debut + taille_lot, self.parties)
+                graines = range(self.graine + debut, self.graine + fin)
+                taches.append((a, b, graines, self.options))
+        return taches
+
+    def cumuler(self, resultat):
+        """
+        Ajoute le résultat d'un lot aux statistiques du tournoi.
+        """
+        (a, b, stats) = resultat
+        for strategie, cote in ((a, "a"), (b, "b")):
+            for cle, valeur in stats[cote].items():
+                self.stats[strategie][cle] += valeur
+        confrontation = self.confrontations.setdefault((a, b), [0, 0, 0])
+        confrontation[0] += stats["a"]["victoires"]
+        confrontation[1] += stats["b"]["victoires"]
+        confrontation[2] += stats["nuls"]
+
+    def lancer(self):
+        """
+        Joue toutes les confrontations (en parallèle si processus > 1).
+        """
+        debut = time.perf_counter()
+        taches = self.taches()
+        if self.processus == 1:
+            for tache in taches:
+                self.cumuler(_jouer_lot(tache))
+        else:
+            with multiprocessing.Pool(self.processus) as pool:
+                for resultat in pool.imap_unordered(_jouer_lot, taches):
+                    self.cumuler(resultat)
+        self.duree += time.perf_counter() - debut
+
+    def rapport(self):
+        """
+        Retourne un texte résumant le tournoi : par stratégie, le taux de
+        victoire, la moyenne et la variance des tirs pour gagner et le
+        temps de décision moyen ; puis le bilan de chaque confrontation.
+        """
+        total = self.parties * len(self.paires())
+        vitesse = total / self.duree if self.duree > 0 else float("inf")
+        lignes = [
+            f"[TOURNOI] {total} parties en {self.duree:.2f} s sur {self.processus} processus "
+            f"({vitesse:.0f} parties/s)",
+            f"  {'stratégie':<10} {'parties':>8} {'victoires':>10} {'tirs moyens':>12} "
+            f"{'variance':>10} {'µs/coup':>9}",
+        ]
+        for strategie in self.strategies:
+            st = self.stats[strategie]
+            v = st["victoires"]
+            moyenne = st["tirs"] / v if v else 0.0
+            variance = st["tirs_carres"] / v - moyenne * moyenne if v else 0.0
+            taux = 100.0 * v / st["parties"] if st["parties"] else 0.0
+            temps = 1e6 * st["temps"] / st["coups"] if st["coups"] else 0.0
+            lignes.append(
+                f"  {strategie:<10} {st['parties']:>8} {taux:>9.1f}% {moyenne:>12.1f} "
+                f"{variance:>10.1f} {temps:>9.1f}"
+            )
+        lignes.append("  Confrontations :")
+        for (a, b), (va, vb, nuls) in self.confrontations.items():
+            lignes.append(f"    {a} - {b} : {va} / {vb} (nuls : {nuls})")
+        return "\n".join(lignes)
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande :
+        python Tournoi.py -n 10000 --strategies facile difficile expert
+    """
+    parser = argparse.ArgumentParser(description="Tournoi entre stratégies d'IA (multi-processus)")
+    parser.add_argument("-n", "--parties", type=int, default=1000, help="nombre de parties par confrontation")
+    parser.add_argument("--strategies", nargs="+", choices=Simulation.MODES,
+                        default=list(Simulation.MODES), help="stratégies engagées")
+    parser.add_argument("--graine", type=int, default=0, help="graine de la première partie")
+    parser.add_argument("--processus", type=int, default=None, help="taille du pool (défaut : tous les cœurs)")
+    parser.add_argument("--backend", choices=sorted(Simulation.BACKENDS), default="objets",
+                        help="représentation des grilles")
+    parser.add_argument("--lignes", type=int, default=10, help="nombre de lignes de la grille")
+    parser.add_argument("--colonnes", type=int, default=10, help="nombre de colonnes de la grille")
+    parser.add_argument("--flotte", type=lire_flotte, default=None,
+                        help="tailles des navires séparées par des virgules (ex : 5,4,3,3,2,2)")
+    parser.add_argument("--generateur", choices=sorted(GENERATEURS), default="mt",
+                        help="générateur aléatoire : mt (Mersenne Twister) ou splitmix (à compteur)")
+    args = parser.parse_args()
+
+    tournoi = Tournoi(args.strategies, args.parties, args.graine, args.processus,
+                      args.backend, args.lignes, args.colonnes, args.flotte, args.generateur)
+    tournoi.lancer()
+    print(tournoi.rapport())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,494 @@
+"""
+Module benchmark
+----------------
+Mesures de performance du moteur de jeu.
+
+    python benchmark.py                  suite complète, comparée à la référence
+    python benchmark.py --enregistrer    enregistre les résultats comme référence
+    python benchmark.py --filtre tirer   seulement les mesures dont le nom contient "tirer"
+    python benchmark.py --backends       comparaison des backends objets / bits
+    python benchmark.py --demarrage      temps de démarrage (import, première image)
+
+Chaque mesure de la suite exécute une opération par lots (préparation des
+données hors chronomètre) et rapporte les opérations par seconde, les
+centiles de latence par opération (calculés sur les lots) et les
+allocations (tracemalloc, sur un lot supplémentaire) : octets conservés
+par opération et pic d'un lot. Les données sont tirées avec une graine
+fixe : deux exécutions mesurent exactement le même travail.
+
+Les résultats sont comparés au fichier de référence (FICHIER_REFERENCE) :
+une latence médiane ou des allocations qui dépassent la référence de plus
+de --tolerance sont signalées comme régressions (code de sortie 1).
+Les mesures de Plateau demandent un affichage (ex : xvfb-run python
+benchmark.py) et sont ignorées sans affichage.
+
+--demarrage lance des interpréteurs neufs et mesure le temps d'import
+du moteur et de main.py, et le temps jusqu'à la première image de la
+fenêtre (main.py --premiere-image, avec affichage). Les modules du
+moteur ne doivent pas importer tkinter : c'est vérifié au passage.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from Joueur import *
+from JoueurBitboard import *
+from Simulation import *
+from Sauvegarde import *
+from Aleatoire import *
+from Instrumentation import centile
+
+# Résultats de référence, pour détecter les régressions
+FICHIER_REFERENCE = "benchmark_reference.json"
+# Noms des mesures de Plateau (décider sans créer de fenêtre si --filtre les exclut)
+MESURES_PLATEAU = ("plateau.tir_affiche", "plateau.redraw_all_cells", "plateau.previsualisation")
+# Mesures du démarrage : arguments d'un nouvel interpréteur Python. Le moteur
+# (sans affichage) sort en erreur s'il a importé tkinter.
+COMMANDES_DEMARRAGE = (
+    ("interpreteur", ["-c", "pass"]),
+    ("import.moteur", ["-c", "import sys, Simulation, Sauvegarde, Salle, Tournoi; "
+                             "sys.exit('tkinter' in sys.modules)"]),
+    ("import.main", ["-c", "import main"]),
+    ("premiere_image", ["main.py", "--premiere-image", "--graine", "0"]),
+)
+
+
+def creer_etat(backend, nb_tirs, rng=random):
+    """
+    Crée un état de partie (tireur + cible placée) pour le backend donné,
+    après 'nb_tirs' tirs aléatoires du tireur sur la cible.
+    """
+    classe = Simulation.BACKENDS[backend]
+    tireur = classe("Tireur", rng=rng)
+    cible = classe("Cible", rng=rng)
+    if backend == "objets":
+        tireur.initialiser_navires()
+        cible.initialiser_navires()
+    cible.placement_aleatoire()
+    cases = [(r, c) for r in range(10) for c in range(10)]
+    rng.shuffle(cases)
+    for (r, c) in cases[:nb_tirs]:
+        tireur.tirer_sur(cible, r, c)
+    return (tireur, cible)
+
+
+def mesurer_memoire(backend, rng, nb_etats=2000, nb_tirs=50):
+    """
+    Retourne le nombre moyen d'octets alloués par état de partie
+    (mesuré avec tracemalloc).
+    """
+    tracemalloc.start()
+    avant = tracemalloc.take_snapshot()
+    etats = [creer_etat(backend, nb_tirs, rng) for _ in range(nb_etats)]
+    apres = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in apres.compare_to(avant, "filename"))
+    del etats
+    return total / nb_etats
+
+
+def mesurer_tirs(backend, rng, nb_grilles=2000):
+    """
+    Tire sur les 100 cases de 'nb_grilles' grilles placées et retourne
+    le temps moyen d'un appel à tirer_sur (en microsecondes).
+    """
+    cases = [(r, c) for r in range(10) for c in range(10)]
+    duree = 0.0
+    for _ in range(nb_grilles):
+        (tireur, cible) = creer_etat(backend, 0, rng)
+        rng.shuffle(cases)
+        debut = time.perf_counter()
+        for (r, c) in cases:
+            tireur.tirer_sur(cible, r, c)
+        duree += time.perf_counter() - debut
+    return duree / (nb_grilles * len(cases)) * 1e6
+
+
+def mesurer_parties(backend, nb_parties=1000, graine=0, generateur="mt"):
+    """
+    Retourne le nombre de parties IA contre IA (difficile contre facile)
+    jouées par seconde (parties i = graine + i, donc reproductibles).
+    """
+    simulation = Simulation("difficile", "facile", backend, graine=graine, generateur=generateur)
+    simulation.lancer(nb_parties)
+    return simulation.parties / simulation.duree
+
+
+def mesurer_sauvegarde(rng, nb_parties=2000, nb_tirs=40):
+    """
+    Encode puis décode 'nb_parties' parties en cours (Sauvegarde) et
+    retourne (octets par partie, µs par encodage, µs par décodage).
+    Vérifie au passage que chaque aller-retour redonne le même instantané.
+    """
+    parties = []
+    for _ in range(nb_parties):
+        (joueur, ordinateur) = creer_etat("objets", 0, rng)
+        joueur.placement_aleatoire()
+        for _ in range(nb_tirs):
+            (r, c) = joueur.choisir_tir()
+            joueur.tirer_sur(ordinateur, r, c)
+            (r, c) = ordinateur.choisir_tir()
+            ordinateur.tirer_sur(joueur, r, c)
+        parties.append((joueur, ordinateur))
+
+    debut = time.perf_counter()
+    instantanes = [encoder_partie(j, o) for (j, o) in parties]
+    duree_encodage = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    decodees = [decoder_partie(d) for d in instantanes]
+    duree_decodage = time.perf_counter() - debut
+
+    for donnees, (j, o, phase, temps) in zip(instantanes, decodees):
+        if encoder_partie(j, o, phase, temps) != donnees:
+            raise AssertionError("Aller-retour de sauvegarde incohérent")
+    octets = sum(len(d) for d in instantanes) / nb_parties
+    return (octets, duree_encodage / nb_parties * 1e6, duree_decodage / nb_parties * 1e6)
+
+
+def mesurer(preparer, operation, nb_lots, taille_lot):
+    """
+    Chronomètre 'operation' sur nb_lots lots de taille_lot appels :
+    preparer(taille_lot) fournit (hors chronomètre) la liste des arguments
+    d'un lot, et operation(argument) est appelée pour chacun.
+    Retourne un dict : ops_s (opérations par seconde), p50, p95, p99
+    (latence par opération en µs), octets (octets conservés par opération)
+    et pic (pic d'allocation pendant un lot, en octets).
+    """
+    gc.collect()
+    latences = []
+    total = 0.0
+    for _ in range(nb_lots):
+        arguments = preparer(taille_lot)
+        debut = time.perf_counter()
+        for argument in arguments:
+            operation(argument)
+        duree = time.perf_counter() - debut
+        total += duree
+        latences.append(duree / taille_lot * 1e6)
+    latences.sort()
+
+    # Allocations : un lot de plus sous tracemalloc, qui ralentit l'exécution
+    arguments = preparer(taille_lot)
+    tracemalloc.start()
+    avant = tracemalloc.get_traced_memory()[0]
+    for argument in arguments:
+        operation(argument)
+    (apres, pic) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ops_s": nb_lots * taille_lot / total if total > 0 else float("inf"),
+        "p50": centile(latences, 50),
+        "p95": centile(latences, 95),
+        "p99": centile(latences, 99),
+        "octets": (apres - avant) / taille_lot,
+        "pic": pic - avant,
+    }
+
+
+def suite_moteur(graine, generateur):
+    """
+    Retourne les mesures du moteur (sans affichage) : liste de
+    (nom, fonction qui crée (preparer, operation), nb_lots, taille_lot).
+    Chaque mesure a son propre flux aléatoire : filtrer la suite ne change
+    pas les données des autres mesures.
+    """
+    def placement_aleatoire(rng):
+        def preparer(n):
+            joueurs = [Joueur("J", rng=rng) for _ in range(n)]
+            for j in joueurs:
+                j.initialiser_navires()
+            return joueurs
+        return (preparer, Joueur.placement_aleatoire)
+
+    def placement_uniforme(rng):
+        (preparer, _) = placement_aleatoire(rng)
+        return (preparer, Joueur.placement_uniforme)
+
+    def peut_placer_navire(rng):
+        (joueur, _) = creer_etat("objets", 0, rng)
+        joueur.placement_aleatoire()
+
+        def preparer(n):
+            return [(rng.choice(joueur.navires), rng.randrange(10), rng.randrange(10), rng.choice("HV"))
+                    for _ in range(n)]
+        return (preparer, lambda a: joueur.peut_placer_navire(*a))
+
+    def tirer_sur(backend):
+        def creer(rng):
+            cases = [(r, c) for r in range(10) for c in range(10)]
+
+            def preparer(n):
+                # Une grille neuve par tranche de 100 tirs (toutes les cases)
+                arguments = []
+                while len(arguments) < n:
+                    (tireur, cible) = creer_etat(backend, 0, rng)
+                    rng.shuffle(cases)
+                    arguments.extend((tireur, cible, r, c) for (r, c) in cases)
+                return arguments[:n]
+            return (preparer, lambda a: a[0].tirer_sur(a[1], a[2], a[3]))
+        return creer
+
+    def tous_navires_coules(rng):
+        def preparer(n):
+            return [creer_etat("objets", 50, rng)[1] for _ in range(n)]
+        return (preparer, Joueur.tous_navires_coules)
+
+    def partie(mode1, mode2, backend):
+        def creer(rng):
+            simulation = Simulation(mode1, mode2, backend, generateur=generateur)
+
+            def preparer(n):
+                return [rng.randrange(1 << 32) for _ in range(n)]
+            return (preparer, simulation.jouer_partie)
+        return creer
+
+    mesures = [
+        ("placement_aleatoire", placement_aleatoire, 100, 50),
+        ("peut_placer_navire", peut_placer_navire, 200, 500),
+        ("tirer_sur", tirer_sur("objets"), 200, 100),
+        ("bits.tirer_sur", tirer_sur("bits"), 200, 100),
+        ("tous_navires_coules", tous_navires_coules, 200, 100),
+        ("partie.difficile_facile", partie("difficile", "facile", "objets"), 40, 10),
+        ("bits.partie.difficile_facile", partie("difficile", "facile", "bits"), 40, 10),
+        ("partie.expert_difficile", partie("expert", "difficile", "objets"), 10, 2),
+        # En fin de liste : les flux aléatoires des mesures précédentes ne changent pas
+        ("placement_uniforme", placement_uniforme, 100, 50),
+    ]
+    return [(nom, (lambda creer=creer, i=i: creer(nouveau_generateur(graine, generateur, i))),
+             nb_lots, taille_lot)
+            for i, (nom, creer, nb_lots, taille_lot) in enumerate(mesures)]
+
+
+def suite_plateau(graine, generateur):
+    """
+    Retourne les mesures de redessin de Plateau (même forme que
+    suite_moteur), ou une liste vide si Tk n'a pas d'affichage.
+    """
+    from tkinter import Tk, TclError
+    from Plateau import Plateau
+    try:
+        root = Tk()
+    except TclError:
+        print("[BENCH] Mesures de Plateau ignorées : pas d'affichage (utiliser xvfb-run)")
+        return []
+    plateau = Plateau(root)
+    plateau.canvas.pack()
+    root.update()
+    couleurs = ("blue", "red", "black", "gray", "white")
+
+    def tir_affiche(rng):
+        # Une case recolorée puis affichée (flush programmé par color_cell)
+        def preparer(n):
+            return [(rng.randrange(10), rng.randrange(10), rng.choice(couleurs)) for _ in range(n)]
+
+        def operation(a):
+            plateau.color_cell(*a)
+            root.update_idletasks()
+        return (preparer, operation)
+
+    def redraw_all_cells(rng):
+        def preparer(n):
+            for r in range(10):
+                for c in range(10):
+                    plateau.grid_color[r][c] = rng.choice(couleurs)
+            return [None] * n
+
+        def operation(_):
+            plateau.redraw_all_cells()
+            root.update_idletasks()
+        return (preparer, operation)
+
+    def previsualisation(rng):
+        # Prévisualisation d'un navire de 5 cases à une position aléatoire
+        def preparer(n):
+            return [(rng.randrange(10), rng.randrange(6)) for _ in range(n)]
+
+        def operation(a):
+            plateau.clear_preview()
+            for c in range(a[1], a[1] + 5):
+                plateau.color_preview_cell(a[0], c, "green")
+            root.update_idletasks()
+        return (preparer, operation)
+
+    mesures = zip(MESURES_PLATEAU, (tir_affiche, redraw_all_cells, previsualisation), (100, 50, 100), (100, 10, 50))
+    return [(nom, (lambda creer=creer, i=i: creer(nouveau_generateur(graine, generateur, 100 + i))),
+             nb_lots, taille_lot)
+            for i, (nom, creer, nb_lots, taille_lot) in enumerate(mesures)]
+
+
+def lancer_suite(args):
+    """
+    Exécute la suite (filtrée), affiche les résultats comparés à la
+    référence et enregistre la référence si demandé.
+    Retourne le nombre de régressions détectées.
+    """
+    mesures = suite_moteur(args.seed, args.generateur)
+    if args.filtre is None or any(args.filtre in nom for nom in MESURES_PLATEAU):
+        mesures += suite_plateau(args.seed, args.generateur)
+    if args.filtre is not None:
+        mesures = [m for m in mesures if args.filtre in m[0]]
+
+    try:
+        with open(args.reference, encoding="utf-8") as fichier:
+            reference = json.load(fichier)["resultats"]
+    except (OSError, ValueError, KeyError):
+        reference = {}
+
+    print(f"{'mesure':<30} {'ops/s':>10} {'p50 µs':>9} {'p95 µs':>9} {'p99 µs':>9} "
+          f"{'octets/op':>10} {'pic':>9} {'réf p50':>9} {'écart':>7}")
+    resultats = {}
+    regressions = []
+    for (nom, creer, nb_lots, taille_lot) in mesures:
+        if args.rapide:
+            nb_lots = max(3, nb_lots // 5)
+        (preparer, operation) = creer()
+        r = mesurer(preparer, operation, nb_lots, taille_lot)
+        resultats[nom] = {cle: round(valeur, 3) for cle, valeur in r.items()}
+        ref = reference.get(nom)
+        (p50_ref, ecart) = (float("nan"), "")
+        if ref:
+            p50_ref = ref["p50"]
+            variation = r["p50"] / p50_ref - 1
+            ecart = f"{100 * variation:+.0f}%"
+            if variation > args.tolerance:
+                regressions.append(f"{nom} : latence médiane {p50_ref:.2f} -> {r['p50']:.2f} µs")
+            # Quelques octets d'écart ne sont pas significatifs ; en mode rapide,
+            # les caches (CacheTirs) sont moins remplis : allocations non comparables
+            if not args.rapide and r["octets"] > ref["octets"] * (1 + args.tolerance) + 16:
+                regressions.append(f"{nom} : allocations {ref['octets']:.0f} -> {r['octets']:.0f} octets/op")
+        print(f"{nom:<30} {r['ops_s']:>10.0f} {r['p50']:>9.2f} {r['p95']:>9.2f} {r['p99']:>9.2f} "
+              f"{r['octets']:>10.0f} {r['pic']:>9.0f} {p50_ref:>9.2f} {ecart:>7}")
+
+    for regression in regressions:
+        print(f"[BENCH] RÉGRESSION {regression}")
+    if not reference:
+        print(f"[BENCH] Pas de référence dans {args.reference} (la créer avec --enregistrer)")
+    elif not regressions:
+        print(f"[BENCH] Aucune régression (tolérance {100 * args.tolerance:.0f} %)")
+
+    if args.enregistrer:
+        # Les mesures de référence non relancées (filtre, pas d'affichage) sont conservées
+        reference.update(resultats)
+        with open(args.reference, "w", encoding="utf-8") as fichier:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "graine": args.seed,
+                "generateur": args.generateur,
+                "resultats": reference,
+            }, fichier, indent=1, sort_keys=True)
+            fichier.write("\n")
+        print(f"[BENCH] Référence enregistrée dans {args.reference}")
+    return len(regressions)
+
+
+def comparer_backends(args):
+    """
+    Compare les backends "objets" (Joueur) et "bits" (JoueurBitboard) :
+    mémoire par état, coût de tirer_sur, parties par seconde, sauvegarde.
+    """
+    resultats = {}
+    for backend in ("objets", "bits"):
+        # Même graine pour les deux backends : mêmes grilles, mêmes parties
+        rng = nouveau_generateur(args.seed, args.generateur)
+        resultats[backend] = (
+            mesurer_memoire(backend, rng),
+            mesurer_tirs(backend, rng),
+            mesurer_parties(backend, args.parties, args.seed, args.generateur),
+        )
+
+    print(f"{'backend':<8} {'octets/état':>12} {'µs/tir':>8} {'parties/s':>10}")
+    for backend, (memoire, tir, parties) in resultats.items():
+        print(f"{backend:<8} {memoire:>12.0f} {tir:>8.3f} {parties:>10.0f}")
+
+    (mem_o, tir_o, par_o) = resultats["objets"]
+    (mem_b, tir_b, par_b) = resultats["bits"]
+    print(f"[BENCH] mémoire /{mem_o / mem_b:.1f}, tirer_sur x{tir_o / tir_b:.2f}, parties x{par_b / par_o:.2f}")
+
+    (octets, encodage, decodage) = mesurer_sauvegarde(nouveau_generateur(args.seed, args.generateur))
+    print(f"[BENCH] sauvegarde : {octets:.0f} octets/partie, "
+          f"encodage {encodage:.1f} µs, décodage {decodage:.1f} µs")
+
+
+def mesurer_demarrage(nb_essais):
+    """
+    Lance nb_essais fois chaque commande de COMMANDES_DEMARRAGE (dans le
+    dossier du module, pour y trouver les modules du jeu) et retourne
+    {nom: durées triées en ms}, ou {nom: None} si la commande échoue.
+    """
+    dossier = os.path.dirname(os.path.abspath(__file__))
+    resultats = {}
+    for (nom, arguments) in COMMANDES_DEMARRAGE:
+        durees = []
+        for _ in range(nb_essais):
+            debut = time.perf_counter()
+            code = subprocess.call([sys.executable] + arguments, cwd=dossier,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if code != 0:
+                durees = None
+                break
+            durees.append(1000 * (time.perf_counter() - debut))
+        resultats[nom] = None if durees is None else sorted(durees)
+    return resultats
+
+
+def afficher_demarrage(args):
+    """
+    Affiche les temps de démarrage (médiane, minimum) et leur part propre
+    au jeu, hors démarrage de l'interpréteur.
+    Retourne le nombre de problèmes (moteur qui importe tkinter).
+    """
+    resultats = mesurer_demarrage(3 if args.rapide else args.essais)
+    base = resultats["interpreteur"]
+    print(f"{'mesure':<16} {'p50 ms':>8} {'min ms':>8} {'jeu ms':>8}")
+    for nom, durees in resultats.items():
+        if durees is None:
+            continue
+        jeu = centile(durees, 50) - centile(base, 50) if nom != "interpreteur" else 0.0
+        print(f"{nom:<16} {centile(durees, 50):>8.1f} {durees[0]:>8.1f} {jeu:>8.1f}")
+    if resultats["premiere_image"] is None:
+        print("[BENCH] Première image ignorée : pas d'affichage (utiliser xvfb-run)")
+    if resultats["import.moteur"] is None:
+        print("[BENCH] ÉCHEC : les modules du moteur importent tkinter (ou ne s'importent pas)")
+        return 1
+    return 0
+
+
+def main():
+    """
+    Point d'entrée en ligne de commande (voir la documentation du module).
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks du moteur de Bataille Navale")
+    parser.add_argument("--seed", type=int, default=0, help="graine du générateur aléatoire")
+    parser.add_argument("--generateur", choices=sorted(GENERATEURS), default="mt",
+                        help="générateur aléatoire des données et des parties")
+    parser.add_argument("--reference", default=FICHIER_REFERENCE, help="fichier des résultats de référence")
+    parser.add_argument("--enregistrer", action="store_true", help="enregistre les résultats comme référence")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="écart relatif toléré avant de signaler une régression (0.25 = 25 %%)")
+    parser.add_argument("--filtre", default=None, help="ne lance que les mesures dont le nom contient ce texte")
+    parser.add_argument("--rapide", action="store_true", help="5 fois moins de lots (moins précis, allocations non comparées)")
+    parser.add_argument("--backends", action="store_true", help="compare les backends objets / bits")
+    parser.add_argument("--parties", type=int, default=1000, help="parties simulées par backend (--backends)")
+    parser.add_argument("--demarrage", action="store_true", help="mesure le temps de démarrage")
+    parser.add_argument("--essais", type=int, default=20, help="lancements par mesure (--demarrage)")
+    args = parser.parse_args()
+
+    if args.backends:
+        comparer_backends(args)
+        return
+    if args.demarrage:
+        sys.exit(1 if afficher_demarrage(args) else 0)
+    if lancer_suite(args):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
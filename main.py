@@ -1,9 +1,26 @@
 from tkinter import *
-import random
+import gc
+import os
+import sys
 import time
+from types import SimpleNamespace
 from Joueur import *
 from Plateau import *
+from Sauvegarde import *
+from Journal import *
+from Aleatoire import *
+from TourIA import *
+from Instrumentation import *
 
+# Fichier utilisé par les boutons "Sauvegarder" / "Charger"
+FICHIER_SAUVEGARDE = "partie.bn"
+# Journal des parties jouées (ajout seul, relecture : python Journal.py parties.journal)
+FICHIER_JOURNAL = "parties.journal"
+# Durée maximale de réflexion de l'ordinateur par tir, en secondes
+BUDGET_IA = 0.5
+# Mode endurance : tirs du joueur par partie, parties entre deux mesures
+TIRS_ENDURANCE = 10
+MESURE_ENDURANCE = 100
 
 
 
@@ -11,25 +28,84 @@ from Plateau import *
 
 
 
-def main():
+
+def memoire_residente():
+    """
+    Retourne la mémoire résidente du processus en Ko (Linux : /proc ;
+    ailleurs, le pic via resource), ou None si elle n'est pas mesurable.
     """
-    Fonction main() : Point d'entrée de l'application Bataille Navale.
-    Configure la fenêtre Tk, instancie les plateaux, gère l'interface,
-    les événements de souris, le bouton "Valider", etc.
+    try:
+        with open("/proc/self/statm") as fichier:
+            return int(fichier.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def creer_joueurs(rows, cols, flotte, sauvegarde, rng):
+    """
+    Crée le joueur humain et l'ordinateur (navires de l'ordinateur placés),
+    ou les reprend de 'sauvegarde' (grille et flotte de l'instantané).
+    Retourne (joueur, ordinateur, phase, temps écoulé).
+    """
+    if sauvegarde is not None:
+        return decoder_partie(sauvegarde, Joueur, flotte, rng)
+    joueur = Joueur("Humain", rows, cols, flotte, rng)
+    joueur.initialiser_navires()
+
+    ordinateur = Joueur("Ordinateur", rows, cols, flotte, rng)
+    ordinateur.initialiser_navires()
+    ordinateur.placement_aleatoire()
+    return (joueur, ordinateur, "placement", 0)
+
+
+def fenetre_jeu(rows=10, cols=10, flotte=None, sauvegarde=None, graine=None, budget_ia=BUDGET_IA,
+                endurance=None, mesures=None, premiere_image=False, instrumentation=None):
+    """
+    Fenêtre de jeu : configure la fenêtre Tk, instancie les plateaux, gère
+    l'interface, les événements de souris, le bouton "Valider", etc.
+    La taille des grilles (rows x cols) et la flotte (liste de (nom, taille),
+    par défaut Navire.NAVIRES_DISPONIBLES) sont paramétrables.
+    Si 'sauvegarde' (instantané binaire, voir Sauvegarde.py) est fourni,
+    la partie reprend dans l'état sauvegardé.
+    'graine' fixe le générateur aléatoire de la partie (placement et tirs
+    de l'ordinateur), pour rejouer une partie à l'identique.
+    Le tir de l'ordinateur est calculé hors de la boucle Tk (voir TourIA),
+    en au plus 'budget_ia' secondes (None : sans limite).
+    "Nouvelle Partie" et "Charger" réutilisent la fenêtre (reinitialiser).
+    Retourne l'instantané à reprendre dans une nouvelle fenêtre (sauvegarde
+    d'une autre taille de grille), sinon None.
+    Si 'endurance' est fourni, joue automatiquement ce nombre de parties
+    et ajoute les mesures de mémoire à la liste 'mesures' (voir endurance).
+    Si 'premiere_image' est vrai, la fenêtre se ferme dès qu'elle est
+    affichée (mesure du démarrage, voir benchmark.py --demarrage).
+    'instrumentation' (voir Instrumentation.py) chronomètre les phases de
+    chaque tour : tir du joueur, décision de l'IA, journal, messages,
+    affichage des plateaux, statistiques.
     """
 
     root = Tk()
     root.title("Bataille Navale")
 
+    # Journal de la partie : placements, tirs, résultats et temps
+    journal = Journal(os.devnull if endurance or premiere_image else FICHIER_JOURNAL)
+    # Chronométrage des phases d'un tour (désactivé par défaut)
+    instrumentation = Instrumentation() if instrumentation is None else instrumentation
+    # Calcul des tirs de l'ordinateur dans un thread
+    tour_ia = TourIA(root, budget_ia, instrumentation)
+
     # ---------------------------------------------------------------------------------
     # 1) Création des joueurs (Humain, Ordinateur) et de leurs plateaux respectifs
     # ---------------------------------------------------------------------------------
-    joueur = Joueur("Humain")
-    joueur.initialiser_navires()
-
-    ordinateur = Joueur("Ordinateur")
-    ordinateur.initialiser_navires()
-    ordinateur.placement_aleatoire()
+    # Générateur propre à la partie (placement et tirs de l'ordinateur)
+    rng = nouveau_generateur(graine)
+    (joueur, ordinateur, phase_initiale, temps_ecoule) = creer_joueurs(rows, cols, flotte, sauvegarde, rng)
+    # Une sauvegarde impose sa grille et sa flotte
+    rows, cols, flotte = joueur.rows, joueur.cols, joueur.flotte
 
     # Pour gérer l'orientation (H ou V) lors du placement
     orientation_joueur = StringVar()
@@ -37,15 +113,20 @@ def main():
 
     # Phase de jeu : "placement" ou "battle" ou "fin"
     phase = StringVar()
-    phase.set("placement")  # Par défaut, phase de placement
+    phase.set(phase_initiale)  # Par défaut, phase de placement
 
     # On stocke le temps de début lorsqu'on clique sur "Valider"
     start_time = None
     game_in_progress = False
+    timer_id = None
+    # Instantané à reprendre dans une nouvelle fenêtre (valeur de retour)
+    relance = None
 
     # ---------------------------------------------------------------------------------
     # 2) Création de l'interface : 2 Canevas pour l'affichage des grilles
     # ---------------------------------------------------------------------------------
+    cell_size = 30  # taille d'une case en pixels
+
     # -- Plateau Ordinateur --
     frame_ordi = Frame(root)
     frame_ordi.pack(side=LEFT, padx=10, pady=10)
@@ -53,10 +134,15 @@ def main():
     label_ordi = Label(frame_ordi, text="Ordinateur", font=("Arial", 14, "bold"))
     label_ordi.pack()
 
-    canvas_ordinateur = Canvas(frame_ordi, width=350, height=400, bg="lightgreen")
+    canvas_ordinateur = Canvas(
+        frame_ordi,
+        width=cols * cell_size + 50,
+        height=rows * cell_size + 100,
+        bg="lightgreen"
+    )
     canvas_ordinateur.pack()
 
-    plateau_ordinateur = Plateau(canvas_ordinateur)
+    plateau_ordinateur = Plateau(canvas_ordinateur, rows, cols, cell_size)
     # On va simplement réutiliser le plateau_ordinateur.canvas
     canvas_ordinateur.create_window(
         30, 50,
@@ -71,16 +157,25 @@ def main():
     label_joueur = Label(frame_joueur, text="Joueur", font=("Arial", 14, "bold"))
     label_joueur.pack()
 
-    canvas_joueur = Canvas(frame_joueur, width=350, height=400, bg="lightblue")
+    canvas_joueur = Canvas(
+        frame_joueur,
+        width=cols * cell_size + 50,
+        height=rows * cell_size + 100,
+        bg="lightblue"
+    )
     canvas_joueur.pack()
 
-    plateau_joueur = Plateau(canvas_joueur)
+    plateau_joueur = Plateau(canvas_joueur, rows, cols, cell_size)
     canvas_joueur.create_window(
         30, 50,
         window=plateau_joueur.canvas,
         anchor="nw"
     )
 
+    # Les cases modifiées sont dessinées par flush() (programmé par color_cell)
+    for plateau in (plateau_ordinateur, plateau_joueur):
+        plateau.flush = instrumentation.envelopper("affichage", plateau.flush)
+
     # ---------------------------------------------------------------------------------
     # 3) Zone de boutons / sélection navire / difficultés / stats
     # ---------------------------------------------------------------------------------
@@ -102,22 +197,40 @@ def main():
     om_navires.config(width=15)
     om_navires.pack(pady=5)
 
+    def remplir_menu_navires():
+        """
+        Remplit la liste déroulante avec les navires restant à placer et
+        sélectionne le premier ("Aucun" s'il n'en reste pas).
+        Retourne la liste des noms.
+        """
+        restants = liste_noms_non_places()
+        om_navires["menu"].delete(0, "end")
+        for nm in restants:
+            om_navires["menu"].add_command(label=nm, command=lambda v=nm: selected_navire_name.set(v))
+        selected_navire_name.set(restants[0] if restants else "Aucun")
+        return restants
+
     # --- Bouton Orientation ---
     def toggle_orientation():
         orientation_joueur.set("V" if orientation_joueur.get() == "H" else "H")
         print(f"[INFO] Orientation : {orientation_joueur.get()}")
+        request_preview()
 
     btn_orientation = Button(frame_boutons, text="Orientation H/V", command=toggle_orientation)
     btn_orientation.pack(pady=5)
 
-    # --- Bouton Mode Difficile (pour l'ordinateur) ---
+    # --- Bouton Niveau (pour l'ordinateur) : facile -> difficile -> expert -> monte-carlo ---
     def toggle_difficulty():
-        ordinateur.toggle_mode_difficile()
-        # On peut mettre à jour le texte du bouton si on veut
-        new_text = "Mode Facile" if not ordinateur.mode_difficile else "Mode Difficile"
+        if tour_ia.en_cours():
+            print("[INFO] L'ordinateur joue, changement de niveau impossible pour l'instant.")
+            return
+        ordinateur.niveau_suivant()
+        # Le texte du bouton affiche le niveau courant
+        new_text = f"Mode {ordinateur.niveau.capitalize()}"
         btn_difficulty.config(text=new_text)
 
-    btn_difficulty = Button(frame_boutons, text="Mode Difficile", command=toggle_difficulty)
+    btn_difficulty = Button(frame_boutons, text=f"Mode {ordinateur.niveau.capitalize()}",
+                            command=toggle_difficulty)
     btn_difficulty.pack(pady=5)
 
     # --- Bouton Valider (fin de phase placement => phase battle) ---
@@ -132,6 +245,12 @@ def main():
             start_time = time.time()
             game_in_progress = True
             update_game_time()
+            journal.debut_partie(rows, cols, joueur.flotte)
+            journal.placements(0, joueur)
+            journal.placements(1, ordinateur)
+            plateau_joueur.clear_preview()
+            (nb_events, nb_redraws) = preview_stats()
+            print(f"[INFO] Prévisualisation : {nb_events} mouvements reçus, {nb_redraws} redessins")
             print("[INFO] Début de la bataille !")
         else:
             print("[INFO] Il reste des navires à placer !")
@@ -148,10 +267,12 @@ def main():
         Met à jour le label du temps de jeu toutes les secondes
         tant que 'game_in_progress' est True.
         """
+        nonlocal timer_id
+        timer_id = None
         if game_in_progress and start_time is not None:
             elapsed = int(time.time() - start_time)
             label_time.config(text=f"Temps : {elapsed} s")
-            root.after(1000, update_game_time)
+            timer_id = root.after(1000, update_game_time)
 
     # --- Labels pour les stats de tirs ---
     label_joueur_stats = Label(frame_boutons, text="Joueur: 0 réussis / 0 ratés")
@@ -171,15 +292,54 @@ def main():
             text=f"{ordinateur.nom}: {ordinateur.tirs_reussis} réussis / {ordinateur.tirs_rates} ratés"
         )
 
+    maj_labels_stats = instrumentation.envelopper("stats", maj_labels_stats)
+
     # --- Bouton Nouvelle Partie ---
     def nouvelle_partie():
         print("[INFO] Nouvelle partie !")
-        root.destroy()
-        main()
+        reinitialiser()
 
     btn_nouvelle_partie = Button(frame_boutons, text="Nouvelle Partie", command=nouvelle_partie)
     btn_nouvelle_partie.pack(pady=5)
 
+    # --- Boutons Sauvegarder / Charger ---
+    def sauvegarder_partie():
+        if tour_ia.en_cours():
+            print("[INFO] L'ordinateur joue, sauvegarde impossible pour l'instant.")
+            return
+        temps = time.time() - start_time if start_time is not None else 0
+        sauvegarder(FICHIER_SAUVEGARDE, joueur, ordinateur, phase.get(), temps)
+        print(f"[INFO] Partie sauvegardée dans {FICHIER_SAUVEGARDE}")
+
+    def charger_partie():
+        nonlocal relance
+        try:
+            with open(FICHIER_SAUVEGARDE, "rb") as fichier:
+                donnees = fichier.read()
+        except OSError:
+            print("[INFO] Aucune partie sauvegardée.")
+            return
+        print("[INFO] Reprise de la partie sauvegardée !")
+        if len(donnees) < ENTETE.size:
+            print("[INFO] Sauvegarde illisible.")
+            return
+        if ENTETE.unpack_from(donnees, 0)[2:4] == (rows, cols):
+            try:
+                reinitialiser(donnees)
+            except ValueError as e:
+                print(f"[INFO] Sauvegarde illisible : {e}")
+            return
+        # Autre taille de grille : les plateaux sont recréés dans une nouvelle fenêtre
+        relance = donnees
+        tour_ia.annuler()
+        root.destroy()
+
+    btn_sauvegarder = Button(frame_boutons, text="Sauvegarder", command=sauvegarder_partie)
+    btn_sauvegarder.pack(pady=5)
+
+    btn_charger = Button(frame_boutons, text="Charger", command=charger_partie)
+    btn_charger.pack(pady=5)
+
     # --- Bouton Quitter ---
     def quitter_jeu():
         root.quit()
@@ -192,42 +352,85 @@ def main():
     # ---------------------------------------------------------------------------------
     preview_is_valid = False
 
+    # La prévisualisation n'est recalculée qu'au plus une fois par image
+    # (PREVIEW_FRAME_MS), et seulement si la case survolée, l'orientation
+    # ou le navire sélectionné ont changé depuis le dernier dessin.
+    PREVIEW_FRAME_MS = 16  # ~60 images/s
+    preview_pointer = None      # dernière case (row, col) survolée
+    preview_drawn_key = None    # (case, orientation, navire) actuellement dessiné
+    preview_scheduled = False
+    # Mesure : événements <Motion> reçus / prévisualisations redessinées
+    preview_events = 0
+    preview_redraws = 0
+
+    def request_preview():
+        """Programme un redessin de la prévisualisation à la prochaine image."""
+        nonlocal preview_scheduled
+        if not preview_scheduled:
+            preview_scheduled = True
+            root.after(PREVIEW_FRAME_MS, draw_preview)
+
+    def preview_stats():
+        """Retourne (événements reçus, redessins effectués) pour la prévisualisation."""
+        return (preview_events, preview_redraws)
+
     def motion_joueur(event):
-        """Prévisualisation du placement (uniquement en phase 'placement')."""
+        """
+        Mouvement de souris sur le plateau du joueur : on mémorise seulement
+        la case survolée, le dessin est fait par draw_preview().
+        """
+        nonlocal preview_pointer, preview_events
+        preview_events += 1
         if phase.get() != "placement":
             return
 
-        plateau_joueur.clear_preview()
+        cell = (event.y // plateau_joueur.cell_size, event.x // plateau_joueur.cell_size)
+        if cell != preview_pointer:
+            preview_pointer = cell
+            request_preview()
+
+    def draw_preview():
+        """Prévisualisation du placement (uniquement en phase 'placement')."""
+        nonlocal preview_scheduled, preview_drawn_key, preview_redraws, preview_is_valid
+        preview_scheduled = False
+        if phase.get() != "placement" or preview_pointer is None:
+            return
 
         nav_name = selected_navire_name.get()
+        ori = orientation_joueur.get()
+        key = (preview_pointer, ori, nav_name)
+        if key == preview_drawn_key:
+            return
+        preview_drawn_key = key
+        preview_redraws += 1
+
+        plateau_joueur.clear_preview()
+        preview_is_valid = False
+
         if nav_name == "Aucun":
             return
         navire = joueur.get_navire_by_name(nav_name)
         if not navire:
             return
 
-        row = event.y // plateau_joueur.cell_size
-        col = event.x // plateau_joueur.cell_size
-        if not (0 <= row < 10 and 0 <= col < 10):
+        (row, col) = preview_pointer
+        if not (0 <= row < rows and 0 <= col < cols):
             return
 
-        ori = orientation_joueur.get()
         valid = joueur.peut_placer_navire(navire, row, col, ori)
         color_preview = "green" if valid else "red"
 
         coords = []
         if ori == 'H':
-            if col + navire.taille <= 10:
+            if col + navire.taille <= cols:
                 coords = [(row, c) for c in range(col, col + navire.taille)]
         else:
-            if row + navire.taille <= 10:
+            if row + navire.taille <= rows:
                 coords = [(r, col) for r in range(row, row + navire.taille)]
 
         for (r, c) in coords:
-            rect_id = plateau_joueur.color_preview_cell(r, c, color_preview)
-            plateau_joueur.preview_items.append(rect_id)
+            plateau_joueur.color_preview_cell(r, c, color_preview)
 
-        nonlocal preview_is_valid
         preview_is_valid = valid
 
     def click_joueur(event):
@@ -238,7 +441,7 @@ def main():
         if phase.get() != "placement":
             return
 
-        nonlocal preview_is_valid
+        nonlocal preview_is_valid, preview_drawn_key, preview_pointer
         nav_name = selected_navire_name.get()
         if nav_name == "Aucun":
             print("[INFO] Aucun navire à placer.")
@@ -251,26 +454,25 @@ def main():
         row = event.y // plateau_joueur.cell_size
         col = event.x // plateau_joueur.cell_size
 
+        # Un redessin peut être encore en attente : on met la prévisualisation
+        # à jour tout de suite pour que preview_is_valid concerne bien cette case
+        preview_pointer = (row, col)
+        draw_preview()
+
         if preview_is_valid and joueur.peut_placer_navire(navire, row, col, orientation_joueur.get()):
             # Placement effectif
             joueur.placer_navire(navire, row, col, orientation_joueur.get())
             for (r, c) in navire.positions:
                 plateau_joueur.color_cell(r, c, "gray")
 
-            restants = liste_noms_non_places()
-            om_navires["menu"].delete(0, "end")
-
-            if restants:
-                # Re-remplir l'OptionMenu
-                for nm in restants:
-                    om_navires["menu"].add_command(label=nm, command=lambda v=nm: selected_navire_name.set(v))
-                selected_navire_name.set(restants[0])
-            else:
-                selected_navire_name.set("Aucun")
+            if not remplir_menu_navires():
                 print("[INFO] Tous les navires sont placés !")
 
             plateau_joueur.clear_preview()
             preview_is_valid = False
+            # La grille a changé : la prévisualisation doit être recalculée
+            preview_drawn_key = None
+            request_preview()
         else:
             print("[INFO] Placement invalide.")
 
@@ -283,89 +485,87 @@ def main():
     def on_click_ordinateur(event):
         """
         Quand on clique sur la grille de l'Ordinateur en phase battle,
-        le joueur tire sur l'ordinateur, puis l'ordinateur riposte.
+        le joueur tire sur l'ordinateur, puis l'ordinateur riposte
+        (calculé par tour_ia, voir riposte_ordinateur).
         On joue également les sons (tir, touche, coule).
         """
         if phase.get() != "battle":
             return  # On ne tire que si la phase est "battle"
+        if tour_ia.en_cours():
+            print("[INFO] L'ordinateur réfléchit, attendez son tir.")
+            return
 
         row = event.y // plateau_ordinateur.cell_size
         col = event.x // plateau_ordinateur.cell_size
 
-        if not (0 <= row < 10 and 0 <= col < 10):
+        if not (0 <= row < rows and 0 <= col < cols):
             return
 
         # 1) Le joueur (Humain) tire sur l'ordi
-        result = joueur.tirer_sur(ordinateur, row, col)
+        with instrumentation.phase("tir_joueur"):
+            result = joueur.tirer_sur(ordinateur, row, col)
         if result == "deja_tire":
             print("[INFO] Vous avez déjà tiré ici !")
             return
-        elif result == "manque":
-            print(f"[JOUEUR] Tir à ({row}, {col}): MANQUÉ")
-            plateau_ordinateur.color_cell(row, col, "blue")
-
-        elif result == "touche":
-            print(f"[JOUEUR] Tir à ({row}, {col}): TOUCHÉ")
-            plateau_ordinateur.color_cell(row, col, "red")
-        elif result == "coule":
-            print(f"[JOUEUR] Tir à ({row}, {col}): NAVIRE COULÉ !")
-            nav_coule = ordinateur.grille[row][col]
-            for (r, c) in nav_coule.positions:
-                plateau_ordinateur.color_cell(r, c, "black")
+        with instrumentation.phase("journal"):
+            journal.tir(0, row, col, result)
+        with instrumentation.phase("messages"):
+            if result == "manque":
+                print(f"[JOUEUR] Tir à ({row}, {col}): MANQUÉ")
+                plateau_ordinateur.color_cell(row, col, "blue")
+
+            elif result == "touche":
+                print(f"[JOUEUR] Tir à ({row}, {col}): TOUCHÉ")
+                plateau_ordinateur.color_cell(row, col, "red")
+            elif result == "coule":
+                print(f"[JOUEUR] Tir à ({row}, {col}): NAVIRE COULÉ !")
+                # Le navire coulé est mémorisé par tirer_sur : pas de recherche
+                for (r, c) in joueur.dernier_coule.positions:
+                    plateau_ordinateur.color_cell(r, c, "black")
 
         # Mettre à jour les stats
         maj_labels_stats()
         # Vérifier si l'ordinateur a perdu
         if ordinateur.tous_navires_coules():
             print("=== VICTOIRE DU JOUEUR !!! ===")
+            journal.fin_partie(0)
             phase.set("fin")
             return
 
-        # 2) Tour de l'ordinateur (IA)
-        ai_shot = None
-        if ordinateur.mode_difficile and ordinateur.reserve_cibles_proches:
-            # Si on a des cibles en réserve (cases adjacentes d'un dernier tir touché)
-            ai_shot = ordinateur.reserve_cibles_proches.pop(0)
-            while ai_shot in ordinateur.tirs_effectues:
-                # On prend la suivante si déjà tirée
-                if not ordinateur.reserve_cibles_proches:
-                    ai_shot = None
-                    break
-                ai_shot = ordinateur.reserve_cibles_proches.pop(0)
+        # 2) Tour de l'ordinateur (IA), calculé hors de la boucle Tk
+        tour_ia.lancer(ordinateur, riposte_ordinateur)
 
+    def riposte_ordinateur(ai_shot):
+        """
+        Appelée dans la boucle Tk quand tour_ia a choisi le tir de
+        l'ordinateur : applique le tir sur la grille du joueur.
+        """
         if ai_shot is None:
-            # Tir aléatoire
-            possible_cells = [(r, c) for r in range(10) for c in range(10)
-                              if (r, c) not in ordinateur.tirs_effectues]
-            if not possible_cells:
-                print("=== L'ordinateur ne peut plus tirer. Match nul ? ===")
-                phase.set("fin")
-                return
-            ai_shot = random.choice(possible_cells)
+            print("=== L'ordinateur ne peut plus tirer. Match nul ? ===")
+            journal.fin_partie(None)
+            phase.set("fin")
+            return
 
         (ai_row, ai_col) = ai_shot
-        ai_result = ordinateur.tirer_sur(joueur, ai_row, ai_col)
-
-        if ai_result == "manque":
-            plateau_joueur.color_cell(ai_row, ai_col, "blue")
-            print(f"[ORDI] Tir à ({ai_row}, {ai_col}): MANQUÉ")
-        elif ai_result == "touche":
-            print(f"[ORDI] Tir à ({ai_row}, {ai_col}): TOUCHÉ")
-            plateau_joueur.color_cell(ai_row, ai_col, "red")
+        with instrumentation.phase("tir_ia"):
+            ai_result = ordinateur.tirer_sur(joueur, ai_row, ai_col)
             # En mode difficile, l'IA ajoute les cases adjacentes dans reserve_cibles_proches
-            if ordinateur.mode_difficile:
-                directions = [(-1,0), (1,0), (0,-1), (0,1)]
-                for (dr, dc) in directions:
-                    nr, nc = ai_row + dr, ai_col + dc
-                    if 0 <= nr < 10 and 0 <= nc < 10:
-                        if (nr, nc) not in ordinateur.tirs_effectues:
-                            ordinateur.reserve_cibles_proches.append((nr, nc))
-
-        elif ai_result == "coule":
-            print(f"[ORDI] Tir à ({ai_row}, {ai_col}): NAVIRE COULÉ !")
-            nav_coule = joueur.grille[ai_row][ai_col]
-            for (r, c) in nav_coule.positions:
-                plateau_joueur.color_cell(r, c, "black")
+            ordinateur.enregistrer_resultat(ai_row, ai_col, ai_result)
+        with instrumentation.phase("journal"):
+            journal.tir(1, ai_row, ai_col, ai_result)
+
+        with instrumentation.phase("messages"):
+            if ai_result == "manque":
+                plateau_joueur.color_cell(ai_row, ai_col, "blue")
+                print(f"[ORDI] Tir à ({ai_row}, {ai_col}): MANQUÉ")
+            elif ai_result == "touche":
+                print(f"[ORDI] Tir à ({ai_row}, {ai_col}): TOUCHÉ")
+                plateau_joueur.color_cell(ai_row, ai_col, "red")
+
+            elif ai_result == "coule":
+                print(f"[ORDI] Tir à ({ai_row}, {ai_col}): NAVIRE COULÉ !")
+                for (r, c) in ordinateur.dernier_coule.positions:
+                    plateau_joueur.color_cell(r, c, "black")
 
         # Mettre à jour les stats
         maj_labels_stats()
@@ -373,13 +573,242 @@ def main():
         # Vérifier si le joueur a tout perdu
         if joueur.tous_navires_coules():
             print("=== L'ORDINATEUR GAGNE !!! ===")
+            journal.fin_partie(1)
             phase.set("fin")
 
+    on_click_ordinateur = instrumentation.envelopper("tour_joueur", on_click_ordinateur)
+    riposte_ordinateur = instrumentation.envelopper("riposte_ia", riposte_ordinateur)
 
     plateau_ordinateur.canvas.bind("<Button-1>", on_click_ordinateur)
 
+    # ---------------------------------------------------------------------------------
+    # 6) Reprise d'une partie sauvegardée : on redessine l'état restauré
+    # ---------------------------------------------------------------------------------
+    def restaurer_affichage():
+        """
+        Colorie les navires du joueur et tous les tirs déjà effectués,
+        puis relance le chronomètre si la bataille était en cours.
+        """
+        nonlocal start_time, game_in_progress
+        for navire in joueur.navires:
+            for (r, c) in navire.positions:
+                plateau_joueur.color_cell(r, c, "gray")
+
+        for (tireur, cible, plateau) in ((joueur, ordinateur, plateau_ordinateur),
+                                         (ordinateur, joueur, plateau_joueur)):
+            for (r, c) in tireur.tirs_effectues:
+                navire = cible.navire_en(r, c)
+                if navire is None:
+                    plateau.color_cell(r, c, "blue")
+                elif navire.est_coule():
+                    plateau.color_cell(r, c, "black")
+                else:
+                    plateau.color_cell(r, c, "red")
+        maj_labels_stats()
+
+        if phase.get() == "battle":
+            # La partie reprise est journalisée comme une nouvelle partie,
+            # avec les tirs déjà effectués
+            journal.debut_partie(rows, cols, joueur.flotte)
+            journal.placements(0, joueur)
+            journal.placements(1, ordinateur)
+            journal.historique(0, joueur, ordinateur)
+            journal.historique(1, ordinateur, joueur)
+            start_time = time.time() - temps_ecoule
+            game_in_progress = True
+            update_game_time()
+
+    if sauvegarde is not None:
+        restaurer_affichage()
+
+    # ---------------------------------------------------------------------------------
+    # 7) Nouvelle partie dans la même fenêtre
+    # ---------------------------------------------------------------------------------
+    def reinitialiser(donnees=None):
+        """
+        Recommence une partie (ou reprend l'instantané 'donnees', de même
+        taille de grille) sans recréer la fenêtre ni les plateaux : seuls
+        les joueurs sont recréés, le reste de l'état est remis à zéro.
+        Le niveau de l'ordinateur est conservé, sauf en cas de reprise.
+        """
+        nonlocal joueur, ordinateur, temps_ecoule, start_time, game_in_progress, timer_id
+        nonlocal preview_pointer, preview_drawn_key, preview_is_valid
+        # Décodage d'abord : un instantané invalide (ValueError) ne change rien
+        niveau = ordinateur.niveau
+        (joueur, ordinateur, phase_initiale, temps_ecoule) = \
+            creer_joueurs(rows, cols, flotte, donnees, nouveau_generateur())
+        if donnees is None:
+            ordinateur.definir_niveau(niveau)
+
+        tour_ia.annuler()
+        if timer_id is not None:
+            root.after_cancel(timer_id)
+            timer_id = None
+        (start_time, game_in_progress) = (None, False)
+        btn_difficulty.config(text=f"Mode {ordinateur.niveau.capitalize()}")
+
+        plateau_joueur.reinitialiser()
+        plateau_ordinateur.reinitialiser()
+        (preview_pointer, preview_drawn_key, preview_is_valid) = (None, None, False)
+        orientation_joueur.set("H")
+        phase.set(phase_initiale)
+        label_time.config(text="Temps : 0 s")
+        remplir_menu_navires()
+        maj_labels_stats()
+        if donnees is not None:
+            restaurer_affichage()
+
+    # ---------------------------------------------------------------------------------
+    # 8) Mode endurance : parties enchaînées automatiquement
+    # ---------------------------------------------------------------------------------
+    parties_jouees = 0
+    duree_redemarrages = 0.0
+
+    def etape_endurance():
+        """
+        Une action automatique par appel : placement aléatoire et
+        "Valider", puis TIRS_ENDURANCE tirs du joueur, puis "Nouvelle
+        Partie" (souvent pendant la réflexion de l'ordinateur, ce qui
+        exerce l'annulation). Mesure la mémoire toutes les
+        MESURE_ENDURANCE parties, quitte après 'endurance' parties.
+        """
+        nonlocal parties_jouees, duree_redemarrages
+        if phase.get() == "placement":
+            joueur.placement_aleatoire()
+            for navire in joueur.navires:
+                for (r, c) in navire.positions:
+                    plateau_joueur.color_cell(r, c, "gray")
+            remplir_menu_navires()
+            valider()
+        elif phase.get() == "battle" and len(joueur.tirs_effectues) < TIRS_ENDURANCE:
+            if not tour_ia.en_cours():
+                (r, c) = divmod(len(joueur.tirs_effectues), cols)
+                on_click_ordinateur(SimpleNamespace(x=c * cell_size + 1, y=r * cell_size + 1))
+        else:
+            debut = time.perf_counter()
+            nouvelle_partie()
+            duree_redemarrages += time.perf_counter() - debut
+            parties_jouees += 1
+            if parties_jouees % MESURE_ENDURANCE == 0:
+                gc.collect()
+                elements = len(plateau_joueur.canvas.find_all()) + len(plateau_ordinateur.canvas.find_all())
+                mesures.append((parties_jouees, memoire_residente(), len(gc.get_objects()), elements,
+                                1000 * duree_redemarrages / MESURE_ENDURANCE))
+                duree_redemarrages = 0.0
+            if parties_jouees >= endurance:
+                root.quit()
+                return
+        root.after(1, etape_endurance)
+
+    if endurance:
+        # Parties enchaînées au plus vite : réponse de l'IA relevée sans attendre une image
+        tour_ia.INTERVALLE_MS = 1
+        root.after(1, etape_endurance)
+
+    def fermer_premiere_image():
+        """Attend que la fenêtre soit affichée et dessinée, puis quitte."""
+        root.wait_visibility()
+        root.update_idletasks()
+        root.quit()
+
+    if premiere_image:
+        root.after(0, fermer_premiere_image)
+
     root.mainloop()
+    tour_ia.annuler()
+    journal.fermer()
+    return relance
+
+
+def main(rows=10, cols=10, flotte=None, sauvegarde=None, graine=None, budget_ia=BUDGET_IA,
+         instrumentation=None):
+    """
+    Fonction main() : Point d'entrée de l'application Bataille Navale
+    (paramètres : voir fenetre_jeu). Une seule fenêtre sert à toutes les
+    parties ; elle n'est recréée, sans imbriquer de boucle Tk, que pour
+    reprendre une sauvegarde d'une autre taille de grille.
+    """
+    while True:
+        sauvegarde = fenetre_jeu(rows, cols, flotte, sauvegarde, graine, budget_ia,
+                                 instrumentation=instrumentation)
+        if sauvegarde is None:
+            return
+        graine = None
+
+
+def endurance(nb_parties, budget_ia=BUDGET_IA, tolerance_ko=2048):
+    """
+    Test d'endurance : enchaîne 'nb_parties' parties dans la même fenêtre
+    (voir fenetre_jeu) et vérifie qu'à partir de la première mesure, la
+    mémoire résidente ne croît pas de plus de 'tolerance_ko' Ko, que le
+    nombre d'objets Python reste stable et que les canevas gardent le
+    même nombre d'éléments. Retourne True si c'est le cas.
+    """
+    import contextlib
+    mesures = []
+    debut = time.perf_counter()
+    # Les messages des parties sont ignorés
+    with open(os.devnull, "w") as muet, contextlib.redirect_stdout(muet):
+        fenetre_jeu(budget_ia=budget_ia, endurance=nb_parties, mesures=mesures)
+    duree = time.perf_counter() - debut
+
+    print(f"{'parties':>8} {'RSS (Ko)':>10} {'objets':>8} {'éléments':>9} {'redémarrage (ms)':>17}")
+    for (parties, rss, objets, elements, redemarrage) in mesures:
+        print(f"{parties:>8} {rss if rss is not None else '?':>10} {objets:>8} {elements:>9} {redemarrage:>17.2f}")
+    print(f"[INFO] {nb_parties} parties en {duree:.1f} s ({1000 * duree / nb_parties:.1f} ms par partie)")
+    if len(mesures) < 2:
+        print(f"[INFO] Pas assez de mesures (une toutes les {MESURE_ENDURANCE} parties)")
+        return True
+
+    (_, rss_debut, objets_debut, elements_debut, _) = mesures[0]
+    (_, rss_fin, objets_fin, elements_fin, _) = mesures[-1]
+    problemes = []
+    if rss_debut is not None and rss_fin - rss_debut > tolerance_ko:
+        problemes.append(f"mémoire résidente +{rss_fin - rss_debut} Ko")
+    # Quelques objets de plus ou de moins selon le moment de la mesure
+    if objets_fin - objets_debut > 1000:
+        problemes.append(f"objets Python +{objets_fin - objets_debut}")
+    if elements_fin != elements_debut:
+        problemes.append(f"éléments des canevas {elements_debut} -> {elements_fin}")
+    for probleme in problemes:
+        print(f"[INFO] ÉCHEC : {probleme}")
+    if not problemes:
+        print("[INFO] Mémoire stable")
+    return not problemes
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Bataille Navale")
+    parser.add_argument("--graine", type=int, default=None, help="graine de la première partie")
+    parser.add_argument("--endurance", type=int, default=None, metavar="N",
+                        help="joue N parties automatiquement et vérifie que la mémoire reste stable")
+    parser.add_argument("--premiere-image", action="store_true",
+                        help="ferme la fenêtre dès son premier affichage (mesure du démarrage)")
+    parser.add_argument("--instrumentation", action="store_true",
+                        help="chronomètre les phases de chaque tour (histogrammes à la fermeture)")
+    parser.add_argument("--profil", default=None, metavar="FICHIER",
+                        help="enregistre un profil cProfile (et FICHIER.folded) de la session")
+    parser.add_argument("--serveur", default=None, metavar="HOTE[:PORT]",
+                        help="joue en réseau sur ce serveur (voir Serveur.py)")
+    parser.add_argument("--ia", choices=Joueur.NIVEAUX, default=None,
+                        help="avec --serveur : affronte l'IA du serveur plutôt qu'un autre joueur")
+    args = parser.parse_args()
+    if args.endurance:
+        sys.exit(0 if endurance(args.endurance) else 1)
+    if args.premiere_image:
+        fenetre_jeu(graine=args.graine, premiere_image=True)
+    elif args.serveur:
+        from ClientReseau import *
+        (hote, _, port) = args.serveur.partition(":")
+        fenetre_reseau(hote, int(port) if port else PORT, args.ia)
+    else:
+        instrumentation = Instrumentation(actif=args.instrumentation or args.profil is not None)
+        if args.profil:
+            instrumentation.demarrer_profil()
+        main(graine=args.graine, instrumentation=instrumentation)
+        if instrumentation.actif:
+            print(instrumentation.rapport(histogrammes=True))
+        if args.profil:
+            instrumentation.enregistrer_profil(args.profil)
+            print(f"[INFO] Profil enregistré dans {args.profil} (piles de phases : {args.profil}.folded)")
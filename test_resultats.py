@@ -0,0 +1,110 @@
+"""
+Tests de Resultats : écriture d'un fichier de résultats, réouverture,
+relecture, et largeur des colonnes de tirs de part et d'autre de la
+grille limite (2*rows*cols = 0xFFFF).
+
+    python -m unittest test_resultats        (ou python -m pytest)
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+from Resultats import *
+from Simulation import Simulation, lire_flotte
+
+
+class TestResultats(unittest.TestCase):
+    """FichierResultats -> LectureResultats redonne les parties écrites."""
+
+    def setUp(self):
+        dossier = tempfile.TemporaryDirectory()
+        self.addCleanup(dossier.cleanup)
+        self.chemin = os.path.join(dossier.name, "parties.res")
+
+    def ecrire_partie_longue(self, rows, cols, flotte):
+        """
+        Écrit, rouvre le fichier et écrit une partie de 2*rows*cols tirs
+        (le maximum) dont le dernier tir coule le premier navire du joueur 0.
+        Retourne la séquence écrite.
+        """
+        nb_tirs = 2 * rows * cols
+        sequence = [n // 2 for n in range(nb_tirs)]
+        with FichierResultats(self.chemin, rows, cols, flotte, capacite=1):
+            pass
+        with FichierResultats(self.chemin, rows, cols, flotte) as fichier:
+            coules = [nb_tirs - 1] + [None] * (2 * len(fichier.tailles) - 1)
+            fichier.ajouter(7, 1, nb_tirs // 2, sequence, coules)
+            fichier.ajouter(None, None, 0)
+        return sequence
+
+    def test_simulation(self):
+        simulation = Simulation("difficile", "facile", "bits", graine=11,
+                                resultats=FichierResultats(self.chemin, capacite=4))
+        gagnants = [simulation.jouer_partie(11 + i) for i in range(10)]
+        simulation.resultats.fermer()
+        with LectureResultats(self.chemin) as resultats:
+            self.assertEqual(resultats.nombre, 10)
+            self.assertEqual(list(resultats.memoire("graine")), list(range(11, 21)))
+            self.assertEqual(list(resultats.memoire("gagnant")), [-1 if g is None else g for g in gagnants])
+            self.assertEqual(resultats.victoires(), (gagnants.count(0), gagnants.count(1), gagnants.count(None)))
+            self.assertEqual(resultats.memoire("tirs")[-1], simulation.tirs_derniere_partie)
+            # Chaque partie se termine quand tous les navires du perdant sont coulés
+            coules = resultats.colonne("coules")
+            nb_navires = len(resultats.tailles)
+            for (n, gagnant) in enumerate(gagnants):
+                perdant = coules[n, nb_navires:] if gagnant == 0 else coules[n, :nb_navires]
+                self.assertEqual(perdant.max(), resultats.memoire("nb_tirs")[n] - 1)
+            del coules, perdant
+
+    def test_grille_limite(self):
+        # 181x181 : 65522 tirs au plus, uint16 ; 182x182 : 66248 tirs, uint32
+        flotte = lire_flotte("5,4,3")
+        for (taille, code) in ((181, "H"), (182, "I")):
+            with self.subTest(taille=taille):
+                self.assertEqual(tirs_larges(taille, taille), code == "I")
+                sequence = self.ecrire_partie_longue(taille, taille, flotte)
+                with LectureResultats(self.chemin) as resultats:
+                    self.assertEqual(resultats.places["nb_tirs"][1], code)
+                    self.assertEqual(list(resultats.memoire("nb_tirs")), [len(sequence), 0])
+                    self.assertEqual(list(resultats.memoire("tirs")), [len(sequence) // 2, 0])
+                    self.assertEqual(list(resultats.memoire("gagnant")), [1, -1])
+                    coules = resultats.memoire("coules").tolist()
+                    self.assertEqual(coules[0], [len(sequence) - 1] + [resultats.a_flot] * 5)
+                    self.assertEqual(coules[1], [resultats.a_flot] * 6)
+                    lue = resultats.colonne("sequence")
+                    self.assertEqual(lue[0].tolist(), sequence)
+                    self.assertTrue((lue[1] == valeur_max(resultats.places["sequence"][1])).all())
+                    self.assertEqual(resultats.histogramme_tirs(1)[-1], 1)
+                    del lue
+                os.remove(self.chemin)
+
+    def test_lot_grande_grille(self):
+        flotte = lire_flotte("5,4,3")
+        with FichierResultats(self.chemin, 200, 200, flotte, sequences=False) as fichier:
+            fichier.ajouter_lot([0, 1, -1], [40000, 40000, 0])
+        with LectureResultats(self.chemin) as resultats:
+            self.assertEqual(list(resultats.memoire("nb_tirs")), [79999, 80000, 0])
+            self.assertEqual(set(resultats.memoire("coules").tobytes()), {0xFF})
+
+    def test_agrandir_interrompu(self):
+        # Interruption avant le remplacement : l'original reste lisible et complet
+        fichier = FichierResultats(self.chemin, capacite=2)
+        for graine in range(2):
+            fichier.ajouter(graine, 0, 17, list(range(33)))
+        fichier.mm.flush()
+        with mock.patch("os.replace", side_effect=KeyboardInterrupt), self.assertRaises(KeyboardInterrupt):
+            fichier.ajouter(2, 1, 17, list(range(34)))
+        with LectureResultats(self.chemin) as resultats:
+            self.assertEqual(list(resultats.memoire("graine")), [0, 1])
+            self.assertEqual(list(resultats.memoire("nb_tirs")), [33, 33])
+
+    def test_flotte_et_grille_refusees(self):
+        for (rows, cols, flotte) in ((10, 10, lire_flotte("300,2")), (10, 10, lire_flotte("2") * 256),
+                                     (0x10000, 1, None), (0xFFFF, 0xFFFF, None)):
+            with self.subTest(rows=rows, cols=cols), self.assertRaises(ValueError):
+                FichierResultats(self.chemin, rows, cols, flotte)
+            self.assertFalse(os.path.exists(self.chemin))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests de Sauvegarde : aller-retour encodage -> décodage -> encodage pour
+les deux backends (Joueur et JoueurBitboard), grandes grilles et
+instantanés corrompus.
+
+    python -m unittest test_sauvegarde        (ou python -m pytest)
+"""
+import unittest
+from Sauvegarde import *
+from Simulation import Simulation
+
+
+def partie_en_cours(backend, graine, nb_tirs, rows=10, cols=10, flotte=None, niveau="difficile"):
+    """
+    Retourne (joueur, ordinateur) d'une partie à graine fixe après
+    'nb_tirs' tirs de chaque côté (niveau de l'ordinateur : 'niveau').
+    """
+    simulation = Simulation(niveau, niveau, backend, rows, cols, flotte, graine=graine)
+    joueur = simulation.creer_joueur("Humain", "facile")
+    ordinateur = simulation.creer_joueur("Ordinateur", niveau)
+    for _ in range(nb_tirs):
+        for (tireur, cible) in ((joueur, ordinateur), (ordinateur, joueur)):
+            (row, col) = tireur.choisir_tir()
+            tireur.enregistrer_resultat(row, col, tireur.tirer_sur(cible, row, col))
+    return (joueur, ordinateur)
+
+
+class TestAllerRetour(unittest.TestCase):
+    """encoder_partie(decoder_partie(d)) == d, pour chaque backend et entre backends."""
+
+    def verifier(self, joueur, ordinateur, phase="battle", temps=42):
+        donnees = encoder_partie(joueur, ordinateur, phase, temps)
+        self.assertEqual(len(donnees), taille_enregistrement(joueur.rows, joueur.cols, len(joueur.flotte)))
+        for classe in (Joueur, JoueurBitboard):
+            (j, o, phase_lue, temps_lu) = decoder_partie(donnees, classe, joueur.flotte)
+            self.assertEqual((phase_lue, temps_lu), (phase, temps))
+            self.assertEqual(encoder_partie(j, o, phase_lue, temps_lu), donnees)
+            # Les tirs rejoués redonnent les mêmes compteurs et navires coulés
+            for (avant, apres) in ((joueur, j), (ordinateur, o)):
+                self.assertEqual((apres.tirs_reussis, apres.tirs_rates),
+                                 (avant.tirs_reussis, avant.tirs_rates))
+                if phase != "placement":
+                    self.assertEqual(apres.tous_navires_coules(), avant.tous_navires_coules())
+        return donnees
+
+    def test_backends(self):
+        for backend in ("objets", "bits"):
+            for graine in range(20):
+                with self.subTest(backend=backend, graine=graine):
+                    self.verifier(*partie_en_cours(backend, graine, 3 * graine))
+
+    def test_placement_en_cours(self):
+        for classe in (Joueur, JoueurBitboard):
+            joueur = classe("Humain")
+            ordinateur = classe("Ordinateur")
+            if classe is Joueur:
+                joueur.initialiser_navires()
+                ordinateur.initialiser_navires()
+            ordinateur.placement_aleatoire()
+            with self.subTest(classe=classe.__name__):
+                self.verifier(joueur, ordinateur, "placement", 0)
+
+    def test_grande_grille(self):
+        # Plus de 32767 cases : placements sur 4 octets
+        donnees = self.verifier(*partie_en_cours("objets", 1, 50, 300, 300, niveau="expert"))
+        self.assertEqual(formats(300, 300)[1], "I")
+        self.assertEqual(decoder_partie(donnees)[1].niveau, "expert")
+
+    def test_navire_long(self):
+        # Navire de plus de 255 cases : tailles sur 2 octets
+        flotte = [("Long", 280), ("Court", 3)]
+        self.verifier(*partie_en_cours("bits", 2, 10, 300, 20, flotte))
+
+    def test_une_colonne(self):
+        # Grille d'une colonne : tous les navires sont verticaux
+        flotte = [("A", 3), ("B", 2), ("C", 1)]
+        for backend in ("objets", "bits"):
+            with self.subTest(backend=backend):
+                (joueur, ordinateur) = partie_en_cours(backend, 5, 2, 8, 1, flotte)
+                self.assertEqual([code % 2 for code in placements_joueur(joueur)], [1, 1, 0])
+                self.verifier(joueur, ordinateur)
+
+    def test_version_1(self):
+        # Un instantané 10x10 de la version 1 ne diffère que par l'octet de version
+        donnees = bytearray(encoder_partie(*partie_en_cours("objets", 3, 15)))
+        donnees[2] = 1
+        (j, o, phase, temps) = decoder_partie(bytes(donnees))
+        self.assertEqual(encoder_partie(j, o, phase, temps)[3:], bytes(donnees[3:]))
+
+
+class TestCorrompu(unittest.TestCase):
+    """Les instantanés invalides lèvent ValueError (attendu par main.charger_partie)."""
+
+    def setUp(self):
+        self.donnees = encoder_partie(*partie_en_cours("objets", 4, 10))
+
+    def modifie(self, position, valeur):
+        donnees = bytearray(self.donnees)
+        donnees[position] = valeur
+        return bytes(donnees)
+
+    def test_phase_et_niveau(self):
+        # Octets 8 (phase) et 9 (niveau) de l'en-tête
+        for position in (8, 9):
+            with self.subTest(position=position), self.assertRaises(ValueError):
+                decoder_partie(self.modifie(position, 200))
+
+    def test_tronque(self):
+        for longueur in (0, 5, ENTETE.size, len(self.donnees) - 1):
+            with self.subTest(longueur=longueur), self.assertRaises(ValueError):
+                decoder_partie(self.donnees[:longueur])
+
+    def test_placements_chevauchants(self):
+        # Deuxième navire placé sur le premier
+        position = ENTETE.size + 6
+        donnees = bytearray(self.donnees)
+        donnees[position + 2:position + 4] = donnees[position:position + 2]
+        with self.assertRaises(ValueError):
+            decoder_partie(bytes(donnees))
+
+    def test_magic(self):
+        with self.assertRaises(ValueError):
+            decoder_partie(self.modifie(0, ord("X")))
+
+
+if __name__ == "__main__":
+    unittest.main()
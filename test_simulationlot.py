@@ -0,0 +1,59 @@
+"""
+Tests de SimulationLot : mêmes résultats en loi que Simulation à graine
+fixe, et flottes trop grandes pour des index sur 8 bits.
+
+    python -m unittest test_simulationlot        (ou python -m pytest)
+"""
+import unittest
+import numpy as np
+from SimulationLot import *
+from Simulation import Simulation, lire_flotte
+
+
+class TestSimulationLot(unittest.TestCase):
+
+    def test_comme_simulation(self):
+        # Les parties diffèrent une à une : on compare taux de victoire et tirs moyens
+        nb = 2000
+        for modes in (("facile", "facile"), ("difficile", "facile"), ("difficile", "difficile")):
+            with self.subTest(modes=modes):
+                lot = SimulationLot(*modes, graine=1, taille_lot=500)
+                lot.lancer(nb)
+                reference = Simulation(*modes, "bits", graine=1)
+                reference.lancer(nb)
+                self.assertEqual(lot.parties, nb)
+                self.assertEqual(sum(lot.victoires) + lot.nuls, nb)
+                self.assertAlmostEqual(lot.victoires[0] / nb, reference.victoires[0] / nb, delta=0.04)
+                self.assertAlmostEqual(lot.tirs_vainqueur / nb, reference.tirs_vainqueur / nb, delta=1.5)
+
+    def test_graine(self):
+        (a, b) = (SimulationLot("difficile", "facile", graine=5), SimulationLot("difficile", "facile", graine=5))
+        for (x, y) in zip(a.jouer_lot(200), b.jouer_lot(200)):
+            self.assertTrue((x == y).all())
+
+    def test_grande_flotte(self):
+        # 200 navires : index au-delà d'int8
+        lot = SimulationLot("difficile", "facile", 20, 20, lire_flotte(",".join(["1"] * 200)), graine=2)
+        self.assertEqual(lot.type_navires, np.int16)
+        grilles = lot.placer_flottes(50).reshape(50, -1)
+        for grille in grilles:
+            self.assertEqual(sorted(grille[grille >= 0].tolist()), list(range(200)))
+        (gagnants, tirs) = lot.jouer_lot(50)
+        self.assertTrue(((gagnants == 0) | (gagnants == 1)).all())
+        self.assertTrue(((tirs >= 200) & (tirs <= 400)).all())
+
+    def test_navire_long(self):
+        # Navire de 130 cases : touches au-delà d'int8
+        for mode in SimulationLot.MODES:
+            with self.subTest(mode=mode):
+                lot = SimulationLot(mode, mode, 3, 140, lire_flotte("130,2"), graine=3)
+                (_, tirs) = lot.jouer_lot(20)
+                self.assertTrue(((tirs >= 132) & (tirs <= 3 * 140)).all())
+
+    def test_flotte_refusee(self):
+        with self.assertRaises(ValueError):
+            type_navires(lire_flotte("1") * 40000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Tests de TirageFlottes : loi uniforme des flottes tirées (rejet et
+exacte) face au décompte exact de StatistiquesPlacement, rejet sans
+issue et grandes flottes.
+
+    python -m unittest test_tirageflottes        (ou python -m pytest)
+"""
+import math
+import unittest
+import numpy as np
+from TirageFlottes import *
+from Simulation import lire_flotte
+
+
+class TestTirageFlottes(unittest.TestCase):
+    """Grille 4x4, flotte 3,2,2 : 3200 flottes légales (navires distincts)."""
+    FLOTTE = lire_flotte("3,2,2")
+    NB = 100000
+
+    def test_loi_uniforme(self):
+        (nb_flottes, exacte) = occupation_exacte(4, 4, self.FLOTTE)
+        for methode in ("rejet", "exacte"):
+            with self.subTest(methode=methode):
+                tirage = TirageFlottes(4, 4, self.FLOTTE, methode=methode, graine=0)
+                tirages = tirage.tirer(self.NB)
+                # Chaque flotte légale, et elles seules, à fréquence 1/nb_flottes (khi-deux)
+                (flottes, comptes) = np.unique(tirages, axis=0, return_counts=True)
+                self.assertEqual(len(flottes), nb_flottes)
+                attendu = self.NB / nb_flottes
+                khi2 = (((comptes - attendu) ** 2) / attendu).sum()
+                self.assertLess(khi2, nb_flottes - 1 + 6 * math.sqrt(2 * (nb_flottes - 1)))
+                # Occupation de chaque case : celle de occupation_exacte
+                grilles = tirage.grilles(tirages).reshape(self.NB, -1)
+                occupation = (grilles >= 0).sum(axis=0)
+                for (case, n) in enumerate(exacte):
+                    p = n / nb_flottes
+                    self.assertAlmostEqual(occupation[case] / self.NB, p, delta=5 * math.sqrt(p * (1 - p) / self.NB))
+
+    def test_rejet_sans_issue(self):
+        # Cinq navires de 2 cases ne tiennent pas sur 9 cases
+        tirage = TirageFlottes(3, 3, lire_flotte("2,2,2,2,2"), methode="rejet", graine=0)
+        with self.assertRaises(ValueError):
+            tirage.tirer(5)
+
+    def test_grande_flotte(self):
+        # 200 navires : grilles au-delà d'int8
+        tirage = TirageFlottes(20, 20, lire_flotte(",".join(["1"] * 200)), graine=0)
+        grilles = tirage.grilles(np.arange(200, dtype=np.uint16)[None]).reshape(-1)
+        self.assertEqual(sorted(grilles[grilles >= 0].tolist()), list(range(200)))
+
+
+if __name__ == "__main__":
+    unittest.main()